@@ -0,0 +1,73 @@
+"""
+Compare the size of specifications in bytes (`dump_bytes`) with JSON (`dumps`), and
+the time to write and read them, for a typical specification, a large `in` list and
+a wide tree.
+
+Run with `python -m benchmarks.bench_binary`.
+"""
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic import codec
+from fractal_specifications.generic.collections import AndSpecification
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    InSpecification,
+)
+from fractal_specifications.generic.specification import Specification
+
+DSL = (
+    "(status == 'active' && !(deleted_at is None)) || "
+    "(owner.id == 42 && created >= 1700000000 && score < -0.5 && "
+    "name matches '^jo'/i && tags in ['a', 'b', 'c'])"
+)
+
+
+def compare(title: str, specification: Specification, number: int):
+    data = specification.dump_bytes()
+    s = specification.dumps()
+    assert Specification.load_bytes(data) == specification
+    print(
+        f"{title}: {len(s)} bytes JSON, {len(data)} bytes binary "
+        f"({len(data) / len(s):.0%})"
+    )
+    report(
+        f"{title}, write",
+        {
+            "dumps": measure(specification.dumps, number=number),
+            "codec.dumps": measure(lambda: codec.dumps(specification), number=number),
+            "dump_bytes": measure(specification.dump_bytes, number=number),
+        },
+        baseline="dumps",
+    )
+    fast = codec.dumps(specification)
+    report(
+        f"{title}, read",
+        {
+            "loads": measure(lambda: Specification.loads(s), number=number),
+            "codec.loads": measure(lambda: codec.loads(fast), number=number),
+            "load_bytes": measure(
+                lambda: Specification.load_bytes(data), number=number
+            ),
+        },
+        baseline="loads",
+    )
+
+
+def main():
+    compare("typical specification", Specification.load_dsl(DSL), number=10_000)
+    compare(
+        "in 100,000 ids",
+        InSpecification("user_id", list(range(10**9, 10**9 + 100_000))),
+        number=5,
+    )
+    compare(
+        "and of 1,000 comparisons",
+        AndSpecification(
+            [EqualsSpecification(f"field_{i % 10}", f"value {i}") for i in range(1_000)]
+        ),
+        number=100,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compare combining many specifications by chaining `&` (which copies the list of
+specifications for every step) with `AndSpecification.of` and the builder.
+
+Run with `python -m benchmarks.bench_chaining`.
+"""
+
+import operator
+from functools import reduce
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic.collections import AndSpecification
+from fractal_specifications.generic.operators import EqualsSpecification
+
+
+def build(specs):
+    builder = AndSpecification.builder()
+    for spec in specs:
+        builder &= spec
+    return builder.build()
+
+
+def bench_chaining(size: int):
+    specs = [EqualsSpecification(f"field_{i}", i) for i in range(size)]
+    report(
+        f"and of {size} specifications",
+        {
+            "reduce(operator.and_)": measure(
+                lambda: reduce(operator.and_, specs), repeat=3
+            ),
+            "AndSpecification.of": measure(lambda: AndSpecification.of(specs)),
+            "builder &=": measure(lambda: build(specs)),
+        },
+        baseline="reduce(operator.and_)",
+    )
+
+
+def main():
+    for size in (100, 1_000, 10_000):
+        bench_chaining(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare converting specifications to dicts and JSON, and back, with the previous
+implementations of `to_dict`/`from_dict` (which looked up every class by name and
+changed the dicts it decoded, so they had to be copied first).
+
+Run with `python -m benchmarks.bench_codec`.
+"""
+
+import copy
+import json
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic import codec
+from fractal_specifications.generic.collections import CollectionSpecification
+from fractal_specifications.generic.operators import NotSpecification
+from fractal_specifications.generic.specification import (
+    Specification,
+    all_specifications,
+)
+
+DSL = (
+    "(status == 'active' && !(deleted_at is None)) || "
+    "(owner.id == 42 && created >= 1700000000 && score < -0.5 && "
+    "name matches '^jo'/i && tags in ['a', 'b', 'c'])"
+)
+
+
+def from_dict_previous(d: dict) -> Specification:
+    """The implementation of `Specification.from_dict` this replaces."""
+    name = d.pop("op")
+    cls = all_specifications()[name]
+    if issubclass(cls, NotSpecification):
+        return cls(from_dict_previous(d["spec"]))
+    elif issubclass(cls, CollectionSpecification):
+        return cls([from_dict_previous(s) for s in d["specs"]])
+    return cls._from_dict(d)
+
+
+def loads_previous(s: str) -> Specification:
+    return from_dict_previous(json.loads(s))
+
+
+def main(number: int = 10_000):
+    specification = Specification.load_dsl(DSL)
+    d = specification.to_dict()
+    s = specification.dumps()
+    fast = codec.dumps(specification)
+    assert codec.encode(specification) == d
+    assert codec.decode(d) == specification == Specification.loads(s)
+    assert codec.loads(fast) == specification == loads_previous(s)
+
+    report(
+        "to dict",
+        {
+            "to_dict": measure(specification.to_dict, number=number),
+            "codec.encode": measure(lambda: codec.encode(specification), number=number),
+        },
+        baseline="to_dict",
+    )
+    report(
+        "from dict",
+        {
+            "from_dict (previous, on a copy)": measure(
+                lambda: from_dict_previous(copy.deepcopy(d)), number=number
+            ),
+            "codec.decode": measure(lambda: codec.decode(d), number=number),
+        },
+        baseline="from_dict (previous, on a copy)",
+    )
+    report(
+        "to JSON",
+        {
+            "json.dumps(to_dict)": measure(
+                lambda: json.dumps(specification.to_dict()), number=number
+            ),
+            "dumps": measure(specification.dumps, number=number),
+            "codec.dumps": measure(lambda: codec.dumps(specification), number=number),
+        },
+        baseline="json.dumps(to_dict)",
+    )
+    report(
+        "from JSON",
+        {
+            "loads (previous)": measure(lambda: loads_previous(s), number=number),
+            "loads": measure(lambda: Specification.loads(s), number=number),
+            "codec.loads": measure(lambda: codec.loads(fast), number=number),
+        },
+        baseline="loads (previous)",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare the built-in DSL parser with the Lark-based parser, both for parse
+throughput and for the cold start of a fresh interpreter (import + first parse).
+
+Run with `python -m benchmarks.bench_dsl` (requires `lark`).
+"""
+
+import subprocess
+import sys
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic import dsl, dsl_parser
+
+DSL_STRINGS = [
+    "id == 1",
+    "status == 'active' && price > 10.5",
+    "name matches '^jo'/i || tags contains 'sale' || id in [1, 2, 3, 4, 5]",
+    (
+        "(status == 'active' && !(deleted_at is None)) || "
+        "(owner.id == 42 && created >= 1700000000 && score < -0.5)"
+    ),
+]
+
+COLD_START = {
+    "lark": "from fractal_specifications.generic.dsl_parser import parse_dsl",
+    "built-in": "from fractal_specifications.generic.dsl import parse_dsl",
+}
+
+
+def cold_start(import_statement: str) -> None:
+    subprocess.run(
+        [sys.executable, "-c", f"{import_statement}; parse_dsl('id == 1')"],
+        check=True,
+    )
+
+
+def main(number: int = 1_000):
+    dsl_parser.get_parser()
+    report(
+        f"parse {len(DSL_STRINGS)} DSL strings",
+        {
+            "lark": measure(
+                lambda: [dsl_parser.parse_dsl(s) for s in DSL_STRINGS], number=number
+            ),
+            "built-in": measure(
+                lambda: [dsl.parse_dsl(s) for s in DSL_STRINGS], number=number
+            ),
+        },
+        baseline="lark",
+    )
+
+    report(
+        "cold start (interpreter + import + first parse)",
+        {
+            name: measure(lambda s=statement: cold_start(s), repeat=5)
+            for name, statement in COLD_START.items()
+        },
+        baseline="lark",
+    )
+
+
+if __name__ == "__main__":
+    main()
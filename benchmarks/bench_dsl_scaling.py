@@ -0,0 +1,36 @@
+"""
+Show that parsing scales linearly with the size of (machine-generated) DSL strings:
+long conjunctions and disjunctions, long value lists and deep nesting.
+
+Run with `python -m benchmarks.bench_dsl_scaling`.
+"""
+
+from benchmarks.utils import measure, report_scaling
+from fractal_specifications.generic.dsl import parse_dsl
+
+SHAPES = {
+    "a && b && ...": lambda n: " && ".join(f"field_{i} == {i}" for i in range(n)),
+    "a || b || ...": lambda n: " || ".join(f"field_{i} == {i}" for i in range(n)),
+    "a && b || c && ...": lambda n: " && ".join(
+        f"field_{i} == {i}" if i % 2 else f"field_{i} == {i} || id == {i}"
+        for i in range(n)
+    ),
+    "id in [...]": lambda n: f"id in [{', '.join(str(i) for i in range(n))}]",
+    "!(!(...))": lambda n: "!(" * n + "id == 1" + ")" * n,
+}
+
+
+def main(sizes=(1_000, 10_000, 100_000)):
+    for shape, generate in SHAPES.items():
+        dsl_strings = {size: generate(size) for size in sizes}
+        report_scaling(
+            shape,
+            {
+                size: measure(lambda s=dsl_string: parse_dsl(s), repeat=3)
+                for size, dsl_string in dsl_strings.items()
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
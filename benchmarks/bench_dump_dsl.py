@@ -0,0 +1,92 @@
+"""
+Compare writing DSL strings with the previous recursive implementation of
+`dump_dsl`, for a typical specification (uncached and cached) and a large one.
+
+Run with `python -m benchmarks.bench_dump_dsl`.
+"""
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic import collections, operators
+from fractal_specifications.generic.dsl import dump_dsl, parse_dsl
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+DSL = (
+    "(status == 'active' && !(deleted_at is None)) || "
+    "(owner.id == 42 && created >= 1700000000 && score < -0.5 && "
+    "name matches '^jo'/i && tags in ['a', 'b', 'c'])"
+)
+
+
+def dump_dsl_recursive(self: Specification) -> str:
+    """The implementation of `Specification.dump_dsl` this replaces."""
+    if isinstance(self, operators.NotSpecification):
+        child = dump_dsl_recursive(self.specification)
+        return f"!({child})"
+    elif isinstance(self, operators.FieldValueSpecification):
+        lhs = self.field
+        operator = {
+            operators.EqualsSpecification.__name__: "==",
+            operators.NotEqualsSpecification.__name__: "!=",
+            operators.GreaterThanSpecification.__name__: ">",
+            operators.GreaterThanEqualSpecification.__name__: ">=",
+            operators.LessThanSpecification.__name__: "<",
+            operators.LessThanEqualSpecification.__name__: "<=",
+            operators.InSpecification.__name__: "in",
+            operators.ContainsSpecification.__name__: "contains",
+            operators.IsNoneSpecification.__name__: "is None",
+            operators.RegexStringMatchSpecification.__name__: "matches",
+        }[self.__class__.__name__]
+        if isinstance(self, operators.IsNoneSpecification):
+            return f"{lhs} {operator}"
+        rhs = f'"{self.value}"' if type(self.value) is str else repr(self.value)
+        if isinstance(self, operators.RegexStringMatchSpecification) and self.flags:
+            rhs = f"{rhs}/{self.flags}"
+        return f"{lhs} {operator} {rhs}"
+    elif isinstance(self, (collections.AndSpecification, collections.OrSpecification)):
+        op = {
+            collections.AndSpecification: " && ",
+            collections.OrSpecification: " || ",
+        }[type(self)]
+        child_strings = [
+            val for child in self.specifications if (val := dump_dsl_recursive(child))
+        ]
+        return f"({op.join(child_strings)})"
+    elif isinstance(self, EmptySpecification):
+        return "#"
+    raise ValueError(f"Unsupported specification type: {type(self)}")
+
+
+def main(number: int = 10_000):
+    specification = Specification.load_dsl(DSL)
+    assert parse_dsl(dump_dsl(specification)) == specification
+    fresh = iter([parse_dsl(DSL) for _ in range(number * 5)])
+    report(
+        "typical specification",
+        {
+            "recursive (previous)": measure(
+                lambda: dump_dsl_recursive(specification), number=number
+            ),
+            "dump_dsl": measure(lambda: dump_dsl(next(fresh)), number=number),
+            "dump_dsl (cached)": measure(specification.dump_dsl, number=number),
+        },
+        baseline="recursive (previous)",
+    )
+
+    large = collections.AndSpecification.of(
+        operators.EqualsSpecification(f"field_{i}", i) for i in range(100_000)
+    )
+    report(
+        "100000 conditions",
+        {
+            "recursive (previous)": measure(lambda: dump_dsl_recursive(large)),
+            "dump_dsl": measure(lambda: dump_dsl(large.And(EmptySpecification()))),
+        },
+        baseline="recursive (previous)",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Show the cost of memoizing field values in `is_satisfied_by`: trees without shared
+fields are evaluated without an evaluation context, so they don't pay for it. The
+"always memoized" column evaluates them within a context, like every And/Or did
+before, and the hand-written expression is the lower bound. The last tree uses
+`price` twice, so it is memoized either way.
+
+Run with `python -m benchmarks.bench_evaluation`.
+"""
+
+from dataclasses import dataclass
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic.context import evaluate
+from fractal_specifications.generic.specification import Specification
+
+
+@dataclass
+class Product:
+    price: float
+    quantity: int
+    category: str
+
+
+TREES = {
+    "price > 10": lambda p: p.price > 10,
+    "price > 10 && quantity < 5 && category == 'toys'": lambda p: (
+        p.price > 10 and p.quantity < 5 and p.category == "toys"
+    ),
+    "(price > 10 && price < 50) || category == 'toys'": lambda p: (
+        (p.price > 10 and p.price < 50) or p.category == "toys"
+    ),
+}
+
+
+def bench_tree(products, dsl: str, expression):
+    spec = Specification.load_dsl(dsl)
+    report(
+        f"{dsl} ({len(products)} objects)",
+        {
+            "hand-written": measure(lambda: [p for p in products if expression(p)]),
+            "is_satisfied_by": measure(
+                lambda: [p for p in products if spec.is_satisfied_by(p)]
+            ),
+            "always memoized": measure(
+                lambda: [p for p in products if evaluate(p, (spec,), all)]
+            ),
+        },
+        baseline="is_satisfied_by",
+    )
+
+
+def main(size: int = 100_000):
+    products = [
+        Product(price=i % 100, quantity=i % 7, category=["toys", "food"][i % 2])
+        for i in range(size)
+    ]
+    for dsl, expression in TREES.items():
+        bench_tree(products, dsl, expression)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Compare filtering in-memory objects with a list comprehension around
+`is_satisfied_by` against the compiled `Specification.filter` API.
+
+Run with `python -m benchmarks.bench_filter`.
+"""
+
+from dataclasses import dataclass
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic.accessors import ItemAccessor, MixedAccessor
+from fractal_specifications.generic.specification import Specification
+
+
+@dataclass
+class Road:
+    id: int
+    name: str
+    maximum_speed: int
+    country: str
+
+
+def main(size: int = 100_000):
+    roads = [
+        Road(id=i, name=f"road {i}", maximum_speed=i % 130, country="NL")
+        for i in range(size)
+    ]
+    spec = Specification.load_dsl(
+        "maximum_speed >= 25 && maximum_speed < 80 && country == 'NL' && !(name is None)"
+    )
+
+    report(
+        f"filter ({size} objects)",
+        {
+            "comprehension": measure(
+                lambda: [r for r in roads if spec.is_satisfied_by(r)]
+            ),
+            "Specification.filter": measure(lambda: list(spec.filter(roads))),
+        },
+        baseline="comprehension",
+    )
+    report(
+        f"count ({size} objects)",
+        {
+            "comprehension": measure(
+                lambda: sum(1 for r in roads if spec.is_satisfied_by(r))
+            ),
+            "Specification.count": measure(lambda: spec.count(roads)),
+        },
+        baseline="comprehension",
+    )
+    report(
+        f"first 10 ({size} objects)",
+        {
+            "comprehension": measure(
+                lambda: [r for r in roads if spec.is_satisfied_by(r)][:10]
+            ),
+            "Specification.first": measure(lambda: spec.first(roads, 10)),
+        },
+        baseline="comprehension",
+    )
+
+    # Repeated queries on a small collection, where compiling would dominate
+    few = roads[20:30]
+    report(
+        f"exists ({len(few)} objects)",
+        {
+            "comprehension": measure(
+                lambda: any(spec.is_satisfied_by(r) for r in few), number=1000
+            ),
+            "Specification.exists": measure(lambda: spec.exists(few), number=1000),
+        },
+        baseline="comprehension",
+    )
+
+    rows = [
+        {"id": r.id, "name": r.name, "maximum_speed": r.maximum_speed, "country": "NL"}
+        for r in roads
+    ]
+    report(
+        f"filter dict rows ({size} rows)",
+        {
+            "objects from dicts + comprehension": measure(
+                lambda: [
+                    r for r in (Road(**row) for row in rows) if spec.is_satisfied_by(r)
+                ]
+            ),
+            "Specification.filter (ItemAccessor)": measure(
+                lambda: list(spec.filter(rows, ItemAccessor()))
+            ),
+            "Specification.filter (MixedAccessor)": measure(
+                lambda: list(spec.filter(rows, MixedAccessor()))
+            ),
+        },
+        baseline="objects from dicts + comprehension",
+    )
+
+
+if __name__ == "__main__":
+    main()
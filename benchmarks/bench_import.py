@@ -0,0 +1,89 @@
+"""
+Report the import time of the package in a fresh interpreter (as paid by every
+short-lived worker), measured with `python -X importtime`: the total for each use,
+and the modules that take the most time. Exits with an error when a use takes longer
+than its budget, which is generous (a few times the time on a laptop) to catch heavy
+imports only. Which modules are (not) imported is tested by
+`tests/generic/test_imports.py`.
+
+Run with `python -m benchmarks.bench_import`.
+"""
+
+import subprocess
+import sys
+from typing import List, Tuple
+
+# The code of each use, and its budget in milliseconds
+SCENARIOS = {
+    "import specification": (
+        "import fractal_specifications.generic.specification",
+        100,
+    ),
+    "load_dsl": (
+        "from fractal_specifications.generic.specification import Specification; "
+        "Specification.load_dsl(\"status == 'active' && id in [1, 2]\")",
+        200,
+    ),
+    "loads": (
+        "from fractal_specifications.generic.specification import Specification; "
+        'Specification.loads(\'{"op": "eq", "field": "id", "value": 1}\')',
+        200,
+    ),
+    "import pandas builder": (
+        "import fractal_specifications.contrib.pandas.specifications",
+        100,
+    ),
+    "import django builder": (
+        "import fractal_specifications.contrib.django.specifications",
+        100,
+    ),
+}
+
+
+def import_times(code: str) -> List[Tuple[int, int, str]]:
+    """
+    The import time in microseconds of each module imported by `code`: by itself,
+    cumulative (with the modules it imports), and the name, indented by depth.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if (
+            line.startswith("import time:")
+            and line[12:].split("|")[0].strip().isdigit()
+        ):
+            self_us, cumulative, name = line[12:].split("|")
+            times.append((int(self_us), int(cumulative), name[1:]))
+    return times
+
+
+def main(repeat: int = 5):
+    startup = {name.strip() for _, _, name in import_times("pass")}
+    print(f"import time (best of {repeat}, after interpreter startup)")
+    over_budget = []
+    for title, (code, budget) in SCENARIOS.items():
+        runs = []
+        for _ in range(repeat):
+            times = [t for t in import_times(code) if t[2].strip() not in startup]
+            total = sum(cumulative for _, cumulative, name in times if name[0] != " ")
+            runs.append((total, times))
+        total, times = min(runs, key=lambda run: run[0])
+        heaviest = ", ".join(
+            f"{name.strip()} {self_us / 1000:.1f}"
+            for self_us, _, name in sorted(times, reverse=True)[:3]
+        )
+        print(f"  {title:<30} {total / 1000:>8.3f} ms  (heaviest: {heaviest})")
+        if total / 1000 > budget:
+            over_budget.append(f"{title} ({budget} ms)")
+    print()
+    if over_budget:
+        raise SystemExit(f"Over the import time budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
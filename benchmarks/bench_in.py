@@ -0,0 +1,59 @@
+"""
+Compare `InSpecification` membership against a large list of values with the
+plain (linear) list membership test it replaces.
+
+Run with `python -m benchmarks.bench_in`.
+"""
+
+from dataclasses import dataclass
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic.operators import InSpecification
+
+
+@dataclass
+class Order:
+    id: int
+    customer_id: int
+
+
+def bench_membership(orders, values: int):
+    customer_ids = list(range(0, values * 14, 14))
+    spec = InSpecification("customer_id", customer_ids)
+    predicate = spec.compile()
+    report(
+        f"in [{values} values] ({len(orders)} objects)",
+        {
+            "list membership": measure(
+                lambda: [o for o in orders if o.customer_id in customer_ids],
+                repeat=1,
+            ),
+            "is_satisfied_by": measure(
+                lambda: [o for o in orders if spec.is_satisfied_by(o)]
+            ),
+            "compiled": measure(lambda: [o for o in orders if predicate(o)]),
+        },
+        baseline="list membership",
+    )
+
+
+def main(size: int = 10_000):
+    orders = [Order(id=i, customer_id=i * 7) for i in range(size)]
+    for values in (10, 1_000, 50_000):
+        bench_membership(orders, values)
+
+    customer_ids = list(range(50_000))
+    report(
+        "construction (50000 values)",
+        {
+            "list": measure(lambda: list(customer_ids)),
+            "InSpecification": measure(
+                lambda: InSpecification("customer_id", customer_ids)
+            ),
+        },
+        baseline="list",
+    )
+
+
+if __name__ == "__main__":
+    main()
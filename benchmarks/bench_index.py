@@ -0,0 +1,84 @@
+"""
+Compare querying in-memory objects with the compiled `Specification.filter` (a full
+scan) against `SpecificationIndex.filter`, and report the cost of keeping the index
+up to date.
+
+Run with `python -m benchmarks.bench_index`.
+"""
+
+from dataclasses import dataclass
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic.index import SpecificationIndex
+from fractal_specifications.generic.specification import Specification
+
+
+@dataclass
+class Road:
+    id: int
+    name: str
+    maximum_speed: int
+    country: str
+
+
+QUERIES = [
+    "id == 4242",
+    "country == 'BE' && maximum_speed >= 120",
+    "country in ['BE', 'DE'] && maximum_speed < 20 && name contains '7'",
+    "maximum_speed < 3 || id < 100",
+]
+
+
+def main(size: int = 100_000):
+    countries = ["NL", "BE", "DE", "FR", "LU", "DK", "AT", "CH", "IT", "ES"]
+    roads = [
+        Road(
+            id=i,
+            name=f"road {i}",
+            maximum_speed=i * 7 % 130,
+            country=countries[i % len(countries)],
+        )
+        for i in range(size)
+    ]
+    index = SpecificationIndex(
+        roads,
+        hash_fields=["id", "country"],
+        sorted_fields=["id", "maximum_speed"],
+        key="id",
+    )
+    for query in QUERIES:
+        spec = Specification.load_dsl(query)
+        assert index.filter(spec) == list(spec.filter(roads))
+        report(
+            f"{query} ({size} objects)",
+            {
+                "Specification.filter": measure(lambda s=spec: list(s.filter(roads))),
+                "SpecificationIndex.filter": measure(lambda s=spec: index.filter(s)),
+            },
+            baseline="Specification.filter",
+        )
+
+    road = roads[size // 2]
+    report(
+        f"maintenance ({size} objects)",
+        {
+            "build": measure(
+                lambda: SpecificationIndex(
+                    roads,
+                    hash_fields=["id", "country"],
+                    sorted_fields=["id", "maximum_speed"],
+                    key="id",
+                ),
+                repeat=3,
+            ),
+            "update": measure(lambda: index.update(road), number=1_000),
+            "delete + insert": measure(
+                lambda: (index.delete(road), index.insert(road)), number=1_000
+            ),
+        },
+        baseline="build",
+    )
+
+
+if __name__ == "__main__":
+    main()
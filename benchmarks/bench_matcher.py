@@ -0,0 +1,99 @@
+"""
+Compare finding the subscriptions (specifications) that match an event by checking
+all of them, with `is_satisfied_by` or compiled predicates, against
+`SpecificationMatcher.match`.
+
+Run with `python -m benchmarks.bench_matcher`.
+"""
+
+import random
+from dataclasses import dataclass
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic.matcher import SpecificationMatcher
+from fractal_specifications.generic.specification import Specification
+
+COUNTRIES = ["NL", "BE", "DE", "FR", "LU", "DK", "AT", "CH", "IT", "ES"]
+CATEGORIES = [f"category {i}" for i in range(50)]
+
+
+@dataclass
+class Listing:
+    country: str
+    category: str
+    price: float
+    title: str
+
+
+def subscription(rng: random.Random) -> Specification:
+    low = rng.randrange(1000)
+    high = low + rng.randrange(10, 500)
+    return rng.choice(
+        [
+            Specification.load_dsl(
+                f"country == '{rng.choice(COUNTRIES)}' && "
+                f"category == '{rng.choice(CATEGORIES)}' && price < {high}"
+            ),
+            Specification.load_dsl(
+                f"category in {rng.sample(CATEGORIES, 3)} && "
+                f"price >= {low} && price <= {high}"
+            ),
+            Specification.load_dsl(
+                f"(country == '{rng.choice(COUNTRIES)}' || country == 'NL') && "
+                f"category == '{rng.choice(CATEGORIES)}' && title contains 'bike'"
+            ),
+        ]
+    )
+
+
+def main(size: int = 50_000):
+    rng = random.Random(42)
+    subscriptions = {i: subscription(rng) for i in range(size)}
+    listings = [
+        Listing(
+            country=rng.choice(COUNTRIES),
+            category=rng.choice(CATEGORIES),
+            price=rng.random() * 1500,
+            title=rng.choice(["red bike", "blue chair", "old bike"]),
+        )
+        for _ in range(20)
+    ]
+    predicates = {key: spec.compile() for key, spec in subscriptions.items()}
+    matcher = SpecificationMatcher(subscriptions)
+    for listing in listings:
+        assert matcher.match(listing) == {
+            key for key, spec in subscriptions.items() if spec.is_satisfied_by(listing)
+        }
+
+    report(
+        f"match {len(listings)} events against {size} subscriptions",
+        {
+            "is_satisfied_by": measure(
+                lambda: [
+                    {k for k, s in subscriptions.items() if s.is_satisfied_by(listing)}
+                    for listing in listings
+                ],
+                repeat=3,
+            ),
+            "compiled": measure(
+                lambda: [
+                    {k for k, p in predicates.items() if p(listing)}
+                    for listing in listings
+                ],
+                repeat=3,
+            ),
+            "SpecificationMatcher.match": measure(
+                lambda: [matcher.match(listing) for listing in listings], repeat=3
+            ),
+        },
+        baseline="is_satisfied_by",
+    )
+    report(
+        f"add {size} subscriptions",
+        {"SpecificationMatcher": measure(lambda: SpecificationMatcher(subscriptions))},
+        baseline="SpecificationMatcher",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure the memory used by resident specifications, e.g., saved filters that are
+loaded from a database and kept in memory for subscription matching, with and
+without interning.
+
+Run with `python -m benchmarks.bench_memory`.
+"""
+
+import gc
+import tracemalloc
+
+from fractal_specifications.generic.collections import AndSpecification
+from fractal_specifications.generic.interning import SpecificationInterner
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+)
+from fractal_specifications.generic.specification import Specification
+
+
+def saved_filter(i: int):
+    return AndSpecification(
+        [
+            EqualsSpecification("status", "active"),
+            EqualsSpecification("tenant_id", i),
+            GreaterThanSpecification("price", i % 100),
+            InSpecification("country", ["NL", "BE"]),
+        ]
+    )
+
+
+def measure_memory(title: str, documents, interner=None):
+    Specification.interner = interner
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    specs = [Specification.loads(document) for document in documents]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    Specification.interner = None
+    nodes = len(specs) * 5
+    print(f"{title}: {len(specs)} specifications ({nodes} nodes)")
+    print(f"  total    {used / 1024 / 1024:>10.2f} MiB")
+    print(f"  per spec {used / len(specs):>10.1f} bytes")
+    print(f"  per node {used / nodes:>10.1f} bytes")
+    print()
+    return specs
+
+
+def main(size: int = 100_000):
+    documents = [saved_filter(i).dumps() for i in range(size)]
+    measure_memory("plain", documents)
+    measure_memory("interned", documents, SpecificationInterner())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare filtering columnar data (a dict of NumPy arrays) row by row, with
+`is_satisfied_by` and the compiled `Specification.count`, against the mask built by
+`NumpySpecificationBuilder`, and show how the latter scales up to 10^8 rows.
+
+The row by row paths are only measured up to `rowwise_limit` rows, they take minutes
+beyond that. Run with `python -m benchmarks.bench_numpy` (requires `numpy`).
+"""
+
+from types import SimpleNamespace
+
+import numpy as np  # type: ignore
+
+from benchmarks.utils import measure, report, report_scaling
+from fractal_specifications.contrib.numpy.specifications import (
+    NumpySpecificationBuilder,
+)
+from fractal_specifications.generic.accessors import ItemAccessor
+from fractal_specifications.generic.specification import Specification
+
+DSL = "price >= 10 && price < 50 && quantity in [1, 2, 3] && !(category == 3)"
+
+
+def generate(size: int, rng: np.random.Generator):
+    return {
+        "price": rng.random(size, dtype=np.float32) * 100,
+        "quantity": rng.integers(0, 10, size, dtype=np.int32),
+        "category": rng.integers(0, 8, size, dtype=np.int8),
+    }
+
+
+def compare(spec: Specification, mask, columns):
+    size = len(columns["price"])
+    names = list(columns)
+    rows = [
+        dict(zip(names, values, strict=True))
+        for values in zip(*(c.tolist() for c in columns.values()), strict=True)
+    ]
+    objects = [SimpleNamespace(**row) for row in rows]
+    expected = int(mask(columns).sum())
+    assert spec.count(rows, ItemAccessor()) == expected
+    report(
+        f"count ({size} rows)",
+        {
+            "is_satisfied_by": measure(
+                lambda: sum(map(spec.is_satisfied_by, objects)), repeat=3
+            ),
+            "Specification.count": measure(
+                lambda: spec.count(rows, ItemAccessor()), repeat=3
+            ),
+            "NumpySpecificationBuilder": measure(
+                lambda: int(mask(columns).sum()), repeat=3
+            ),
+        },
+        baseline="is_satisfied_by",
+    )
+
+
+def main(sizes=(1_000_000, 10_000_000, 100_000_000), rowwise_limit=1_000_000):
+    spec = Specification.load_dsl(DSL)
+    mask = NumpySpecificationBuilder.build(spec, return_mask=True)
+    rng = np.random.default_rng(42)
+    compare(spec, mask, generate(min(sizes[0], rowwise_limit), rng))
+
+    timings = {}
+    for size in sizes:
+        columns = generate(size, rng)
+        timings[size] = measure(lambda c=columns: mask(c), repeat=3)
+        del columns
+    report_scaling("NumpySpecificationBuilder mask", timings)
+
+
+if __name__ == "__main__":
+    main()
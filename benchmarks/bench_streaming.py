@@ -0,0 +1,70 @@
+"""
+Compare the peak memory and time of loading a specification with a large `in` list
+(like a bulk export filter) from a JSON file: reading it all and `loads`, and
+`Specification.load`, which reads and parses it in chunks.
+
+Run with `python -m benchmarks.bench_streaming`.
+"""
+
+import gc
+import os
+import tempfile
+import tracemalloc
+from typing import Callable, Tuple
+
+from benchmarks.utils import measure, report
+from fractal_specifications.generic.collections import AndSpecification
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    InSpecification,
+)
+from fractal_specifications.generic.specification import Specification
+
+
+def measure_peak(func: Callable[[], Specification]) -> Tuple[float, float]:
+    """The memory used by the result of `func`, and at the peak, in MiB."""
+    gc.collect()
+    tracemalloc.start()
+    specification = func()
+    used, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(specification.specifications) == 2
+    return used / 1024 / 1024, peak / 1024 / 1024
+
+
+def main(size: int = 1_000_000):
+    specification = AndSpecification(
+        [
+            EqualsSpecification("tenant_id", 1),
+            InSpecification("user_id", list(range(10**9, 10**9 + size))),
+        ]
+    )
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        f.write(specification.dumps())
+    try:
+        print(f"in {size:,} ids ({os.path.getsize(f.name) / 1024 / 1024:.1f} MiB)")
+
+        def loads():
+            with open(f.name, "rb") as fp:
+                return Specification.loads(fp.read())
+
+        def load():
+            with open(f.name, "rb") as fp:
+                return Specification.load(fp)
+
+        timings = {
+            "read + loads": measure(loads, repeat=3),
+            "load": measure(load, repeat=3),
+        }
+        report("time", timings, baseline="read + loads")
+        print("memory")
+        for title, func in [("read + loads", loads), ("load", load)]:
+            used, peak = measure_peak(func)
+            print(f"  {title:<40} {used:>8.1f} MiB loaded {peak:>8.1f} MiB peak")
+        assert load() == loads()
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
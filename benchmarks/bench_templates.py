@@ -0,0 +1,61 @@
+"""
+Compare parsing DSL strings that differ only in their literals with binding the
+values to a template, for specifications and for PostgreSQL queries.
+
+Run with `python -m benchmarks.bench_templates`.
+"""
+
+from benchmarks.utils import measure, report
+from fractal_specifications.contrib.postgresql.specifications import (
+    PostgresSpecificationBuilder,
+)
+from fractal_specifications.generic.specification import Specification
+
+DSL = (
+    "tenant_id == {} && user_id == {} && created > {} && "
+    "(status in ['new', 'open'] || owner_id == {})"
+)
+
+
+def main(size: int = 1_000):
+    values = [(i % 10, i, 1700000000 + i, i * 7) for i in range(size)]
+    dsl_strings = [DSL.format(*v) for v in values]
+    template = Specification.load_dsl(DSL.format(":tenant_id", ":user_id", "$1", "$2"))
+    query = template.prepare(PostgresSpecificationBuilder.build)
+
+    def bind(t, v):
+        return t.bind(v[2], v[3], tenant_id=v[0], user_id=v[1])
+
+    report(
+        f"specifications ({size} requests)",
+        {
+            "load_dsl": measure(
+                lambda: [Specification.load_dsl(s) for s in dsl_strings]
+            ),
+            "template.bind": measure(lambda: [bind(template, v) for v in values]),
+        },
+        baseline="load_dsl",
+    )
+    report(
+        f"PostgreSQL queries ({size} requests)",
+        {
+            "build(load_dsl)": measure(
+                lambda: [
+                    PostgresSpecificationBuilder.build(Specification.load_dsl(s))
+                    for s in dsl_strings
+                ]
+            ),
+            "build(template.bind)": measure(
+                lambda: [
+                    PostgresSpecificationBuilder.build(bind(template, v))
+                    for v in values
+                ]
+            ),
+            "prepared query.bind": measure(lambda: [bind(query, v) for v in values]),
+        },
+        baseline="build(load_dsl)",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import timeit
+from typing import Callable, Dict
+
+
+def measure(func: Callable[[], object], number: int = 1, repeat: int = 5) -> float:
+    """Return the best time in seconds of `repeat` runs of `number` calls."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(title: str, timings: Dict[str, float], baseline: str) -> None:
+    print(title)
+    for name, seconds in timings.items():
+        speedup = timings[baseline] / seconds if seconds else float("inf")
+        print(f"  {name:<40} {seconds * 1000:>10.3f} ms {speedup:>8.2f}x")
+    print()
+
+
+def report_scaling(title: str, timings: Dict[int, float]) -> None:
+    """Report timings by input size; a constant time per item means linear time."""
+    print(title)
+    for size, seconds in timings.items():
+        print(
+            f"  {size:>10} items {seconds * 1000:>12.3f} ms "
+            f"{seconds / size * 1e6:>10.3f} us/item"
+        )
+    print()
@@ -1,13 +1,16 @@
-from functools import reduce
-from typing import Callable, Dict, Iterator, Optional, Type
+from __future__ import annotations
 
-from django.db.models import Q  # type: ignore
+from functools import reduce
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional, Type
 
 from fractal_specifications.generic.specification import (
     EmptySpecification,
     Specification,
 )
 
+if TYPE_CHECKING:  # pragma: no cover
+    from django.db.models import Q  # type: ignore
+
 
 class SpecificationNotMappedToDjangoOrm(Exception):
     pass
@@ -33,6 +36,8 @@ class DjangoOrmSpecificationBuilder:
 
     @classmethod
     def _spec_builders(cls) -> Dict[Type[Specification], Callable]:
+        from django.db.models import Q  # type: ignore
+
         from fractal_specifications.generic import collections, operators
 
         return {
@@ -53,15 +58,23 @@ class DjangoOrmSpecificationBuilder:
             operators.GreaterThanEqualSpecification: lambda s: {
                 f"{s.field}__gte": s.value
             },
-            operators.RegexStringMatchSpecification: lambda s: {
-                f"{s.field}__regex": s.value
-            },
+            operators.RegexStringMatchSpecification: cls._regex,
             operators.ContainsSpecification: lambda s: {
                 f"{s.field}__icontains": s.value
             },
             operators.IsNoneSpecification: lambda s: {f"{s.field}__isnull": True},
         }
 
+    @staticmethod
+    def _regex(specification) -> dict:
+        # Other flags can't be expressed portably across database backends
+        if set(specification.flags) - {"i"}:
+            raise SpecificationNotMappedToDjangoOrm(
+                f"Regex flags of '{specification}' not mapped to Django Orm query."
+            )
+        lookup = "iregex" if specification.flags else "regex"
+        return {f"{specification.field}__{lookup}": specification.value}
+
     @classmethod
     def _build_collection(cls, specification) -> Iterator[Q]:
         for spec in specification.to_collection():
@@ -70,6 +83,8 @@ class DjangoOrmSpecificationBuilder:
 
     @staticmethod
     def _create_q(filters) -> Q:
+        from django.db.models import Q  # type: ignore
+
         if type(filters) is dict:
             return Q(**filters)
         elif type(filters) in {list, set, tuple}:
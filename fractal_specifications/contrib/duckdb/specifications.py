@@ -23,6 +23,15 @@ class SpecificationNotMappedToDuckDB(Exception):
     pass
 
 
+def _inline_flags(flags: str) -> str:
+    # RE2 supports the i, m and s flags inline, with the same meaning as in Python
+    if unsupported := set(flags) - set("ims"):
+        raise SpecificationNotMappedToDuckDB(
+            f"Regex flags '{''.join(sorted(unsupported))}' not supported by DuckDB"
+        )
+    return f"(?{flags})" if flags else ""
+
+
 class DuckDBSpecificationBuilder:
     @staticmethod
     def build(specification: Optional[Specification] = None) -> tuple[str, list]:
@@ -90,7 +99,8 @@ class DuckDBSpecificationBuilder:
             # DuckDB regex operator for pattern matching
             # NOTE: Check Regex BEFORE Contains since Regex inherits from Contains
             # Using regexp_matches for regex matching
-            return f"regexp_matches({specification.field}, ?)", [specification.value]
+            pattern = _inline_flags(specification.flags) + specification.value
+            return f"regexp_matches({specification.field}, ?)", [pattern]
 
         elif isinstance(specification, ContainsSpecification):
             # DuckDB ILIKE for case-insensitive pattern matching
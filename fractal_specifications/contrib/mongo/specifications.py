@@ -63,6 +63,19 @@ class MongoSpecificationBuilder:
             return {specification.field: {"$gte": specification.value}}
         elif isinstance(specification, RegexStringMatchSpecification):
             # RegexStringMatchSpecification expects actual regex patterns from user
+            if specification.flags:
+                # MongoDB has the i, m, s and x options, with the same meaning
+                if unsupported := set(specification.flags) - set("imsx"):
+                    raise SpecificationNotMappedToMongo(
+                        f"Regex flags '{''.join(sorted(unsupported))}' not "
+                        "supported by MongoDB"
+                    )
+                return {
+                    specification.field: {
+                        "$regex": specification.value,
+                        "$options": specification.flags,
+                    }
+                }
             return {specification.field: {"$regex": specification.value}}
         elif isinstance(specification, ContainsSpecification):
             # ContainsSpecification checks if substring exists, so escape and add wildcards
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from functools import reduce
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Mapping, Optional, Type
+
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np  # type: ignore
+
+Columns = Mapping[str, "np.ndarray"]
+
+
+class SpecificationNotMappedToNumpy(Exception):
+    pass
+
+
+class NumpySpecificationBuilder:
+    """
+    Builds a function that evaluates a specification on columnar data: a mapping of
+    field names to (equally long) NumPy arrays, one value per row.
+
+    Comparisons are evaluated on whole arrays at once. `contains` is vectorized for
+    string arrays, `matches`, pre-processors and `contains` on other arrays are
+    evaluated per value.
+    """
+
+    @classmethod
+    def build(
+        cls,
+        specification: Optional[Specification] = None,
+        *,
+        return_mask=False,
+    ) -> Optional[Callable[[Columns], Columns | np.ndarray]]:
+        if specification is None or isinstance(specification, EmptySpecification):
+            return None
+        f = cls._build(specification)
+        if return_mask:
+            return f
+
+        def filter_columns(columns: Columns) -> Columns:
+            mask = f(columns)
+            return {name: column[mask] for name, column in columns.items()}
+
+        return filter_columns
+
+    @classmethod
+    def _build(cls, specification: Specification) -> Callable[[Columns], np.ndarray]:
+        if builder := cls._spec_builders().get(type(specification)):
+            return builder(specification)
+        raise SpecificationNotMappedToNumpy(
+            f"Specification '{specification}' not mapped to NumPy mask."
+        )
+
+    @classmethod
+    def _spec_builders(
+        cls,
+    ) -> Dict[Type[Specification], Callable]:
+        import numpy as np  # type: ignore
+
+        from fractal_specifications.generic import collections, operators
+
+        column = cls._column
+        return {
+            EmptySpecification: lambda s: lambda c: np.ones(cls._length(c), bool),
+            collections.AndSpecification: lambda s: cls._reduce(
+                s, np.logical_and, True
+            ),
+            collections.OrSpecification: lambda s: cls._reduce(s, np.logical_or, False),
+            operators.NotSpecification: lambda s: cls._not(s.specification),
+            operators.EqualsSpecification: lambda s: lambda c: column(s, c) == s.value,
+            operators.NotEqualsSpecification: lambda s: lambda c: column(s, c)
+            != s.value,
+            operators.InSpecification: lambda s: lambda c: cls._in(
+                column(s, c), list(s.value)
+            ),
+            operators.LessThanSpecification: lambda s: lambda c: column(s, c) < s.value,
+            operators.LessThanEqualSpecification: lambda s: lambda c: column(s, c)
+            <= s.value,
+            operators.GreaterThanSpecification: lambda s: lambda c: column(s, c)
+            > s.value,
+            operators.GreaterThanEqualSpecification: lambda s: lambda c: column(s, c)
+            >= s.value,
+            operators.ContainsSpecification: lambda s: lambda c: cls._contains(
+                column(s, c), s.value
+            ),
+            operators.RegexStringMatchSpecification: lambda s: lambda c: cls._per_value(
+                lambda value: bool(s.pattern.match(value)), column(s, c)
+            ),
+            operators.IsNoneSpecification: lambda s: lambda c: cls._is_none(
+                column(s, c)
+            ),
+        }
+
+    @classmethod
+    def _not(cls, specification) -> Callable[[Columns], np.ndarray]:
+        f = cls._build(specification)
+        return lambda c: ~f(c)
+
+    @classmethod
+    def _build_collection(
+        cls, specification
+    ) -> Iterator[Callable[[Columns], np.ndarray]]:
+        for spec in specification.to_collection():
+            yield cls._build(spec)
+
+    @classmethod
+    def _reduce(cls, specification, operator, empty: bool):
+        import numpy as np  # type: ignore
+
+        functions = list(cls._build_collection(specification))
+        if not functions:
+            return lambda c: np.full(cls._length(c), empty)
+        return lambda c: reduce(operator, (f(c) for f in functions))
+
+    @staticmethod
+    def _length(columns: Columns) -> int:
+        return len(next(iter(columns.values()))) if columns else 0
+
+    @staticmethod
+    def _column(specification, columns: Columns) -> np.ndarray:
+        import numpy as np  # type: ignore
+
+        from fractal_specifications.generic.operators import _no_pre_processing
+
+        values = np.asarray(columns[specification.field])
+        if specification.pre_processor is not _no_pre_processing:
+            values = np.frompyfunc(specification.pre_processor, 1, 1)(values)
+        return values
+
+    @staticmethod
+    def _per_value(function: Callable, values: np.ndarray) -> np.ndarray:
+        import numpy as np  # type: ignore
+
+        return np.fromiter(map(function, values), bool, len(values))
+
+    @classmethod
+    def _contains(cls, values: np.ndarray, value) -> np.ndarray:
+        import numpy as np  # type: ignore
+
+        if values.dtype.kind == "U" and isinstance(value, str):
+            return (np.char.find(values, value) != -1) & (values != "")
+        return cls._per_value(lambda v: bool(v) and value in v, values)
+
+    @staticmethod
+    def _in(values: np.ndarray, options: list) -> np.ndarray:
+        import numpy as np  # type: ignore
+
+        types = {type(option) for option in options}
+        if len(types) <= 1 or types <= {bool, int, float}:
+            return np.isin(values, options)
+        # NumPy would convert mixed options (like 1 and "1") to a common type
+        return reduce(
+            np.logical_or,
+            (values == option for option in options),
+            np.zeros(len(values), bool),
+        )
+
+    @classmethod
+    def _is_none(cls, values: np.ndarray) -> np.ndarray:
+        import numpy as np  # type: ignore
+
+        if values.dtype.kind == "O":
+            return cls._per_value(lambda v: v is None, values)
+        return np.zeros(len(values), bool)
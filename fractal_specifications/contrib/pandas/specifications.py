@@ -1,13 +1,16 @@
-from functools import reduce
-from typing import Callable, Dict, Iterator, Optional, Type
+from __future__ import annotations
 
-import pandas as pd  # type: ignore
+from functools import reduce
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional, Type
 
 from fractal_specifications.generic.specification import (
     EmptySpecification,
     Specification,
 )
 
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd  # type: ignore
+
 
 class SpecificationNotMappedToPandas(Exception):
     pass
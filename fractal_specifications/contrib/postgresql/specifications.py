@@ -23,6 +23,23 @@ class SpecificationNotMappedToPostgres(Exception):
     pass
 
 
+def _embedded_options(flags: str) -> str:
+    """
+    Python regex flags as PostgreSQL embedded options (ignoring case is done by `~*`).
+
+    PostgreSQL expresses `^`/`$` at line boundaries only together with `.` not
+    matching newlines (`n`), hence the mapping of `m`/`s`. `a` can't be expressed.
+    """
+    if "a" in flags:
+        raise SpecificationNotMappedToPostgres(
+            "Regex flag 'a' can't be expressed in PostgreSQL"
+        )
+    multiline, dotall = "m" in flags, "s" in flags
+    options = "w" if multiline and dotall else "n" if multiline else "s" * dotall
+    options += "x" * ("x" in flags)
+    return f"(?{options})" if options else ""
+
+
 class PostgresSpecificationBuilder:
     @staticmethod
     def build(specification: Optional[Specification] = None) -> tuple[str, list]:
@@ -89,8 +106,9 @@ class PostgresSpecificationBuilder:
         elif isinstance(specification, RegexStringMatchSpecification):
             # PostgreSQL regex operator for pattern matching
             # NOTE: Check Regex BEFORE Contains since Regex inherits from Contains
-            # Using ~* for case-insensitive regex matching
-            return f"{specification.field} ~* %s", [specification.value]
+            # Using ~* for case-insensitive regex matching, other flags are embedded
+            pattern = _embedded_options(specification.flags) + specification.value
+            return f"{specification.field} ~* %s", [pattern]
 
         elif isinstance(specification, ContainsSpecification):
             # PostgreSQL ILIKE for case-insensitive pattern matching
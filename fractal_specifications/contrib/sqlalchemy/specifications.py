@@ -68,6 +68,11 @@ class SqlAlchemyOrmSpecificationBuilder:
             # Return tuple format for IS NULL operation
             return (specification.field, "is_none", None)
         elif isinstance(specification, RegexStringMatchSpecification):
+            # Flags are dialect specific, only ignoring case matches the `~*` below
+            if set(specification.flags) - {"i"}:
+                raise SpecificationNotMappedToSqlAlchemyOrm(
+                    f"Regex flags of '{specification}' not mapped to SqlAlchemy Orm query."
+                )
             # Return tuple format (field, operation, value) for operations that need filter()
             # Consumer should use: Model.field.op('~*')(value) for PostgreSQL
             return (specification.field, "regex", specification.value)
@@ -0,0 +1,115 @@
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fractal_specifications.generic.operators import _field_path
+
+Step = Callable[[Any], Any]
+
+
+class Accessor(ABC):
+    """
+    Strategy for resolving a field path (like `"a.b.c"` or `"a__b__c"`) on an object.
+
+    The path is resolved into a list of steps once, so looking up the value of a row
+    only consists of calling these steps in order.
+    """
+
+    @abstractmethod
+    def steps(self, path: Tuple[str, ...]) -> List[Step]:
+        raise NotImplementedError
+
+    def getter(self, field: str) -> Callable[[Any], Any]:
+        steps = self.steps(_field_path(field))
+        if len(steps) == 1:
+            return steps[0]
+        elif len(steps) == 2:
+            first, second = steps
+            return lambda obj: second(first(obj))
+
+        def get(obj):
+            for step in steps:
+                obj = step(obj)
+            return obj
+
+        return get
+
+
+class AttributeAccessor(Accessor):
+    """Resolve fields with `getattr`, like `is_satisfied_by` does."""
+
+    def steps(self, path: Tuple[str, ...]) -> List[Step]:
+        if any("." in part for part in path):
+            # attrgetter would split these parts again, so use getattr per part
+            return [self._getattr(part) for part in path]
+        return [attrgetter(".".join(path))]
+
+    @staticmethod
+    def _getattr(part: str) -> Step:
+        return lambda obj: getattr(obj, part)
+
+
+class ItemAccessor(Accessor):
+    """Resolve fields with `obj[key]`, e.g., for dicts, JSON payloads and row mappings."""
+
+    def steps(self, path: Tuple[str, ...]) -> List[Step]:
+        return [itemgetter(part) for part in path]
+
+
+class IndexAccessor(Accessor):
+    """
+    Resolve fields by position, e.g., for tuples returned by a DB-API cursor.
+
+    Numeric path parts are used as index directly, other parts are looked up in
+    `columns` (for example `[d[0] for d in cursor.description]`).
+    """
+
+    def __init__(self, columns: Optional[Sequence] = None):
+        self.columns = {name: index for index, name in enumerate(columns or [])}
+
+    def steps(self, path: Tuple[str, ...]) -> List[Step]:
+        return [itemgetter(self._index(part)) for part in path]
+
+    def _index(self, part: str) -> int:
+        if part in self.columns:
+            return self.columns[part]
+        elif part.lstrip("-").isdigit():
+            return int(part)
+        raise KeyError(f"Unknown column '{part}'")
+
+
+class MixedAccessor(Accessor):
+    """
+    Resolve every step of a path depending on the type of the object at hand.
+
+    Mappings use item access, sequences use item access for numeric parts and all
+    other objects use attribute access. The decision is made once per type and
+    cached, so mixed rows (like objects containing dicts) are still cheap to resolve.
+    """
+
+    def steps(self, path: Tuple[str, ...]) -> List[Step]:
+        return [self._step(part) for part in path]
+
+    @staticmethod
+    def _step(part: str) -> Step:
+        by_type: Dict[type, Step] = {}
+
+        def resolve(obj) -> Step:
+            if isinstance(obj, Mapping):
+                return itemgetter(part)
+            elif (
+                isinstance(obj, Sequence)
+                and not isinstance(obj, str)
+                and part.lstrip("-").isdigit()
+            ):
+                return itemgetter(int(part))
+            return attrgetter(part)
+
+        def step(obj):
+            get = by_type.get(type(obj))
+            if get is None:
+                get = by_type[type(obj)] = resolve(obj)
+            return get(obj)
+
+        return step
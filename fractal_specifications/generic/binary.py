@@ -0,0 +1,399 @@
+"""
+Compact binary encoding of specifications, see `Specification.dump_bytes`.
+
+The bytes start with a header (`FS` and a version byte) and a dictionary of the
+field names, followed by the nodes of the specification in prefix order. Every node
+is a single opcode byte, followed by:
+
+- comparisons and `in`: the index of its field in the dictionary and its value
+- `matches`: the same, followed by its flags
+- `is None`: the index of its field
+- `not`: the negated specification
+- `and`/`or`: the number of specifications and the specifications themselves
+
+Numbers (indexes, lengths and integers) are varints, integers zigzag-encoded. Values
+start with a type tag; lists of only integers, only floats or only strings are packed
+under a single tag: integers in the smallest fixed width that fits them all (so they
+are read and written at once), strings as their lengths and the joined string. Sets
+are tagged as such, followed by their values as list.
+Specifications that are not in the opcode table are written as JSON (see `codec`).
+"""
+
+import struct
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from fractal_specifications.generic import codec
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.operators import (
+    ContainsSpecification,
+    EqualsSpecification,
+    FieldValueSpecification,
+    GreaterThanEqualSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    LessThanEqualSpecification,
+    LessThanSpecification,
+    NotEqualsSpecification,
+    NotSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+_HEADER = b"FS\x01"
+
+# Opcodes
+_EMPTY = 0
+_COMPARISONS = {
+    EqualsSpecification: 1,
+    NotEqualsSpecification: 2,
+    LessThanSpecification: 3,
+    LessThanEqualSpecification: 4,
+    GreaterThanSpecification: 5,
+    GreaterThanEqualSpecification: 6,
+    ContainsSpecification: 7,
+    InSpecification: 8,
+}
+_MATCHES = 9
+_IS_NONE = 10
+_NOT = 11
+_AND = 12
+_OR = 13
+_JSON = 14
+
+_OPCODES: Dict[type, int] = {
+    EmptySpecification: _EMPTY,
+    **_COMPARISONS,
+    RegexStringMatchSpecification: _MATCHES,
+    IsNoneSpecification: _IS_NONE,
+    NotSpecification: _NOT,
+    AndSpecification: _AND,
+    OrSpecification: _OR,
+}
+
+# Value tags
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_LIST = 6
+_TUPLE = 7
+_DICT = 8
+_INTS = 9
+_FLOATS = 10
+_STRS = 11
+_SET = 12
+
+_DOUBLE = struct.Struct("<d")
+# Formats of packed integers, by the range of integers they fit
+_PACKED_INT_SIZES = {ord("b"): 1, ord("h"): 2, ord("i"): 4, ord("q"): 8}
+_PACKED_INTS = [
+    (-(1 << (size * 8 - 1)), (1 << (size * 8 - 1)) - 1, chr(code))
+    for code, size in _PACKED_INT_SIZES.items()
+]
+
+
+def _write_varint(out: bytearray, n: int):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _write_int(out: bytearray, n: int):
+    _write_varint(out, n << 1 if n >= 0 else (-n << 1) - 1)
+
+
+def _write_str(out: bytearray, s: str):
+    data = s.encode("utf-8", "surrogatepass")
+    _write_varint(out, len(data))
+    out += data
+
+
+def _write_items(out: bytearray, tag: int, items: Any):
+    out.append(tag)
+    _write_varint(out, len(items))
+    for item in items:
+        _write_value(out, item)
+
+
+def _packed_int_format(values: List[int]) -> Optional[str]:
+    low, high = min(values, default=0), max(values, default=0)
+    for minimum, maximum, code in _PACKED_INTS:
+        if minimum <= low and high <= maximum:
+            return code
+    return None  # Integers of over 64 bits
+
+
+def _write_packed_ints(out: bytearray, values: List[int], code: str):
+    out.append(ord(code))
+    out += struct.pack(f"<{len(values)}{code}", *values)
+
+
+def _write_list(out: bytearray, values: List[Any]):
+    types = set(map(type, values))
+    if types == {float}:
+        out.append(_FLOATS)
+        _write_varint(out, len(values))
+        out += struct.pack(f"<{len(values)}d", *values)
+    elif types == {str}:
+        out.append(_STRS)
+        _write_varint(out, len(values))
+        lengths = list(map(len, values))
+        _write_packed_ints(out, lengths, _packed_int_format(lengths))
+        _write_str(out, "".join(values))
+    elif types == {int} and (code := _packed_int_format(values)) is not None:
+        out.append(_INTS)
+        _write_varint(out, len(values))
+        _write_packed_ints(out, values, code)
+    else:
+        _write_items(out, _LIST, values)
+
+
+def _write_value(out: bytearray, value: Any):
+    cls = type(value)
+    if value is None:
+        out.append(_NONE)
+    elif cls is bool:
+        out.append(_TRUE if value else _FALSE)
+    elif cls is int:
+        out.append(_INT)
+        _write_int(out, value)
+    elif cls is float:
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif cls is str:
+        out.append(_STR)
+        _write_str(out, value)
+    elif cls is list:
+        _write_list(out, value)
+    elif cls is tuple:
+        _write_items(out, _TUPLE, value)
+    elif cls is set or cls is frozenset:
+        out.append(_SET)
+        _write_list(out, list(value))
+    elif cls is dict:
+        out.append(_DICT)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            _write_value(out, key)
+            _write_value(out, item)
+    # Subclasses, like enums, are written as the type they're based on (like JSON)
+    elif isinstance(value, int):
+        _write_value(out, bool(value) if isinstance(value, bool) else int(value))
+    elif isinstance(value, float):
+        _write_value(out, float(value))
+    elif isinstance(value, str):
+        _write_value(out, str(value))
+    else:
+        raise ValueError(f"Value {value!r} can't be written as bytes")
+
+
+def dump_bytes(specification: Specification) -> bytes:
+    body = bytearray()
+    fields: Dict[str, int] = {}
+    stack = [specification]
+    while stack:
+        spec = stack.pop()
+        cls = type(spec)
+        if (opcode := _OPCODES.get(cls)) is None:
+            body.append(_JSON)
+            _write_str(body, codec.dumps(spec))
+            continue
+        body.append(opcode)
+        if opcode == _NOT:
+            stack.append(spec.specification)
+        elif opcode == _AND or opcode == _OR:
+            _write_varint(body, len(spec.specifications))
+            stack.extend(reversed(spec.specifications))
+        elif opcode != _EMPTY:
+            if (index := fields.get(spec.field)) is None:
+                if type(spec.field) is not str:
+                    raise ValueError(f"Field {spec.field!r} can't be written as bytes")
+                index = fields[spec.field] = len(fields)
+            _write_varint(body, index)
+            if opcode != _IS_NONE:
+                _write_value(body, spec.value)
+            if opcode == _MATCHES:
+                _write_str(body, spec.flags)
+
+    out = bytearray(_HEADER)
+    _write_varint(out, len(fields))
+    for field in fields:
+        _write_str(out, field)
+    return bytes(out + body)
+
+
+class _Reader:
+    __slots__ = ("data", "pos", "fields")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+        self.fields: List[str] = []
+
+    def byte(self) -> int:
+        b = self.data[self.pos]
+        self.pos += 1
+        return b
+
+    def varint(self) -> int:
+        data, pos = self.data, self.pos
+        n = data[pos]
+        if n < 0x80:
+            self.pos = pos + 1
+            return n
+        n = shift = 0
+        while True:
+            b = data[pos]
+            pos += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                self.pos = pos
+                return n
+            shift += 7
+
+    def integer(self) -> int:
+        n = self.varint()
+        return -((n + 1) >> 1) if n & 1 else n >> 1
+
+    def string(self) -> str:
+        size = self.varint()
+        end = self.pos + size
+        if end > len(self.data):
+            raise IndexError
+        s = self.data[self.pos : end].decode("utf-8", "surrogatepass")
+        self.pos = end
+        return s
+
+    def field(self) -> str:
+        return self.fields[self.varint()]
+
+    def value(self) -> Any:
+        return _VALUES[self.byte()](self)
+
+    def packed_ints(self, size: int) -> List[int]:
+        code = self.byte()
+        end = self.pos + size * _PACKED_INT_SIZES[code]
+        if end > len(self.data):
+            raise IndexError
+        values = list(struct.unpack_from(f"<{size}{chr(code)}", self.data, self.pos))
+        self.pos = end
+        return values
+
+    def ints(self) -> List[int]:
+        return self.packed_ints(self.varint())
+
+    def strings(self) -> List[str]:
+        lengths = self.packed_ints(self.varint())
+        text = self.string()
+        ends = list(accumulate(lengths))
+        if (ends and ends[-1] != len(text)) or any(n < 0 for n in lengths):
+            raise IndexError
+        return [text[start:end] for start, end in zip([0] + ends, ends, strict=False)]
+
+    def floats(self) -> List[float]:
+        size = self.varint()
+        if self.pos + size * 8 > len(self.data):
+            raise IndexError
+        values = list(struct.unpack_from(f"<{size}d", self.data, self.pos))
+        self.pos += size * 8
+        return values
+
+    def double(self) -> float:
+        value = _DOUBLE.unpack_from(self.data, self.pos)[0]
+        self.pos += 8
+        return value
+
+
+def _read_dict(r: _Reader) -> Dict[Any, Any]:
+    return {r.value(): r.value() for _ in range(r.varint())}
+
+
+_VALUES: Dict[int, Callable[[_Reader], Any]] = {
+    _NONE: lambda r: None,
+    _FALSE: lambda r: False,
+    _TRUE: lambda r: True,
+    _INT: _Reader.integer,
+    _FLOAT: _Reader.double,
+    _STR: _Reader.string,
+    _LIST: lambda r: [r.value() for _ in range(r.varint())],
+    _TUPLE: lambda r: tuple([r.value() for _ in range(r.varint())]),
+    _DICT: _read_dict,
+    _INTS: _Reader.ints,
+    _FLOATS: _Reader.floats,
+    _STRS: _Reader.strings,
+    _SET: lambda r: frozenset(r.value()),
+}
+
+
+def _comparison_reader(
+    cls: Type[FieldValueSpecification],
+) -> Callable[[_Reader], Specification]:
+    return lambda r: cls(r.field(), r.value())
+
+
+_LEAVES: Dict[int, Callable[[_Reader], Specification]] = {
+    _EMPTY: lambda r: EmptySpecification(),
+    **{opcode: _comparison_reader(cls) for cls, opcode in _COMPARISONS.items()},
+    _MATCHES: lambda r: RegexStringMatchSpecification(
+        r.field(), r.value(), flags=r.string()
+    ),
+    _IS_NONE: lambda r: IsNoneSpecification(r.field()),
+    _JSON: lambda r: codec.loads(r.string()),
+}
+
+
+def _read_specification(r: _Reader) -> Specification:
+    # Collections (and negations) that are still missing specifications
+    stack: List[Tuple[int, int, List[Specification]]] = []
+    while True:
+        opcode = r.byte()
+        if opcode == _AND or opcode == _OR:
+            if size := r.varint():
+                stack.append((opcode, size, []))
+                continue
+            spec: Specification = (
+                AndSpecification([]) if opcode == _AND else OrSpecification([])
+            )
+        elif opcode == _NOT:
+            stack.append((opcode, 1, []))
+            continue
+        else:
+            spec = _LEAVES[opcode](r)
+        while stack:
+            opcode, size, specifications = stack[-1]
+            specifications.append(spec)
+            if len(specifications) < size:
+                break
+            stack.pop()
+            if opcode == _NOT:
+                spec = NotSpecification(specifications[0])
+            elif opcode == _AND:
+                spec = AndSpecification(specifications)
+            else:
+                spec = OrSpecification(specifications)
+        else:
+            return spec
+
+
+def load_bytes(data: Union[bytes, bytearray, memoryview]) -> Specification:
+    data = bytes(data)
+    if not data.startswith(_HEADER):
+        raise ValueError("Not a specification in bytes (or of another version)")
+    r = _Reader(data)
+    r.pos = len(_HEADER)
+    try:
+        r.fields = [r.string() for _ in range(r.varint())]
+        specification = _read_specification(r)
+    except (IndexError, KeyError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError("Invalid specification bytes") from e
+    if r.pos != len(data):
+        raise ValueError("Invalid specification bytes, data after the specification")
+    return Specification._interned(specification)
@@ -0,0 +1,185 @@
+"""
+Fast conversion of specifications to dicts and JSON, and back.
+
+The dicts are the same as those of `Specification.to_dict`, but instead of looking
+at the attributes of every node (and up all classes by name), the encoder and decoder
+of every specification class are looked up in a table.
+Decoding doesn't change the dicts it's given.
+
+JSON is written and read by `orjson` when it's installed, and by `json` otherwise.
+"""
+
+import json
+from typing import Any, Callable, Dict, Mapping, Type, Union
+
+from fractal_specifications.generic.collections import (
+    AndSpecification,
+    CollectionSpecification,
+    OrSpecification,
+)
+from fractal_specifications.generic.operators import (
+    ContainsSpecification,
+    EqualsSpecification,
+    FieldValueSpecification,
+    GreaterThanEqualSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    LessThanEqualSpecification,
+    LessThanSpecification,
+    NotEqualsSpecification,
+    NotSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+    _specification,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+Encoder = Callable[[Specification], Dict[str, Any]]
+Decoder = Callable[[Mapping[str, Any]], Specification]
+
+_FIELD_VALUES = (
+    EqualsSpecification,
+    NotEqualsSpecification,
+    LessThanSpecification,
+    LessThanEqualSpecification,
+    GreaterThanSpecification,
+    GreaterThanEqualSpecification,
+    ContainsSpecification,
+)
+
+
+def _field_value_encoder(cls: Type[FieldValueSpecification]) -> Encoder:
+    name = cls.name()
+    return lambda s: {"op": name, "field": s.field, "value": s.value}
+
+
+def _encode_matches(s: RegexStringMatchSpecification) -> Dict[str, Any]:
+    if s.flags:
+        return {"op": "matches", "field": s.field, "value": s.value, "flags": s.flags}
+    return {"op": "matches", "field": s.field, "value": s.value}
+
+
+def _collection_encoder(cls: Type[CollectionSpecification]) -> Encoder:
+    name = cls.name()
+    return lambda s: {"op": name, "specs": [encode(c) for c in s.specifications]}
+
+
+_ENCODERS: Dict[type, Encoder] = {
+    **{cls: _field_value_encoder(cls) for cls in _FIELD_VALUES},
+    InSpecification: _field_value_encoder(InSpecification),
+    RegexStringMatchSpecification: _encode_matches,
+    IsNoneSpecification: lambda s: {"op": "isnone", "field": s.field, "value": None},
+    NotSpecification: lambda s: {"op": "not", "spec": encode(s.specification)},
+    AndSpecification: _collection_encoder(AndSpecification),
+    OrSpecification: _collection_encoder(OrSpecification),
+    EmptySpecification: lambda s: {"op": "empty"},
+}
+
+
+def encode(specification: Specification) -> Dict[str, Any]:
+    """The dict of `specification`, like `specification.to_dict()`."""
+    try:
+        encoder = _ENCODERS[type(specification)]
+    except KeyError:
+        # Subclasses (may) have attributes or a `to_dict` of their own
+        return specification.to_dict()
+    return encoder(specification)
+
+
+def _decode_generic(cls: Type[Specification], d: Mapping[str, Any]) -> Specification:
+    return cls._from_dict({key: value for key, value in d.items() if key != "op"})
+
+
+def _field_value_decoder(cls: Type[FieldValueSpecification]) -> Decoder:
+    def decoder(d):
+        if len(d) == 3 and "field" in d and "value" in d:
+            return cls(d["field"], d["value"])
+        return _decode_generic(cls, d)
+
+    return decoder
+
+
+def _decode_matches(d: Mapping[str, Any]) -> Specification:
+    if len(d) == 3 + ("flags" in d) and "field" in d and "value" in d:
+        return RegexStringMatchSpecification(
+            d["field"], d["value"], flags=d.get("flags", "")
+        )
+    return _decode_generic(RegexStringMatchSpecification, d)
+
+
+def _collection_decoder(cls: Type[CollectionSpecification]) -> Decoder:
+    return lambda d: cls([_decode(s) for s in d["specs"]])
+
+
+def _decode_empty(d: Mapping[str, Any]) -> Specification:
+    if len(d) == 1:
+        return EmptySpecification()
+    return _decode_generic(EmptySpecification, d)
+
+
+# The decoders of the specifications in this package, their `_from_dict` ignores
+# keys they don't know, or takes them as keyword arguments (which the fallback does)
+_DECODERS: Dict[type, Decoder] = {
+    **{cls: _field_value_decoder(cls) for cls in _FIELD_VALUES},
+    InSpecification: lambda d: InSpecification(d["field"], d["value"]),
+    RegexStringMatchSpecification: _decode_matches,
+    IsNoneSpecification: lambda d: IsNoneSpecification(d["field"]),
+    NotSpecification: lambda d: NotSpecification(_decode(d["spec"])),
+    AndSpecification: _collection_decoder(AndSpecification),
+    OrSpecification: _collection_decoder(OrSpecification),
+    EmptySpecification: _decode_empty,
+}
+
+
+def _decode(d: Mapping[str, Any]) -> Specification:
+    if (cls := _specification(d["op"])) is None:
+        raise KeyError(d["op"])
+    if (decoder := _DECODERS.get(cls)) is None:
+        return _decode_generic(cls, d)
+    return decoder(d)
+
+
+def decode(d: Mapping[str, Any]) -> Specification:
+    """
+    The specification of dict `d`, like `Specification.from_dict(d)` but without
+    changing `d`.
+    """
+    return Specification._interned(_decode(d))
+
+
+def default(value: Any) -> Any:
+    """Writes sets (like the values of `in`) as JSON arrays."""
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(specification: Specification) -> str:
+    """
+    JSON of `specification`. Unlike `Specification.dumps` it has no whitespace
+    between items.
+    """
+    d = encode(specification)
+    if orjson is not None:
+        try:
+            return orjson.dumps(d, default=default).decode()
+        except TypeError:
+            pass  # Like integers of over 64 bits, or non-str keys
+    return json.dumps(d, separators=(",", ":"), default=default)
+
+
+def loads(s: Union[str, bytes]) -> Specification:
+    if orjson is not None:
+        try:
+            return decode(orjson.loads(s))
+        except orjson.JSONDecodeError:
+            pass  # Like integers of over 64 bits, or NaN
+    return decode(json.loads(s))
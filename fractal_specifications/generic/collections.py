@@ -1,29 +1,105 @@
 from abc import abstractmethod
-from typing import Any, Collection, List
+from typing import Any, Collection, Iterable, Iterator, List, Tuple, Type, TypeVar
 
-from fractal_specifications.generic.specification import Specification
+from fractal_specifications.generic.context import evaluate
+from fractal_specifications.generic.specification import Specification, _Immutable
 
+C = TypeVar("C", bound="CollectionSpecification")
 
-class CollectionSpecification(Specification):
-    def __init__(self, specifications: List[Specification]):
-        self.specifications = specifications
+
+def _flatten(
+    collection: Type["CollectionSpecification"],
+    specifications: Iterable[Specification],
+) -> Iterator[Specification]:
+    for specification in specifications:
+        if type(specification) is collection:
+            yield from specification.specifications
+        else:
+            yield specification
+
+
+class CollectionSpecification(_Immutable, Specification):
+    __slots__ = ("specifications", "_shared")
+
+    specifications: Tuple[Specification, ...]
+
+    def __init__(self, specifications: Iterable[Specification]):
+        object.__setattr__(self, "specifications", tuple(specifications))
+
+    @classmethod
+    def of(cls: Type[C], specifications: Iterable[Specification]) -> C:
+        """
+        Combine all `specifications` at once, in linear time.
+
+        Unlike chaining `&`/`|` (which copies the list of specifications for every
+        step), this builds the list only once. Specifications of the same collection
+        type are flattened, like `And`/`Or` do.
+        """
+        return cls(_flatten(cls, specifications))
+
+    @classmethod
+    def builder(
+        cls, specifications: Iterable[Specification] = ()
+    ) -> "CollectionBuilder":
+        return CollectionBuilder(cls, specifications)
 
     @abstractmethod
     def is_satisfied_by(self, obj: Any) -> bool:
         raise NotImplementedError
 
+    def _shares_fields(self) -> bool:
+        """
+        Whether a field is used by more than one specification in this tree, so
+        evaluating it memoizes field values (see `context`).
+        """
+        try:
+            return self._shared
+        except AttributeError:
+            pass
+        from fractal_specifications.generic.operators import (
+            FieldValueSpecification,
+            NotSpecification,
+        )
+
+        fields = set()
+        shared = False
+        stack = list(self.specifications)
+        while stack and not shared:
+            spec = stack.pop()
+            if isinstance(spec, CollectionSpecification):
+                stack.extend(spec.specifications)
+            elif isinstance(spec, NotSpecification):
+                stack.append(spec.specification)
+            elif isinstance(spec, FieldValueSpecification):
+                shared = spec.field in fields
+                fields.add(spec.field)
+        object.__setattr__(self, "_shared", shared)
+        return shared
+
     def to_collection(self) -> Collection:
-        return self.specifications
+        return list(self.specifications)
 
     def __str__(self):
         specs = ",".join((str(s) for s in self.specifications))
         return f"{self.__class__.__name__}({specs})"
 
     def __eq__(self, other):
-        return type(self) is type(other) and self.specifications == other.specifications
+        if self is other:
+            return True
+        elif type(self) is not type(other):
+            return False
+        try:
+            if hash(self) != hash(other):
+                return False
+        except TypeError:  # unhashable values
+            pass
+        return self.specifications == other.specifications
 
     def __hash__(self):
-        return hash(tuple(self.specifications))
+        return self._cached_hash()
+
+    def _structural_hash(self) -> int:
+        return hash((type(self), self.specifications))
 
     def to_dict(self):
         return {
@@ -36,23 +112,80 @@ class CollectionSpecification(Specification):
         return cls(specifications=[Specification.from_dict(s) for s in d["specs"]])
 
 
-class AndSpecification(CollectionSpecification):
+class AndSpecification(CollectionSpecification, shorthand="&"):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
+        if self._shares_fields():
+            return evaluate(obj, self.specifications, all)
         return all(spec.is_satisfied_by(obj) for spec in self.specifications)
 
     def And(self, specification: Specification) -> Specification:
         if isinstance(specification, AndSpecification):
             return AndSpecification(self.specifications + specification.specifications)
         else:
-            return AndSpecification(self.specifications + [specification])
+            return AndSpecification((*self.specifications, specification))
 
 
-class OrSpecification(CollectionSpecification):
+class OrSpecification(CollectionSpecification, shorthand="|"):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
+        if self._shares_fields():
+            return evaluate(obj, self.specifications, any)
         return any(spec.is_satisfied_by(obj) for spec in self.specifications)
 
     def Or(self, specification: Specification) -> Specification:
         if isinstance(specification, OrSpecification):
             return OrSpecification(self.specifications + specification.specifications)
         else:
-            return OrSpecification(self.specifications + [specification])
+            return OrSpecification((*self.specifications, specification))
+
+
+class CollectionBuilder:
+    """
+    Accumulates specifications in place, to build an And/Or collection at the end.
+
+    ```
+    builder = AndSpecification.builder()
+    for segment in segments:
+        builder &= segment.specification()
+    specification = builder.build()
+    ```
+    """
+
+    def __init__(
+        self,
+        collection: Type[CollectionSpecification],
+        specifications: Iterable[Specification] = (),
+    ):
+        self.collection = collection
+        self.specifications: List[Specification] = []
+        self.extend(specifications)
+
+    def add(self, specification: Specification) -> "CollectionBuilder":
+        if type(specification) is self.collection:
+            self.specifications.extend(specification.specifications)
+        else:
+            self.specifications.append(specification)
+        return self
+
+    def extend(self, specifications: Iterable[Specification]) -> "CollectionBuilder":
+        self.specifications.extend(_flatten(self.collection, specifications))
+        return self
+
+    def __iand__(self, specification: Specification) -> "CollectionBuilder":
+        if self.collection is not AndSpecification:
+            return NotImplemented
+        return self.add(specification)
+
+    def __ior__(self, specification: Specification) -> "CollectionBuilder":
+        if self.collection is not OrSpecification:
+            return NotImplemented
+        return self.add(specification)
+
+    def __len__(self):
+        return len(self.specifications)
+
+    def build(self) -> CollectionSpecification:
+        return self.collection(self.specifications)
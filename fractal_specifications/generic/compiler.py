@@ -0,0 +1,341 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from fractal_specifications.generic.accessors import Accessor, AttributeAccessor
+from fractal_specifications.generic.operators import _field_path, _no_pre_processing
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+_MISSING = object()
+
+
+class SpecificationCompiler:
+    """
+    Turns a specification tree into a single Python function.
+
+    Field paths are resolved into getters once (using the given accessor, which
+    defaults to attribute access), values and pre-processors are bound as constants
+    and And/Or collections are emitted as flat short-circuiting `and`/`or`
+    expressions. Specifications that are unknown to the compiler are evaluated
+    through their own `is_satisfied_by`.
+
+    By default the children of And/Or are evaluated in the order they were given.
+    With `ordering="cost"` they are sorted once by estimated cost and selectivity
+    (see `cost` and `pass_rate`), so cheap checks that are likely to short-circuit
+    run first. With `ordering="adaptive"` every And/Or measures the pass rate of its
+    children on (a sample of) the evaluated objects and periodically reorders them.
+    Reordering assumes children don't have side effects; when several children
+    would raise for an object, a different one may raise first.
+
+    A field path that is used by several specifications is resolved at most once per
+    call of the predicate (lazily, so only when a specification using it is reached).
+    """
+
+    orderings = (None, "cost", "adaptive")
+
+    # Rough relative cost of evaluating a specification type (excluding field access)
+    costs: Dict[str, float] = {
+        "EmptySpecification": 0.0,
+        "IsNoneSpecification": 1.0,
+        "EqualsSpecification": 1.0,
+        "NotEqualsSpecification": 1.0,
+        "LessThanSpecification": 1.2,
+        "LessThanEqualSpecification": 1.2,
+        "GreaterThanSpecification": 1.2,
+        "GreaterThanEqualSpecification": 1.2,
+        "InSpecification": 1.5,
+        "ContainsSpecification": 3.0,
+        "RegexStringMatchSpecification": 10.0,
+    }
+    # Rough estimate of the fraction of objects that satisfy a specification type
+    pass_rates: Dict[str, float] = {
+        "EmptySpecification": 1.0,
+        "IsNoneSpecification": 0.1,
+        "EqualsSpecification": 0.1,
+        "NotEqualsSpecification": 0.9,
+        "InSpecification": 0.2,
+        "ContainsSpecification": 0.3,
+        "RegexStringMatchSpecification": 0.3,
+    }
+    default_cost = 20.0  # unknown (custom) specifications
+    default_pass_rate = 0.5
+    step_cost = 1.0
+    pre_processor_cost = 5.0
+
+    def __init__(
+        self, accessor: Optional[Accessor] = None, ordering: Optional[str] = None
+    ):
+        if ordering not in self.orderings:
+            raise ValueError(
+                f"Unknown ordering '{ordering}', expected one of {self.orderings}"
+            )
+        self.accessor = accessor or AttributeAccessor()
+        self.ordering = ordering
+        self.namespace: Dict[str, Any] = {"_M": _MISSING}
+        self.emitters = self._spec_emitters()
+        self.shared_paths: Set[Tuple[str, ...]] = set()
+        self.memos: Dict[Tuple[str, ...], str] = {}
+
+    def compile(self, specification: Specification) -> Callable[[Any], bool]:
+        try:
+            if self.ordering != "adaptive":
+                # Adaptive collections evaluate their children as separate functions
+                self.shared_paths = self._shared_paths(specification)
+            expression = self._emit(specification)
+            if expression.endswith("(obj)") and expression[:-5] in self.namespace:
+                # A single call, e.g., an adaptive collection, needs no wrapper
+                return self.namespace[expression[:-5]]
+            source = "def predicate(obj):\n"
+            if self.memos:
+                source += f"    {' = '.join(self.memos.values())} = _M\n"
+            source += f"    return {expression}\n"
+            exec(compile(source, "<specification>", "exec"), self.namespace)
+        except (RecursionError, SyntaxError, MemoryError):
+            # Extremely deep trees exceed the limits of the Python compiler
+            return specification.is_satisfied_by
+        return self.namespace["predicate"]
+
+    def cost(self, specification: Specification) -> float:
+        from fractal_specifications.generic import collections, operators
+
+        if isinstance(specification, collections.CollectionSpecification):
+            return sum(self.cost(s) for s in specification.specifications)
+        elif isinstance(specification, operators.NotSpecification):
+            return self.cost(specification.specification)
+        name = type(specification).__name__
+        if name not in self.costs or type(specification) not in self.emitters:
+            return self.default_cost
+        cost = self.costs[name]
+        if isinstance(specification, operators.FieldValueSpecification):
+            cost += self.step_cost * len(_field_path(specification.field))
+            if specification.pre_processor is not _no_pre_processing:
+                cost += self.pre_processor_cost
+            if type(specification) is operators.InSpecification and isinstance(
+                specification._values, (list, tuple)
+            ):
+                cost += len(specification._values) / 4  # linear scan
+        return cost
+
+    def pass_rate(self, specification: Specification) -> float:
+        from fractal_specifications.generic import collections, operators
+
+        if isinstance(specification, collections.AndSpecification):
+            rate = 1.0
+            for spec in specification.specifications:
+                rate *= self.pass_rate(spec)
+            return rate
+        elif isinstance(specification, collections.OrSpecification):
+            rate = 1.0
+            for spec in specification.specifications:
+                rate *= 1.0 - self.pass_rate(spec)
+            return 1.0 - rate
+        elif isinstance(specification, operators.NotSpecification):
+            return 1.0 - self.pass_rate(specification.specification)
+        return self.pass_rates.get(type(specification).__name__, self.default_pass_rate)
+
+    def _order(
+        self, specifications: List[Specification], op: str
+    ) -> List[Specification]:
+        # Evaluate first what is cheap and likely to decide the outcome: a child
+        # that fails (for and) or passes (for or) stops the evaluation
+        def rank(specification: Specification) -> float:
+            rate = self.pass_rate(specification)
+            decisive = 1.0 - rate if op == "and" else rate
+            return _rank(self.cost(specification), decisive)
+
+        return sorted(specifications, key=rank)
+
+    def _shared_paths(self, specification: Specification) -> Set[Tuple[str, ...]]:
+        from fractal_specifications.generic import collections, operators
+
+        seen: Set[Tuple[str, ...]] = set()
+        shared: Set[Tuple[str, ...]] = set()
+        stack = [specification]
+        while stack:
+            spec = stack.pop()
+            if type(spec) not in self.emitters:
+                continue
+            elif isinstance(spec, collections.CollectionSpecification):
+                stack.extend(spec.specifications)
+            elif isinstance(spec, operators.NotSpecification):
+                stack.append(spec.specification)
+            elif isinstance(spec, operators.FieldValueSpecification):
+                path = _field_path(spec.field)
+                (shared if path in seen else seen).add(path)
+        return shared
+
+    def _bind(self, value: Any) -> str:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def _emit(self, specification: Specification) -> str:
+        if emitter := self.emitters.get(type(specification)):
+            return emitter(specification)
+        return f"{self._bind(specification.is_satisfied_by)}(obj)"
+
+    def _emit_value(self, specification) -> str:
+        path = _field_path(specification.field)
+        value = "obj"
+        for step in self.accessor.steps(path):
+            value = f"{self._bind(step)}({value})"
+        if path in self.shared_paths:
+            if path not in self.memos:
+                # Evaluation is left to right, so the first occurrence always resolves
+                memo = self.memos[path] = f"_m{len(self.memos)}"
+                value = f"({memo} := {value})"
+            else:
+                memo = self.memos[path]
+                value = f"({memo} if {memo} is not _M else ({memo} := {value}))"
+        if specification.pre_processor is not _no_pre_processing:
+            value = f"{self._bind(specification.pre_processor)}({value})"
+        return value
+
+    def _emit_comparison(self, specification, operator: str) -> str:
+        value = self._emit_value(specification)
+        return f"{value} {operator} {self._bind(specification.value)}"
+
+    def _emit_collection(self, specifications: List[Specification], op: str) -> str:
+        if not specifications:
+            return "True" if op == "and" else "False"
+        elif self.ordering == "adaptive" and len(specifications) > 1:
+            collection = AdaptiveCollection(
+                [
+                    SpecificationCompiler(self.accessor, self.ordering).compile(s)
+                    for s in specifications
+                ],
+                [self.cost(s) for s in specifications],
+                op == "and",
+            )
+            return f"{self._bind(collection)}(obj)"
+        elif self.ordering == "cost":
+            specifications = self._order(specifications, op)
+        return "(" + f" {op} ".join(self._emit(s) for s in specifications) + ")"
+
+    def _spec_emitters(self) -> Dict[type, Callable[[Any], str]]:
+        from fractal_specifications.generic import collections, operators
+
+        return {
+            EmptySpecification: lambda s: "True",
+            collections.AndSpecification: lambda s: self._emit_collection(
+                s.specifications, "and"
+            ),
+            collections.OrSpecification: lambda s: self._emit_collection(
+                s.specifications, "or"
+            ),
+            operators.NotSpecification: lambda s: f"(not {self._emit(s.specification)})",
+            operators.EqualsSpecification: lambda s: self._emit_comparison(s, "=="),
+            operators.NotEqualsSpecification: lambda s: self._emit_comparison(s, "!="),
+            operators.LessThanSpecification: lambda s: self._emit_comparison(s, "<"),
+            operators.LessThanEqualSpecification: lambda s: self._emit_comparison(
+                s, "<="
+            ),
+            operators.GreaterThanSpecification: lambda s: self._emit_comparison(s, ">"),
+            operators.GreaterThanEqualSpecification: lambda s: self._emit_comparison(
+                s, ">="
+            ),
+            operators.InSpecification: lambda s: (
+                f"{self._emit_value(s)} in {self._bind(s._values)}"
+            ),
+            operators.IsNoneSpecification: lambda s: f"{self._emit_value(s)} is None",
+            operators.ContainsSpecification: lambda s: (
+                f"({self._bind(s.value)} in _v if (_v := {self._emit_value(s)}) "
+                "else False)"
+            ),
+            operators.RegexStringMatchSpecification: lambda s: (
+                f"{self._bind(s.pattern.match)}({self._emit_value(s)}) is not None"
+            ),
+        }
+
+
+def _rank(cost: float, decisive: float) -> float:
+    return cost / decisive if decisive > 0 else float("inf")
+
+
+class AdaptiveCollection:
+    """
+    And (`conjunction=True`) or Or over compiled predicates that reorders itself.
+
+    Every `sample_interval`-th call all predicates are evaluated once more (without
+    short-circuiting, exceptions count as not passed) to get unbiased pass rates.
+    The result itself is always computed by evaluating predicates in the current
+    order until the outcome is decided. After `samples_per_reorder` samples the
+    predicates are reordered by `cost / P(decisive)`, based on the measured rates.
+    """
+
+    __slots__ = (
+        "predicates",
+        "costs",
+        "conjunction",
+        "sample_interval",
+        "samples_per_reorder",
+        "order",
+        "passed",
+        "samples",
+        "calls",
+    )
+
+    def __init__(
+        self,
+        predicates: Sequence[Callable[[Any], bool]],
+        costs: Sequence[float],
+        conjunction: bool,
+        sample_interval: int = 16,
+        samples_per_reorder: int = 64,
+    ):
+        self.predicates = list(predicates)
+        self.costs = list(costs)
+        self.conjunction = conjunction
+        self.sample_interval = sample_interval
+        self.samples_per_reorder = samples_per_reorder
+        self.order = list(self.predicates)
+        self.passed = [0] * len(self.predicates)
+        self.samples = 0
+        self.calls = 0
+
+    def __call__(self, obj) -> bool:
+        self.calls += 1
+        if self.calls % self.sample_interval == 0:
+            self._sample(obj)
+        if self.conjunction:
+            for predicate in self.order:
+                if not predicate(obj):
+                    return False
+            return True
+        for predicate in self.order:
+            if predicate(obj):
+                return True
+        return False
+
+    def _sample(self, obj):
+        for index, predicate in enumerate(self.predicates):
+            try:
+                self.passed[index] += bool(predicate(obj))
+            except Exception:
+                # E.g., a child that is normally guarded by a short-circuited sibling
+                pass
+        self.samples += 1
+        if self.samples % self.samples_per_reorder == 0:
+            self.reorder()
+
+    def pass_rates(self) -> List[float]:
+        # Laplace smoothing, so a predicate is never considered to always pass/fail
+        return [(passed + 1) / (self.samples + 2) for passed in self.passed]
+
+    def reorder(self):
+        rates = self.pass_rates()
+        ranks = [
+            _rank(self.costs[i], 1.0 - rate if self.conjunction else rate)
+            for i, rate in enumerate(rates)
+        ]
+        indices = sorted(range(len(self.predicates)), key=ranks.__getitem__)
+        self.order = [self.predicates[i] for i in indices]
+
+
+def compile_specification(
+    specification: Specification,
+    accessor: Optional[Accessor] = None,
+    ordering: Optional[str] = None,
+) -> Callable[[Any], bool]:
+    return SpecificationCompiler(accessor, ordering).compile(specification)
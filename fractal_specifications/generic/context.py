@@ -0,0 +1,79 @@
+from threading import local
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_NOTHING = object()
+
+# One item per active context over all threads, so field lookups can skip the thread
+# local when there is none (appending and popping are atomic)
+_active: List[None] = []
+
+
+class _State(local):
+    """
+    The evaluation context of the current thread: the object being evaluated and
+    the values of its fields that have been resolved so far.
+
+    Evaluating a specification is synchronous, so a thread local is sufficient to
+    keep concurrent evaluations apart.
+    """
+
+    def __init__(self):
+        self.context: Tuple[Any, Dict[str, Any]] = (_NOTHING, {})
+
+
+_state = _State()
+
+
+def current_values(obj: Any) -> Optional[Dict[str, Any]]:
+    """Field values resolved so far for `obj`, or None if it isn't being evaluated."""
+    context = _state.context
+    return context[1] if context[0] is obj else None
+
+
+def evaluate(
+    obj: Any,
+    specifications: Iterable,
+    combine: Callable[[Iterable[bool]], bool],
+) -> bool:
+    """
+    Evaluate `specifications` against `obj` and `combine` (`all`/`any`) the results,
+    resolving every distinct field path of `obj` at most once.
+
+    Contexts nest: evaluating another object in between (like a custom specification
+    that evaluates a child object) temporarily uses a new context. Errors are not
+    memoized, so a failing lookup raises again when repeated.
+    """
+    context = _state.context
+    if context[0] is obj:
+        return combine(spec.is_satisfied_by(obj) for spec in specifications)
+    _state.context = (obj, {})
+    _active.append(None)
+    try:
+        return combine(spec.is_satisfied_by(obj) for spec in specifications)
+    finally:
+        _active.pop()
+        _state.context = context
+
+
+class evaluation_context:
+    """
+    Memoize field values of `obj` within a block, e.g., in a custom specification
+    that evaluates several other specifications against the same object.
+    """
+
+    __slots__ = ("obj", "previous")
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+        self.previous: Optional[Tuple[Any, Dict[str, Any]]] = None
+
+    def __enter__(self):
+        if _state.context[0] is not self.obj:
+            self.previous = _state.context
+            _state.context = (self.obj, {})
+            _active.append(None)
+
+    def __exit__(self, *exc_info):
+        if self.previous is not None:
+            _active.pop()
+            _state.context = self.previous
@@ -0,0 +1,389 @@
+import math
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.operators import (
+    ContainsSpecification,
+    EqualsSpecification,
+    GreaterThanEqualSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    LessThanEqualSpecification,
+    LessThanSpecification,
+    NotEqualsSpecification,
+    NotSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+    _Immutable,
+)
+from fractal_specifications.generic.templates import (
+    Placeholder,
+    SpecificationTemplate,
+)
+
+# The terminals of the grammar in `dsl_parser`, matched at a position in the string.
+# Like Lark's contextual lexer, keywords are only recognized where they are expected:
+# `in == 1` compares a field named `in`, while `a isNone` reads as `a is None`.
+_WS = re.compile(r"[ \t\f\r\n]*")
+_FIELD_NAME = re.compile(
+    r"[A-Za-z_][A-Za-z0-9_]*(?:[ \t\f\r\n]*\.[ \t\f\r\n]*[A-Za-z_][A-Za-z0-9_]*)*"
+)
+_OPERATOR = re.compile(r"==|!=|<=|>=|<|>|in|matches|is|contains")
+# A field name and operator in one go (the common case); the lookaheads keep names
+# from being cut short when there's no operator, like in `Nonematches`
+_CONDITION = re.compile(
+    r"([A-Za-z_][A-Za-z0-9_]*(?![A-Za-z0-9_])"
+    r"(?:[ \t\f\r\n]*\.[ \t\f\r\n]*[A-Za-z_][A-Za-z0-9_]*(?![A-Za-z0-9_]))*)"
+    rf"[ \t\f\r\n]*({_OPERATOR.pattern})[ \t\f\r\n]*"
+)
+# A value, tried in the order of Lark's lexer: strings, floats before ints, keywords
+_VALUE = re.compile(
+    r"""(?P<string>".*?(?<!\\)(?:\\\\)*?"|"[^"]*"|'[^']*')"""
+    r"|(?P<float>[+-]?(?:[0-9]+[eE][+-]?[0-9]+"
+    r"|(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?))"
+    r"|(?P<int>[+-]?[0-9]+)"
+    r"|(?P<constant>True|False|None)"
+    r"|(?P<named>:[A-Za-z_][A-Za-z0-9_]*)"
+    r"|(?P<positional>\$[1-9][0-9]*)"
+)
+_SEPARATOR = re.compile(r"[ \t\f\r\n]*(?:,[ \t\f\r\n]*|(?=\]))")
+_REGEX_FLAGS = re.compile(r"[aimsx]+")
+
+_COMPARISONS = {
+    "==": EqualsSpecification,
+    "!=": NotEqualsSpecification,
+    "<": LessThanSpecification,
+    "<=": LessThanEqualSpecification,
+    ">": GreaterThanSpecification,
+    ">=": GreaterThanEqualSpecification,
+}
+_CONSTANTS = {"True": True, "False": False, "None": None}
+
+
+class DSLSyntaxError(ValueError):
+    """Raised when a DSL string can't be parsed, pointing at the offending position."""
+
+    def __init__(self, dsl_string: str, pos: int, expected: str):
+        self.dsl_string = dsl_string
+        self.pos = pos
+        self.line = dsl_string.count("\n", 0, pos) + 1
+        self.column = pos - (dsl_string.rfind("\n", 0, pos) + 1) + 1
+        found = repr(dsl_string[pos]) if pos < len(dsl_string) else "end of input"
+        super().__init__(
+            f"Expected {expected} at line {self.line}, column {self.column}, "
+            f"found {found}"
+        )
+
+
+class DSLParser:
+    """
+    A dependency-free, hand-written parser for the DSL.
+
+    It accepts the same language as the Lark grammar in `dsl_parser` and builds the
+    same specifications as `DSLTransformer`, so the two are interchangeable; this one
+    needs no grammar to be loaded, which keeps imports and parsing fast.
+    """
+
+    __slots__ = ("text", "placeholders")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.placeholders = False
+
+    def parse(self) -> Specification:
+        # Iterative, so deeply nested parentheses don't hit the recursion limit: an
+        # opening parenthesis starts a new group, which becomes a specification in its
+        # parent group when closed.
+        text = self.text
+        groups: List[_Group] = []
+        group = _Group(False)
+        pos = 0
+        while True:
+            pos = _WS.match(text, pos).end()
+            char = text[pos : pos + 1]
+            if char == "(" or char == "!":
+                if char == "!":
+                    pos = _WS.match(text, pos + 1).end()
+                    if not text.startswith("(", pos):
+                        raise DSLSyntaxError(text, pos, "'('")
+                groups.append(group)
+                group = _Group(char == "!")
+                pos += 1
+                continue
+            specification, pos = self._condition(pos)
+            while True:
+                group.specifications.append(specification)
+                pos = _WS.match(text, pos).end()
+                op = text[pos : pos + 2]
+                if op == "&&" or op == "||":
+                    group.operator(op)
+                    pos += 2
+                    break
+                elif not groups:
+                    if pos < len(text):
+                        raise DSLSyntaxError(text, pos, "'&&', '||' or end of input")
+                    return group.build()
+                elif not text.startswith(")", pos):
+                    raise DSLSyntaxError(text, pos, "'&&', '||' or ')'")
+                specification = group.build()
+                group = groups.pop()
+                pos += 1
+
+    def _condition(self, pos: int) -> Tuple[Specification, int]:
+        text = self.text
+        if not (match := _CONDITION.match(text, pos)):
+            if text.startswith("#", pos):
+                return EmptySpecification(), pos + 1
+            elif not (match := _FIELD_NAME.match(text, pos)):
+                raise DSLSyntaxError(text, pos, "a field name, '(', '!' or '#'")
+            raise DSLSyntaxError(
+                text, _WS.match(text, match.end()).end(), "an operator"
+            )
+        field_name, op = match.groups()
+        if "." in field_name:
+            field_name = "".join(field_name.split())
+        pos = match.end()
+        if op in _COMPARISONS:
+            value, pos = self._value(pos)
+            return _COMPARISONS[op](field_name, value), pos
+        elif op == "in":
+            values, pos = self._values(pos)
+            return InSpecification(field_name, values), pos
+        elif op == "matches":
+            if text[pos : pos + 1] not in ('"', "'", ":", "$"):
+                raise DSLSyntaxError(text, pos, "a string")
+            value, pos = self._value(pos)
+            flags = ""
+            end = _WS.match(text, pos).end()
+            if text.startswith("/", end):
+                end = _WS.match(text, end + 1).end()
+                if not (match := _REGEX_FLAGS.match(text, end)):
+                    raise DSLSyntaxError(text, end, "regex flags")
+                flags, pos = match.group(), match.end()
+            return RegexStringMatchSpecification(field_name, value, flags=flags), pos
+        elif op == "is":
+            if not text.startswith("None", pos):
+                raise DSLSyntaxError(text, pos, "'None'")
+            return IsNoneSpecification(field_name), pos + 4
+        value, pos = self._value(pos)
+        return ContainsSpecification(field_name, value), pos
+
+    def _values(self, pos: int) -> Tuple[List[Any], int]:
+        text = self.text
+        if not text.startswith("[", pos):
+            raise DSLSyntaxError(text, pos, "'['")
+        values = []
+        match = _WS.match(text, pos + 1)
+        while not text.startswith("]", pos := match.end()):
+            value, pos = self._value(pos)
+            values.append(value)
+            if not (match := _SEPARATOR.match(text, pos)):
+                raise DSLSyntaxError(text, _WS.match(text, pos).end(), "',' or ']'")
+        return values, pos + 1
+
+    def _value(self, pos: int) -> Tuple[Any, int]:
+        if not (match := _VALUE.match(self.text, pos)):
+            if self.text[pos : pos + 1] in (":", "$"):
+                raise DSLSyntaxError(
+                    self.text, pos + 1, "a placeholder name or position"
+                )
+            raise DSLSyntaxError(self.text, pos, "a value")
+        kind, value = match.lastgroup, match.group()
+        if kind == "int":
+            return int(value), match.end()
+        elif kind == "string":
+            return value[1:-1], match.end()
+        elif kind == "float":
+            return float(value), match.end()
+        elif kind == "constant":
+            return _CONSTANTS[value], match.end()
+        self.placeholders = True
+        key = value[1:]
+        return Placeholder(key if kind == "named" else int(key)), match.end()
+
+
+class _Group:
+    """
+    The specifications in (a pair of parentheses of) a DSL string parsed so far.
+
+    `&&` and `||` have equal precedence and associate to the left; a run of the same
+    operator builds a single And/Or, like the grammar's `(...)+` repetition.
+    """
+
+    __slots__ = ("negate", "op", "specifications")
+
+    def __init__(self, negate: bool):
+        self.negate = negate
+        self.op = ""
+        self.specifications: List[Specification] = []
+
+    def operator(self, op: str):
+        if op != self.op:
+            if self.op:
+                self.specifications = [self._combine()]
+            self.op = op
+
+    def _combine(self) -> Specification:
+        if self.op == "&&":
+            return AndSpecification(self.specifications)
+        elif self.op == "||":
+            return OrSpecification(self.specifications)
+        return self.specifications[0]
+
+    def build(self) -> Specification:
+        specification = self._combine()
+        return NotSpecification(specification) if self.negate else specification
+
+
+def parse_dsl(dsl_string: str) -> Union[Specification, SpecificationTemplate]:
+    parser = DSLParser(dsl_string)
+    specification = parser.parse()
+    if parser.placeholders:
+        return SpecificationTemplate(specification)
+    return specification
+
+
+# Writing DSL strings; every value the DSL has syntax for is written such that it's
+# parsed back as it is, other values (like dates) by their repr, as before
+
+_FIELD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*")
+_ESCAPED_STRING = re.compile(r'".*?(?<!\\)(?:\\\\)*?"')
+
+
+def _dump_string(value: str) -> str:
+    # There are no escape sequences: a double quoted string must end at its own
+    # closing quote, otherwise a single quoted string must not contain any quote
+    quoted = f'"{value}"'
+    if (match := _ESCAPED_STRING.match(quoted)) and match.end() == len(quoted):
+        return quoted
+    elif "'" not in value:
+        return f"'{value}'"
+    raise ValueError(f"String {value!r} can't be written in the DSL")
+
+
+def _dump_float(value: float) -> str:
+    if not math.isfinite(value):
+        raise ValueError(f"Float {value!r} can't be written in the DSL")
+    return repr(value)
+
+
+_VALUES: Dict[type, Callable[[Any], str]] = {
+    str: _dump_string,
+    int: repr,
+    float: _dump_float,
+    bool: repr,
+    type(None): repr,
+    Placeholder: repr,
+}
+
+
+def _dump_value(value: Any) -> str:
+    if (dump := _VALUES.get(type(value))) is not None:
+        return dump(value)
+    for base in (int, float, str):  # e.g., enums
+        if isinstance(value, base):
+            return _VALUES[base](base(value))
+    return repr(value)
+
+
+@lru_cache(maxsize=1024)
+def _dump_field(field: str) -> str:
+    if not _FIELD.fullmatch(field):
+        raise ValueError(f"Field {field!r} can't be written in the DSL")
+    return field
+
+
+def _dump_comparison(op: str) -> Callable[[Any], str]:
+    op = f" {op} "
+    return lambda spec: _dump_field(spec.field) + op + _dump_value(spec.value)
+
+
+def _dump_in(specification: InSpecification) -> str:
+    if not isinstance(specification.value, (list, tuple, set, frozenset)):
+        raise ValueError(f"Value {specification.value!r} can't be written in the DSL")
+    values = ", ".join(map(_dump_value, specification.value))
+    return f"{_dump_field(specification.field)} in [{values}]"
+
+
+def _dump_matches(specification: RegexStringMatchSpecification) -> str:
+    if type(specification.value) not in (str, Placeholder):
+        raise ValueError(f"Pattern {specification.value!r} can't be written in the DSL")
+    pattern = _dump_value(specification.value)
+    flags = f"/{specification.flags}" if specification.flags else ""
+    return f"{_dump_field(specification.field)} matches {pattern}{flags}"
+
+
+_CONDITIONS: Dict[type, Callable[[Any], str]] = {
+    EqualsSpecification: _dump_comparison("=="),
+    NotEqualsSpecification: _dump_comparison("!="),
+    LessThanSpecification: _dump_comparison("<"),
+    LessThanEqualSpecification: _dump_comparison("<="),
+    GreaterThanSpecification: _dump_comparison(">"),
+    GreaterThanEqualSpecification: _dump_comparison(">="),
+    ContainsSpecification: _dump_comparison("contains"),
+    InSpecification: _dump_in,
+    RegexStringMatchSpecification: _dump_matches,
+    IsNoneSpecification: lambda spec: f"{_dump_field(spec.field)} is None",
+    EmptySpecification: lambda spec: "#",
+}
+_SEPARATORS = {AndSpecification: " && ", OrSpecification: " || "}
+
+
+def dump_dsl(specification: Specification) -> str:
+    """
+    Write `specification` as DSL string, such that `load_dsl` parses it back into an
+    equal specification. Values the DSL has no syntax for (like dates, decimals and
+    UUIDs) are written by their repr, which doesn't parse back.
+
+    The tree is walked without recursion, writing into a single buffer. The result
+    is cached on (immutable) specifications, and reused when they're part of a
+    specification that is written later. Custom specifications can implement
+    `dump_dsl` themselves.
+    """
+    parts: List[str] = []
+    # The collections (and negations) being written: their remaining children and
+    # the separator to write before each of them
+    frames: List[Tuple[Iterator[Specification], str]] = []
+    node = specification
+    while True:
+        cls = type(node)
+        if (dump := _CONDITIONS.get(cls)) is not None:
+            parts.append(dump(node))
+        elif (text := getattr(node, "_dsl", None)) is not None:
+            parts.append(text)
+        elif (separator := _SEPARATORS.get(cls)) is not None:
+            if not node.specifications:
+                raise ValueError(f"Empty {cls.__name__} can't be written in the DSL")
+            children = iter(node.specifications)
+            frames.append((children, separator))
+            parts.append("(")
+            node = next(children)
+            continue
+        elif cls is NotSpecification:
+            frames.append((iter(()), ""))
+            parts.append("!(")
+            node = node.specification
+            continue
+        elif cls.dump_dsl is not Specification.dump_dsl:
+            parts.append(node.dump_dsl())
+        else:
+            raise ValueError(f"Unsupported specification type: {cls}")
+        while frames:
+            children, separator = frames[-1]
+            if (node := next(children, None)) is not None:
+                parts.append(separator)
+                break
+            frames.pop()
+            parts.append(")")
+        else:
+            break
+    text = "".join(parts)
+    if isinstance(specification, _Immutable):
+        object.__setattr__(specification, "_dsl", text)
+    return text
@@ -1,4 +1,7 @@
-from lark import Transformer
+from threading import Lock
+from typing import Optional, Union
+
+from lark import Lark, Transformer
 
 from fractal_specifications.generic.collections import AndSpecification, OrSpecification
 from fractal_specifications.generic.operators import (
@@ -14,7 +17,15 @@ from fractal_specifications.generic.operators import (
     NotSpecification,
     RegexStringMatchSpecification,
 )
-from fractal_specifications.generic.specification import EmptySpecification
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+from fractal_specifications.generic.templates import (
+    Placeholder,
+    SpecificationTemplate,
+    templated,
+)
 
 grammar = r"""
     ?start: expression
@@ -25,15 +36,17 @@ grammar = r"""
         | atom_expression -> atom_expression
         | not_expression -> atom_expression
         | field_name "in" "[" field_values "]" -> in_expression
-        | field_name "matches" string_value -> match_expression
+        | field_name "matches" (string_value | placeholder) regex_flags? -> match_expression
         | field_name "is" "None" -> is_none_expression
         | field_name "contains" field_value -> contains_expression
         | empty_expression
     empty_expression: "#"
+    regex_flags: "/" REGEX_FLAGS
     not_expression: "!" atom_expression
     atom_expression: "(" expression ")"
     field_values: (field_value ",")* field_value?
-    field_value: string_value | number_value | boolean_value | none_value
+    field_value: string_value | number_value | boolean_value | none_value | placeholder
+    placeholder: NAMED_PLACEHOLDER | POSITIONAL_PLACEHOLDER
     comparison_operator: "==" -> eq_op
         | "!=" -> neq_op
         | "<" -> lt_op
@@ -47,6 +60,9 @@ grammar = r"""
     none_value: "None" -> none
     DOUBLE_QUOTED_STRING  : /"[^"]*"/
     SINGLE_QUOTED_STRING  : /'[^']*'/
+    REGEX_FLAGS: /[aimsx]+/
+    NAMED_PLACEHOLDER: /:[A-Za-z_][A-Za-z0-9_]*/
+    POSITIONAL_PLACEHOLDER: /\$[1-9][0-9]*/
     %import common.ESCAPED_STRING
     %import common.SIGNED_FLOAT
     %import common.SIGNED_INT
@@ -117,8 +133,11 @@ class DSLTransformer(Transformer):
         return InSpecification(field_name, values)
 
     def match_expression(self, items):
-        field_name, value = items
-        return RegexStringMatchSpecification(field_name, value)
+        field_name, value, *flags = items
+        return RegexStringMatchSpecification(field_name, value, flags="".join(flags))
+
+    def regex_flags(self, items):
+        return str(items[0])
 
     def contains_expression(self, items):
         field_name, value = items
@@ -139,7 +158,7 @@ class DSLTransformer(Transformer):
             return None
         elif type(token) is str:
             return token
-        elif type(token) is bool:
+        elif type(token) in (bool, Placeholder):
             return token
         elif token.type == "SIGNED_INT":
             return int(token)
@@ -160,3 +179,37 @@ class DSLTransformer(Transformer):
 
     def none(self, items):
         return None
+
+    def placeholder(self, items):
+        token = items[0]
+        if token.type == "NAMED_PLACEHOLDER":
+            return Placeholder(str(token)[1:])
+        return Placeholder(int(token[1:]))
+
+
+_parser: Optional[Lark] = None
+_parser_lock = Lock()
+
+
+def get_parser() -> Lark:
+    """
+    The DSL parser, built on first use and shared by all threads afterwards.
+
+    The transformer is applied while parsing (supported by the LALR parser), so no
+    intermediate parse tree is built.
+    """
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = Lark(
+                    grammar, start="start", parser="lalr", transformer=DSLTransformer()
+                )
+    return _parser
+
+
+def parse_dsl(dsl_string: str) -> Union[Specification, SpecificationTemplate]:
+    specification = get_parser().parse(dsl_string)
+    if ":" in dsl_string or "$" in dsl_string:
+        return templated(specification)
+    return specification
@@ -0,0 +1,338 @@
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from fractal_specifications.generic import operators
+from fractal_specifications.generic.accessors import Accessor, AttributeAccessor
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+T = TypeVar("T")
+
+Rows = Collection[int]
+
+# Looked up by name: eq, lt, lte, gt or gte
+_COMPARISONS = {
+    operators.EqualsSpecification,
+    operators.LessThanSpecification,
+    operators.LessThanEqualSpecification,
+    operators.GreaterThanSpecification,
+    operators.GreaterThanEqualSpecification,
+}
+
+
+class _HashIndex:
+    """Rows by value of a field, for `==`, `!=`, `in` and `is None`."""
+
+    __slots__ = ("rows", "unindexed")
+
+    def __init__(self):
+        self.rows: Dict[Any, Set[int]] = {}
+        # Rows with an unhashable value
+        self.unindexed: Set[int] = set()
+
+    def add(self, value: Any, row: int):
+        try:
+            rows = self.rows.get(value)
+        except TypeError:
+            self.unindexed.add(row)
+            return
+        if rows is None:
+            self.rows[value] = {row}
+        else:
+            rows.add(row)
+
+    def remove(self, value: Any, row: int):
+        if row in self.unindexed:
+            self.unindexed.remove(row)
+            return
+        rows = self.rows[value]
+        rows.remove(row)
+        if not rows:
+            del self.rows[value]
+
+    def equal(self, value: Any) -> Optional[Rows]:
+        try:
+            return self.rows.get(value, ())
+        except TypeError:
+            return None
+
+
+class _SortedIndex:
+    """Rows sorted by value of a field (using bisect), for comparisons."""
+
+    __slots__ = ("values", "rows", "none", "unindexed")
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.rows: List[int] = []
+        self.none: Set[int] = set()
+        # Rows with a value that can't be compared to the others
+        self.unindexed: Set[int] = set()
+
+    def extend(self, items: List[Tuple[Any, int]]):
+        """Add many (value, row) items to an empty index, sorting them once."""
+        self.none.update(row for value, row in items if value is None)
+        items = [item for item in items if item[0] is not None]
+        try:
+            items.sort(key=itemgetter(0))
+        except TypeError:
+            for value, row in items:
+                self.add(value, row)
+            return
+        self.values = [value for value, _ in items]
+        self.rows = [row for _, row in items]
+
+    def add(self, value: Any, row: int):
+        if value is None:
+            self.none.add(row)
+            return
+        try:
+            i = bisect_right(self.values, value)
+        except TypeError:
+            self.unindexed.add(row)
+            return
+        self.values.insert(i, value)
+        self.rows.insert(i, row)
+
+    def remove(self, value: Any, row: int):
+        if value is None:
+            self.none.remove(row)
+        elif row in self.unindexed:
+            self.unindexed.remove(row)
+        else:
+            lo = bisect_left(self.values, value)
+            i = self.rows.index(row, lo, bisect_right(self.values, value, lo))
+            del self.values[i]
+            del self.rows[i]
+
+    def range(self, op: str, value: Any) -> Optional[Rows]:
+        try:
+            if op == "lt":
+                return self.rows[: bisect_left(self.values, value)]
+            elif op == "lte":
+                return self.rows[: bisect_right(self.values, value)]
+            elif op == "gt":
+                return self.rows[bisect_right(self.values, value) :]
+            elif op == "gte":
+                return self.rows[bisect_left(self.values, value) :]
+            elif value is None:
+                return self.none
+            lo = bisect_left(self.values, value)
+            return self.rows[lo : bisect_right(self.values, value, lo)]
+        except TypeError:
+            return None
+
+
+class SpecificationIndex(Generic[T]):
+    """
+    In-memory collection of objects with indexes on their fields, to find the objects
+    that satisfy a specification without checking all of them (e.g., to back an
+    in-memory repository).
+
+    Fields in `hash_fields` get a hash index, used for `==`, `!=`, `in` and `is None`.
+    Fields in `sorted_fields` get a sorted index, used for `<`, `<=`, `>` and `>=` (and
+    the others when there's no hash index). And/Or/Not combine the rows found by
+    their children with set operations. Children of an And that can't be looked up
+    (like `contains`, or specifications with a pre-processor) are only checked for
+    the objects found by the others; a specification that can't be looked up at all
+    is checked for every object.
+
+    Objects are identified by the value of the `key` field, or by identity when
+    there's no key. Objects that are changed in place must be updated in the index.
+    Query results are in the order the objects were inserted.
+
+    Unlike `is_satisfied_by`, comparisons are False for objects with None as value
+    for the field, instead of raising a TypeError.
+    """
+
+    def __init__(
+        self,
+        objects: Iterable[T] = (),
+        *,
+        hash_fields: Iterable[str] = (),
+        sorted_fields: Iterable[str] = (),
+        key: Optional[str] = None,
+        accessor: Optional[Accessor] = None,
+    ):
+        self.accessor = accessor or AttributeAccessor()
+        self.hash_indexes = {field: _HashIndex() for field in hash_fields}
+        self.sorted_indexes = {field: _SortedIndex() for field in sorted_fields}
+        self.fields = tuple({**self.hash_indexes, **self.sorted_indexes})
+        self._getters = [self.accessor.getter(field) for field in self.fields]
+        self._key: Callable[[T], Hashable] = (
+            self.accessor.getter(key) if key is not None else id
+        )
+        self._objects: Dict[int, T] = {}
+        self._values: Dict[int, Tuple[Any, ...]] = {}
+        self._rows: Dict[Hashable, int] = {}
+        self._next_row = 0
+
+        # Sort the values for the sorted indexes once, not per object
+        sorted_indexes = self.sorted_indexes
+        self.sorted_indexes = {}
+        for obj in objects:
+            self.insert(obj)
+        self.sorted_indexes = sorted_indexes
+        for field, index in sorted_indexes.items():
+            i = self.fields.index(field)
+            index.extend([(v[i], row) for row, v in self._values.items()])
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._objects.values())
+
+    def __contains__(self, obj: T) -> bool:
+        return self._key(obj) in self._rows
+
+    def insert(self, obj: T):
+        key = self._key(obj)
+        if key in self._rows:
+            raise ValueError(f"Object with key {key!r} is already in the index")
+        row = self._rows[key] = self._next_row
+        self._next_row += 1
+        self._objects[row] = obj
+        self._add(row, obj)
+
+    def update(self, obj: T):
+        """Replace the object with the same key (or the same object, changed)."""
+        row = self._rows[self._key(obj)]
+        self._remove(row)
+        self._objects[row] = obj
+        self._add(row, obj)
+
+    def delete(self, obj: T):
+        row = self._rows.pop(self._key(obj))
+        self._remove(row)
+        del self._objects[row]
+
+    def _add(self, row: int, obj: T):
+        values = self._values[row] = tuple(get(obj) for get in self._getters)
+        for field, value in zip(self.fields, values, strict=True):
+            if index := self.hash_indexes.get(field):
+                index.add(value, row)
+            if index := self.sorted_indexes.get(field):
+                index.add(value, row)
+
+    def _remove(self, row: int):
+        for field, value in zip(self.fields, self._values.pop(row), strict=True):
+            if index := self.hash_indexes.get(field):
+                index.remove(value, row)
+            if index := self.sorted_indexes.get(field):
+                index.remove(value, row)
+
+    def filter(self, specification: Specification) -> List[T]:
+        objects = self._objects
+        rows = self._lookup(specification)
+        if rows is None:
+            return list(filter(specification.compile(self.accessor), self))
+        return [objects[row] for row in sorted(rows)]
+
+    def count(self, specification: Specification) -> int:
+        rows = self._lookup(specification)
+        if rows is None:
+            return specification.count(self, self.accessor)
+        return len(rows)
+
+    def _lookup(self, specification: Specification) -> Optional[Rows]:
+        """The rows satisfying `specification`, None if it can't be looked up."""
+        cls = type(specification)
+        if cls is AndSpecification:
+            return self._lookup_and(specification.specifications)
+        elif cls is OrSpecification:
+            found = []
+            for child in specification.specifications:
+                if (rows := self._lookup(child)) is None:
+                    return None
+                found.append(rows)
+            return set().union(*found)
+        elif cls is operators.NotSpecification:
+            rows = self._lookup(specification.specification)
+            return None if rows is None else self._objects.keys() - rows
+        elif cls is EmptySpecification:
+            return self._objects.keys()
+        elif cls is operators.NotEqualsSpecification:
+            rows = self._lookup_field(specification, "eq", specification.value)
+            return None if rows is None else self._objects.keys() - rows
+        elif cls is operators.InSpecification:
+            found = []
+            for value in specification.value:
+                if (rows := self._lookup_field(specification, "eq", value)) is None:
+                    return None
+                found.append(rows)
+            return set().union(*found)
+        elif cls is operators.IsNoneSpecification:
+            return self._lookup_field(specification, "eq", None)
+        elif cls in _COMPARISONS:
+            return self._lookup_field(
+                specification, specification.name(), specification.value
+            )
+        return None
+
+    def _lookup_and(self, specifications: List[Specification]) -> Optional[Rows]:
+        found = []
+        residual = []
+        for child in specifications:
+            if (rows := self._lookup(child)) is None:
+                residual.append(child)
+            else:
+                found.append(rows)
+        if not found:
+            return None
+        found.sort(key=len)
+        rows = set(found[0])
+        for other in found[1:]:
+            if not rows:
+                break
+            rows.intersection_update(other)
+        if residual:
+            predicate = AndSpecification(residual).compile(self.accessor)
+            objects = self._objects
+            rows = [row for row in rows if predicate(objects[row])]
+        return rows
+
+    def _lookup_field(
+        self, specification: Specification, op: str, value: Any
+    ) -> Optional[Rows]:
+        """
+        The rows with a value for the field of `specification` that satisfies `op`,
+        using its hash index for "eq" if there is one, otherwise its sorted index.
+        """
+        if specification.pre_processor is not operators._no_pre_processing:
+            return None
+        field = specification.field
+        index: Any = self.hash_indexes.get(field) if op == "eq" else None
+        if index is not None:
+            rows = index.equal(value)
+        elif index := self.sorted_indexes.get(field):
+            rows = index.range(op, value)
+        else:
+            return None
+        if rows is None or not index.unindexed:
+            return rows
+        if op == "eq":
+            specification = operators.EqualsSpecification(field, value)
+        predicate = specification.compile(self.accessor)
+        objects = self._objects
+        return set(rows).union(
+            row for row in index.unindexed if predicate(objects[row])
+        )
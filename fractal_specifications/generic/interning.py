@@ -0,0 +1,118 @@
+from operator import is_
+from typing import Any, Dict, Hashable, Optional
+
+from fractal_specifications.generic import operators
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.simplifier import _value_key
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+_LEAVES = (
+    EmptySpecification,
+    operators.EqualsSpecification,
+    operators.NotEqualsSpecification,
+    operators.LessThanSpecification,
+    operators.LessThanEqualSpecification,
+    operators.GreaterThanSpecification,
+    operators.GreaterThanEqualSpecification,
+    operators.InSpecification,
+    operators.ContainsSpecification,
+    operators.RegexStringMatchSpecification,
+    operators.IsNoneSpecification,
+)
+
+
+class _Key(tuple):
+    """Tuple that compares its items by identity, used for nodes of interned children."""
+
+    __slots__ = ()
+
+    def __hash__(self):
+        return hash(tuple(map(id, self)))
+
+    def __eq__(self, other):
+        return (
+            type(other) is _Key
+            and len(self) == len(other)
+            and all(map(is_, self, other))
+        )
+
+
+def _leaf_key(specification: Specification) -> Optional[Hashable]:
+    if type(specification) is EmptySpecification:
+        return (EmptySpecification,)
+    value: Any = specification.value
+    try:
+        key = (
+            type(specification),
+            specification.field,
+            type(value),
+            (
+                _value_key(value)
+                if isinstance(value, (list, tuple, set, frozenset))
+                else value
+            ),
+            specification.pre_processor,
+            getattr(specification, "flags", None),
+        )
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class SpecificationInterner:
+    """
+    Maps structurally identical specifications (and subtrees) to a single instance.
+
+    Interned trees share their nodes, which saves memory when many specifications
+    have parts in common, and makes comparing them cheap: identical subtrees are the
+    same object, so equality checks short-circuit on identity.
+
+    Two specifications are considered identical when they are of the same type and
+    have equal values of the same type (so `1`, `1.0` and `True` are kept apart) and
+    the same pre-processor. Specifications with unhashable values and custom
+    specification types are left as they are.
+
+    The interner keeps strong references to everything it has interned; use
+    `clear()` to release them. Interned nodes are shared, so they must not be mutated.
+    Assign an interner to `Specification.interner` to intern everything created by
+    `Specification.load_dsl`, `from_dict`, `loads` and `parse`.
+    """
+
+    def __init__(self):
+        self._table: Dict[Hashable, Specification] = {}
+
+    def intern(self, specification: Specification) -> Specification:
+        key: Optional[Hashable]
+        if type(specification) in (AndSpecification, OrSpecification):
+            key = _Key((type(specification), *specification.specifications))
+            if (interned := self._table.get(key)) is not None:
+                return interned  # the children are interned already
+            children = [self.intern(s) for s in specification.specifications]
+            if not all(map(is_, children, specification.specifications)):
+                specification = type(specification)(children)
+            key = _Key((type(specification), *children))
+        elif type(specification) is operators.NotSpecification:
+            key = _Key((operators.NotSpecification, specification.specification))
+            if (interned := self._table.get(key)) is not None:
+                return interned
+            child = self.intern(specification.specification)
+            if child is not specification.specification:
+                specification = operators.NotSpecification(child)
+            key = _Key((operators.NotSpecification, child))
+        elif type(specification) in _LEAVES:
+            key = _leaf_key(specification)
+            if key is None:
+                return specification
+        else:
+            return specification
+        return self._table.setdefault(key, specification)
+
+    def __len__(self):
+        return len(self._table)
+
+    def clear(self):
+        self._table.clear()
@@ -0,0 +1,417 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from itertools import product
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from fractal_specifications.generic import operators
+from fractal_specifications.generic.accessors import Accessor, AttributeAccessor
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.simplifier import _orderable
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+K = TypeVar("K", bound=Hashable)
+
+# Bounds are compared as (value, flag) keys, with a value `x` as (x, 0.5): a lower
+# bound is satisfied if it's <= that key, an upper bound if it's >= that key.
+Bound = Tuple[Any, int]
+# The getter of a field, the kind of its values and the bounds of a range on it
+_Bounds = Tuple[Callable[[Any], Any], Hashable, Optional[Bound], Optional[Bound]]
+
+_LOWER_BOUNDS = {
+    operators.GreaterThanSpecification: 1,
+    operators.GreaterThanEqualSpecification: 0,
+}
+_UPPER_BOUNDS = {
+    operators.LessThanSpecification: 0,
+    operators.LessThanEqualSpecification: 1,
+}
+_KINDS = (str, bytes, datetime, date, time, timedelta)
+# Missing fields and values that can't be compared (like None with `<`)
+_ERRORS = (AttributeError, KeyError, IndexError, TypeError)
+
+
+def _kind(value: Any) -> Optional[Hashable]:
+    """The values that `value` can be compared to, None if it isn't orderable."""
+    if not _orderable(value):
+        return None
+    for kind in _KINDS:
+        if isinstance(value, kind):
+            return kind
+    return "number"
+
+
+class _Node:
+    """Node of a centered interval tree, with the intervals containing `center`."""
+
+    __slots__ = ("center", "by_lower", "by_upper", "left", "right")
+
+    def __init__(self, intervals: List[Tuple[Bound, Bound, int]]):
+        lowers = sorted(lower for lower, _, _ in intervals)
+        self.center = center = lowers[len(lowers) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_lower = sorted(((lower, c) for lower, _, c in here), key=itemgetter(0))
+        self.by_upper = sorted(
+            ((upper, c) for _, upper, c in here), key=itemgetter(0), reverse=True
+        )
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+
+class _Ranges:
+    """
+    The ranges on a field for values of one kind, by conjunction: one-sided ranges
+    in sorted lists and intervals in an interval tree. These are (re)built on the
+    first lookup after a change.
+    """
+
+    __slots__ = ("ranges", "lowers", "uppers", "tree", "built")
+
+    def __init__(self):
+        self.ranges: Dict[int, Tuple[Optional[Bound], Optional[Bound], int]] = {}
+        self.built = False
+
+    def add(self, id: int, lower: Optional[Bound], upper: Optional[Bound], c: int):
+        self.ranges[id] = (lower, upper, c)
+        self.built = False
+
+    def remove(self, id: int):
+        del self.ranges[id]
+        self.built = False
+
+    def build(self):
+        lowers, uppers, intervals = [], [], []
+        for lower, upper, c in self.ranges.values():
+            if upper is None:
+                lowers.append((lower, c))
+            elif lower is None:
+                uppers.append((upper, c))
+            else:
+                intervals.append((lower, upper, c))
+        lowers.sort(key=itemgetter(0))
+        uppers.sort(key=itemgetter(0))
+        self.lowers = ([lower for lower, _ in lowers], [c for _, c in lowers])
+        self.uppers = ([upper for upper, _ in uppers], [c for _, c in uppers])
+        self.tree = _Node(intervals) if intervals else None
+        self.built = True
+
+    def lookup(self, value: Any) -> Iterator[int]:
+        """The conjunctions with a range on this field that contains `value`."""
+        if not self.built:
+            self.build()
+        key = (value, 0.5)
+        bounds, conjunctions = self.lowers
+        yield from conjunctions[: bisect_right(bounds, key)]
+        bounds, conjunctions = self.uppers
+        yield from conjunctions[bisect_left(bounds, key) :]
+        node = self.tree
+        while node is not None:
+            if key < node.center:
+                for lower, c in node.by_lower:
+                    if lower > key:
+                        break
+                    yield c
+                node = node.left
+            else:
+                for upper, c in node.by_upper:
+                    if upper < key:
+                        break
+                    yield c
+                node = node.right
+
+
+class _Conjunction:
+    __slots__ = (
+        "key",
+        "required",
+        "bounds",
+        "residual",
+        "predicate",
+        "values",
+        "ranges",
+    )
+
+    def __init__(self, key: Hashable):
+        self.key = key
+        # The number of indexed predicates, that all have to match
+        self.required = 0
+        # Ranges that aren't indexed: getter, kind and bounds
+        self.bounds: List[_Bounds] = []
+        # The leaves without an index, compiled on first use
+        self.residual: Optional[Specification] = None
+        self.predicate: Optional[Callable[[Any], bool]] = None
+        # The bucket values and range ids by field, to remove them again
+        self.values: List[Tuple[str, Any]] = []
+        self.ranges: List[Tuple[str, Hashable, int]] = []
+
+    def check(self, obj: Any, accessor: Accessor) -> bool:
+        """Whether `obj` satisfies the predicates that aren't indexed."""
+        for get, kind, lower, upper in self.bounds:
+            try:
+                value = get(obj)
+            except _ERRORS:
+                return False
+            if _kind(value) != kind:
+                return False
+            key = (value, 0.5)
+            if (lower is not None and lower > key) or (
+                upper is not None and upper < key
+            ):
+                return False
+        if self.residual is None:
+            return True
+        if self.predicate is None:
+            self.predicate = self.residual.compile(accessor)
+        try:
+            return self.predicate(obj)
+        except _ERRORS:
+            return False
+
+
+class SpecificationMatcher(Generic[K]):
+    """
+    Finds which of many specifications (by key, like subscriptions) an object
+    satisfies, without checking all of them.
+
+    Specifications are split into conjunctions (of leaves), whose `==`, `in` and
+    `is None` leaves are kept in hash buckets by field and value. The ranges (`<`,
+    `<=`, `>`, `>=`, merged by field) of conjunctions without those leaves are kept
+    in sorted lists and interval trees. To match an object, the value of every
+    indexed field is looked up once, and a conjunction is counted every time one of
+    its predicates matches. Only the conjunctions that reached their number of
+    predicates have their other leaves (like ranges next to `==`, `contains`, `!=`
+    and `Not`) checked. Conjunctions without indexed predicates are checked for
+    every object.
+
+    Specifications that would be split into more than `max_conjunctions`
+    conjunctions are checked for every object instead.
+
+    Unlike `is_satisfied_by`, predicates don't match (instead of raising) when the
+    field is missing or its value can't be compared, like None with `<`, so one
+    specification can't keep the others from matching.
+    """
+
+    max_conjunctions = 64
+
+    def __init__(
+        self,
+        specifications: Optional[Mapping[K, Specification]] = None,
+        accessor: Optional[Accessor] = None,
+    ):
+        self.accessor = accessor or AttributeAccessor()
+        self._conjunctions: Dict[int, _Conjunction] = {}
+        self._by_key: Dict[K, List[int]] = {}
+        self._buckets: Dict[str, Dict[Any, List[int]]] = {}
+        self._ranges: Dict[str, Dict[Hashable, _Ranges]] = {}
+        self._unindexed: Set[int] = set()
+        self._getters: Dict[str, Callable[[Any], Any]] = {}
+        self._next_id = 0
+        for key, specification in (specifications or {}).items():
+            self.add(key, specification)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._by_key
+
+    def add(self, key: K, specification: Specification):
+        if key in self._by_key:
+            raise ValueError(f"Specification with key {key!r} is already added")
+        conjunctions = self._conjunctions_of(specification)
+        if conjunctions is None:
+            conjunctions = [[specification]]
+        ids = self._by_key[key] = []
+        for leaves in conjunctions:
+            if (id := self._add_conjunction(key, leaves)) is not None:
+                ids.append(id)
+
+    def remove(self, key: K):
+        for id in self._by_key.pop(key):
+            conjunction = self._conjunctions.pop(id)
+            self._unindexed.discard(id)
+            for field, value in conjunction.values:
+                bucket = self._buckets[field]
+                bucket[value].remove(id)
+                if not bucket[value]:
+                    del bucket[value]
+            for field, kind, range_id in conjunction.ranges:
+                self._ranges[field][kind].remove(range_id)
+
+    def match(self, obj: Any) -> Set[K]:
+        """The keys of the specifications that `obj` satisfies."""
+        counts: Counter = Counter()
+        for field, get in self._getters.items():
+            try:
+                value = get(obj)
+            except _ERRORS:
+                continue
+            if (bucket := self._buckets.get(field)) is not None:
+                try:
+                    counts.update(bucket.get(value, ()))
+                except TypeError:
+                    pass
+            if (ranges := self._ranges.get(field)) is not None:
+                if (by_kind := ranges.get(_kind(value))) is not None:
+                    counts.update(by_kind.lookup(value))
+
+        matches: Set[K] = set()
+        conjunctions = self._conjunctions
+        accessor = self.accessor
+        for id, count in counts.items():
+            conjunction = conjunctions[id]
+            if count == conjunction.required and conjunction.key not in matches:
+                if conjunction.check(obj, accessor):
+                    matches.add(conjunction.key)
+        for id in self._unindexed:
+            conjunction = conjunctions[id]
+            if conjunction.key not in matches and conjunction.check(obj, accessor):
+                matches.add(conjunction.key)
+        return matches
+
+    def _conjunctions_of(
+        self, specification: Specification
+    ) -> Optional[List[List[Specification]]]:
+        """
+        The leaves of the conjunctions that `specification` is a disjunction of,
+        None if there would be more than `max_conjunctions`.
+        """
+        cls = type(specification)
+        if cls is AndSpecification:
+            conjunctions: List[List[Specification]] = [[]]
+            for child in specification.specifications:
+                if (children := self._conjunctions_of(child)) is None:
+                    return None
+                if len(conjunctions) * len(children) > self.max_conjunctions:
+                    return None
+                conjunctions = [a + b for a, b in product(conjunctions, children)]
+            return conjunctions
+        elif cls is OrSpecification:
+            conjunctions = []
+            for child in specification.specifications:
+                if (children := self._conjunctions_of(child)) is None:
+                    return None
+                conjunctions.extend(children)
+                if len(conjunctions) > self.max_conjunctions:
+                    return None
+            return conjunctions
+        elif cls is EmptySpecification:
+            return [[]]
+        return [[specification]]
+
+    def _add_conjunction(self, key: K, leaves: List[Specification]) -> Optional[int]:
+        """Add a conjunction of `leaves`, None if it can't be satisfied."""
+        equal: List[Tuple[str, List[Any]]] = []
+        bounds: Dict[Tuple[str, Hashable], List[List[Bound]]] = {}
+        residual: List[Specification] = []
+        for leaf in leaves:
+            if (values := _equal_values(leaf)) is not None:
+                equal.append((leaf.field, values))
+            elif (bound := _bound(leaf)) is not None:
+                lowers_uppers = bounds.setdefault((leaf.field, bound[0]), [[], []])
+                lowers_uppers[bound[1]].append(bound[2])
+            else:
+                residual.append(leaf)
+
+        ranges = []
+        for (field, kind), (lowers, uppers) in bounds.items():
+            lower = max(lowers) if lowers else None
+            upper = min(uppers) if uppers else None
+            if lower is not None and upper is not None and lower > upper:
+                return None
+            ranges.append((field, kind, lower, upper))
+
+        id = self._next_id
+        self._next_id += 1
+        conjunction = self._conjunctions[id] = _Conjunction(key)
+        if residual:
+            conjunction.residual = AndSpecification(residual)
+        if equal:
+            # Equality is usually more selective, so ranges are only checked after
+            conjunction.bounds = [
+                (self.accessor.getter(field), kind, lower, upper)
+                for field, kind, lower, upper in ranges
+            ]
+            ranges = []
+        conjunction.required = required = len(equal) + len(ranges)
+        for field, values in equal:
+            bucket = self._buckets.setdefault(field, {})
+            for value in values:
+                bucket.setdefault(value, []).append(id)
+                conjunction.values.append((field, value))
+            self._getter(field)
+        for field, kind, lower, upper in ranges:
+            range_id = self._next_id
+            self._next_id += 1
+            self._ranges.setdefault(field, {}).setdefault(kind, _Ranges()).add(
+                range_id, lower, upper, id
+            )
+            conjunction.ranges.append((field, kind, range_id))
+            self._getter(field)
+        if not required:
+            self._unindexed.add(id)
+        return id
+
+    def _getter(self, field: str):
+        if field not in self._getters:
+            self._getters[field] = self.accessor.getter(field)
+
+
+def _equal_values(specification: Specification) -> Optional[List[Any]]:
+    """The values of an `==`, `in` or `is None` leaf, None if it's not hashed."""
+    cls = type(specification)
+    if cls is operators.EqualsSpecification:
+        values = [specification.value]
+    elif cls is operators.InSpecification:
+        values = specification.value
+    elif cls is operators.IsNoneSpecification:
+        values = [None]
+    else:
+        return None
+    if specification.pre_processor is not operators._no_pre_processing:
+        return None
+    try:
+        # Without duplicates (like 1 and 1.0), that would be counted twice
+        return list(dict.fromkeys(values))
+    except TypeError:
+        return None
+
+
+def _bound(specification: Specification) -> Optional[Tuple[Hashable, int, Bound]]:
+    """The kind, side (0 for lower, 1 for upper) and bound of a range leaf."""
+    cls = type(specification)
+    if cls in _LOWER_BOUNDS:
+        side, flag = 0, _LOWER_BOUNDS[cls]
+    elif cls in _UPPER_BOUNDS:
+        side, flag = 1, _UPPER_BOUNDS[cls]
+    else:
+        return None
+    if specification.pre_processor is not operators._no_pre_processing:
+        return None
+    if (kind := _kind(specification.value)) is None:
+        return None
+    return kind, side, (specification.value, flag)
@@ -1,11 +1,27 @@
-from typing import Any, Callable, Collection, List
+import re
+from functools import lru_cache
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Collection,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+from fractal_specifications.generic.cache import BoundedCache
+from fractal_specifications.generic.context import _active, _state
+from fractal_specifications.generic.specification import Specification, _Immutable
+
+
+class NotSpecification(_Immutable, Specification, shorthand="!"):
+    __slots__ = ("specification",)
 
-from fractal_specifications.generic.specification import Specification
-
-
-class NotSpecification(Specification):
     def __init__(self, specification: Specification):
-        self.specification = specification
+        object.__setattr__(self, "specification", specification)
 
     def is_satisfied_by(self, obj: Any) -> bool:
         return not self.specification.is_satisfied_by(obj)
@@ -17,13 +33,17 @@ class NotSpecification(Specification):
         return f"{self.__class__.__name__}({self.specification})"
 
     def __eq__(self, other):
-        return (
+        return self is other or (
             isinstance(other, NotSpecification)
+            and not self._hash_differs(other)
             and self.specification == other.specification
         )
 
     def __hash__(self):
-        return hash(self.specification)
+        return self._cached_hash()
+
+    def _structural_hash(self) -> int:
+        return hash((NotSpecification, self.specification))
 
     def to_dict(self):
         return {
@@ -36,23 +56,35 @@ class NotSpecification(Specification):
         return cls(specification=Specification.from_dict(d["spec"]))
 
 
-class FieldValueSpecification(Specification):
-    def __init__(self, field: str, value: Any, pre_processor: Callable = lambda i: i):
-        self.field = field
-        self.value = value
-        self.pre_processor = pre_processor
+def _no_pre_processing(value: Any) -> Any:
+    return value
+
+
+class FieldValueSpecification(_Immutable, Specification):
+    __slots__ = ("field", "value", "pre_processor")
+
+    def __init__(
+        self, field: str, value: Any, pre_processor: Callable = _no_pre_processing
+    ):
+        object.__setattr__(self, "field", field)
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "pre_processor", pre_processor)
 
     def __str__(self):
         return f"{self.__class__.__name__}({self.field}={self.value})"
 
     def __eq__(self, other):
-        return (
+        return self is other or (
             type(self) is type(other)
+            and not self._hash_differs(other)
             and self.field == other.field
             and self.value == other.value
         )
 
     def __hash__(self):
+        return self._cached_hash()
+
+    def _structural_hash(self) -> int:
         return hash((self.field, self.value))
 
     def is_satisfied_by(self, obj: Any) -> bool:
@@ -62,29 +94,119 @@ class FieldValueSpecification(Specification):
         return {self.field, self.value}
 
 
-def _get_value(obj: Any, field: str) -> Any:
+@lru_cache(maxsize=1024)
+def _field_path(field: str) -> Tuple[str, ...]:
     lookup_separator = "__" if "__" in field else "."
-    for f in field.split(lookup_separator):
+    return tuple(field.split(lookup_separator))
+
+
+def _resolve(obj: Any, field: str) -> Any:
+    for f in _field_path(field):
         obj = getattr(obj, f)
     return obj
 
 
+def _get_value(obj: Any, field: str) -> Any:
+    if not _active:
+        # No context to memoize in, resolve directly (like `_resolve`)
+        for f in _field_path(field):
+            obj = getattr(obj, f)
+        return obj
+    context = _state.context
+    if context[0] is not obj:
+        return _resolve(obj, field)
+    values = context[1]
+    if field in values:
+        return values[field]
+    value = values[field] = _resolve(obj, field)
+    return value
+
+
+_SCAN_THRESHOLD = 8
+
+
+class _Values:
+    """
+    Membership test for a collection of values, backed by a set.
+
+    Unhashable values (both in the collection and looked up) fall back to
+    comparing against the collection itself, so the result is the same as
+    `value in values`. The set (and the unhashable values) can be passed when they
+    are built already, like by `streaming`.
+    """
+
+    __slots__ = ("values", "hashed", "unhashed")
+
+    def __init__(
+        self,
+        values: Collection,
+        hashed: Optional[AbstractSet] = None,
+        unhashed: Optional[List[Any]] = None,
+    ):
+        self.values = values
+        self.unhashed: List[Any] = [] if unhashed is None else unhashed
+        if hashed is not None:
+            self.hashed = hashed
+            return
+        try:
+            self.hashed = frozenset(values)
+        except TypeError:
+            hashed = set()
+            for value in values:
+                try:
+                    hashed.add(value)
+                except TypeError:
+                    self.unhashed.append(value)
+            self.hashed = frozenset(hashed)
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            if value in self.hashed:
+                return True
+        except TypeError:
+            return value in self.values
+        return bool(self.unhashed) and value in self.unhashed
+
+
 class InSpecification(FieldValueSpecification):
+    __slots__ = ("_values",)
+
     def __init__(self, field: str, values: List[Any]):
+        if type(values) is _Values:
+            # Hashed already, the values themselves are the value
+            hashed, values = values, values.values
+        else:
+            # A copy, so changing the given values later can't change the lookup
+            if isinstance(values, list):
+                values = list(values)
+            elif isinstance(values, set):
+                values = frozenset(values)
+            if isinstance(values, (list, tuple, frozenset)) and (
+                len(values) > _SCAN_THRESHOLD
+            ):
+                hashed = _Values(values)
+            else:
+                # Scanning a handful of values is as fast as a hashed lookup
+                hashed = values
         super(InSpecification, self).__init__(field, values)
+        object.__setattr__(self, "_values", hashed)
 
-    def __hash__(self):
+    def _structural_hash(self) -> int:
+        if isinstance(self.value, (set, frozenset)):
+            return hash((self.field, frozenset(self.value)))
         return hash((self.field, tuple(self.value)))
 
     def is_satisfied_by(self, obj: Any) -> bool:
-        return self.pre_processor(_get_value(obj, self.field)) in self.value
+        return self.pre_processor(_get_value(obj, self.field)) in self._values
 
     @classmethod
     def _from_dict(cls, d: dict):
         return cls(field=d["field"], values=d["value"])
 
 
-class EqualsSpecification(FieldValueSpecification):
+class EqualsSpecification(FieldValueSpecification, shorthand="=="):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
         return self.pre_processor(_get_value(obj, self.field)) == self.value
 
@@ -93,7 +215,9 @@ class EqualsSpecification(FieldValueSpecification):
         return "eq"
 
 
-class NotEqualsSpecification(FieldValueSpecification):
+class NotEqualsSpecification(FieldValueSpecification, shorthand="!="):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
         return self.pre_processor(_get_value(obj, self.field)) != self.value
 
@@ -102,7 +226,9 @@ class NotEqualsSpecification(FieldValueSpecification):
         return "neq"
 
 
-class LessThanSpecification(FieldValueSpecification):
+class LessThanSpecification(FieldValueSpecification, shorthand="<"):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
         return self.pre_processor(_get_value(obj, self.field)) < self.value
 
@@ -111,7 +237,9 @@ class LessThanSpecification(FieldValueSpecification):
         return "lt"
 
 
-class LessThanEqualSpecification(FieldValueSpecification):
+class LessThanEqualSpecification(FieldValueSpecification, shorthand="<="):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
         return self.pre_processor(_get_value(obj, self.field)) <= self.value
 
@@ -120,7 +248,9 @@ class LessThanEqualSpecification(FieldValueSpecification):
         return "lte"
 
 
-class GreaterThanSpecification(FieldValueSpecification):
+class GreaterThanSpecification(FieldValueSpecification, shorthand=">"):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
         return self.pre_processor(_get_value(obj, self.field)) > self.value
 
@@ -129,7 +259,9 @@ class GreaterThanSpecification(FieldValueSpecification):
         return "gt"
 
 
-class GreaterThanEqualSpecification(FieldValueSpecification):
+class GreaterThanEqualSpecification(FieldValueSpecification, shorthand=">="):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
         return self.pre_processor(_get_value(obj, self.field)) >= self.value
 
@@ -139,6 +271,8 @@ class GreaterThanEqualSpecification(FieldValueSpecification):
 
 
 class ContainsSpecification(FieldValueSpecification):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
         value = self.pre_processor(_get_value(obj, self.field))
         if not value:
@@ -146,13 +280,79 @@ class ContainsSpecification(FieldValueSpecification):
         return self.value in value
 
 
+_REGEX_FLAGS = {
+    "a": re.ASCII,
+    "i": re.IGNORECASE,
+    "m": re.MULTILINE,
+    "s": re.DOTALL,
+    "x": re.VERBOSE,
+}
+
+
+def _regex_flags(flags: Union[int, str]) -> str:
+    if isinstance(flags, int):
+        # re.UNICODE is the default for str patterns
+        if unknown := int(flags) & ~int(sum(_REGEX_FLAGS.values()) | re.UNICODE):
+            raise ValueError(f"Unsupported regex flags: {re.RegexFlag(unknown)!r}")
+        return "".join(c for c, flag in _REGEX_FLAGS.items() if flags & flag)
+    if unknown := set(flags) - set(_REGEX_FLAGS):
+        raise ValueError(f"Unsupported regex flags: {''.join(sorted(unknown))}")
+    return "".join(sorted(set(flags)))
+
+
+def _compile_pattern(pattern: str, flags: str) -> Pattern:
+    return re.compile(pattern, sum(_REGEX_FLAGS[c] for c in flags))
+
+
 class RegexStringMatchSpecification(ContainsSpecification):
+    __slots__ = ("flags", "_pattern")
+
+    pattern_cache: Optional[BoundedCache[Pattern]] = None
+
+    def __init__(
+        self,
+        field: str,
+        value: str,
+        pre_processor: Callable = _no_pre_processing,
+        flags: Union[int, str] = "",
+    ):
+        super(RegexStringMatchSpecification, self).__init__(field, value, pre_processor)
+        object.__setattr__(self, "flags", _regex_flags(flags))
+
+    @property
+    def pattern(self) -> Pattern:
+        # Compiled on first use, the pattern may be meant for another regex dialect
+        try:
+            return self._pattern
+        except AttributeError:
+            pass
+        if (cache := self.pattern_cache) is not None:
+            pattern = cache.get_or_create(
+                (self.value, self.flags),
+                lambda: _compile_pattern(self.value, self.flags),
+            )
+        else:
+            pattern = _compile_pattern(self.value, self.flags)
+        object.__setattr__(self, "_pattern", pattern)
+        return pattern
+
+    def __eq__(self, other):
+        return super().__eq__(other) and self.flags == other.flags
+
+    def __hash__(self):
+        return self._cached_hash()
+
+    def _structural_hash(self) -> int:
+        return hash((self.field, self.value, self.flags))
+
     def is_satisfied_by(self, obj: Any) -> bool:
-        import re
+        return bool(self.pattern.match(self.pre_processor(_get_value(obj, self.field))))
 
-        return bool(
-            re.match(self.value, self.pre_processor(_get_value(obj, self.field)))
-        )
+    def to_dict(self):
+        d = super().to_dict()
+        if not self.flags:
+            del d["flags"]
+        return d
 
     @classmethod
     def name(cls):
@@ -160,6 +360,8 @@ class RegexStringMatchSpecification(ContainsSpecification):
 
 
 class IsNoneSpecification(FieldValueSpecification):
+    __slots__ = ()
+
     def __init__(self, field: str):
         super(IsNoneSpecification, self).__init__(field, None)
 
@@ -0,0 +1,303 @@
+import math
+import operator
+from datetime import date, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Hashable, List, Optional, Set
+
+from fractal_specifications.generic.collections import (
+    AndSpecification,
+    CollectionSpecification,
+    OrSpecification,
+)
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    FieldValueSpecification,
+    GreaterThanEqualSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    LessThanEqualSpecification,
+    LessThanSpecification,
+    NotEqualsSpecification,
+    NotSpecification,
+    _no_pre_processing,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+_LOWER_BOUNDS = (GreaterThanSpecification, GreaterThanEqualSpecification)
+_UPPER_BOUNDS = (LessThanSpecification, LessThanEqualSpecification)
+_MERGEABLE = (EqualsSpecification, InSpecification, *_LOWER_BOUNDS, *_UPPER_BOUNDS)
+_ORDERABLE = (int, float, Decimal, str, bytes, date, time, timedelta)
+_OPERATORS = {
+    EqualsSpecification: operator.eq,
+    GreaterThanSpecification: operator.gt,
+    GreaterThanEqualSpecification: operator.ge,
+    LessThanSpecification: operator.lt,
+    LessThanEqualSpecification: operator.le,
+}
+
+
+def _orderable(value: Any) -> bool:
+    return isinstance(value, _ORDERABLE) and not (
+        isinstance(value, float) and math.isnan(value)
+    )
+
+
+def _value_key(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return type(value), tuple(_value_key(v) for v in value)
+    hash(value)
+    return type(value), value
+
+
+def _key(specification: Specification) -> Optional[Hashable]:
+    """Structural key that, unlike `==`, also tells pre-processors apart."""
+    try:
+        if isinstance(specification, FieldValueSpecification):
+            return (
+                type(specification),
+                specification.field,
+                _value_key(specification.value),
+                specification.pre_processor,
+                getattr(specification, "flags", None),
+            )
+        elif isinstance(specification, CollectionSpecification):
+            keys = tuple(_key(s) for s in specification.specifications)
+            return None if None in keys else (type(specification), keys)
+        elif isinstance(specification, NotSpecification):
+            key = _key(specification.specification)
+            return None if key is None else (NotSpecification, key)
+        hash(specification)
+        return specification
+    except TypeError:
+        return None
+
+
+def _dedupe(specifications: List[Specification]) -> List[Specification]:
+    seen: Set[Hashable] = set()
+    result = []
+    for spec in specifications:
+        key = _key(spec)
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        result.append(spec)
+    return result
+
+
+def _is_mergeable(specification: Specification, types=_MERGEABLE) -> bool:
+    return (
+        type(specification) in types
+        and specification.pre_processor is _no_pre_processing
+    )
+
+
+def _satisfies(specification: FieldValueSpecification, value: Any) -> bool:
+    if isinstance(specification, InSpecification):
+        return value in specification._values
+    return _OPERATORS[type(specification)](value, specification.value)
+
+
+class SpecificationSimplifier:
+    """
+    Rewrites a specification into an equivalent, simpler one.
+
+    - nested And/Or collections are flattened
+    - duplicates are removed and EmptySpecification is absorbed
+    - ranges (and equality/in) on the same field are merged within an And
+    - Equals/In on the same field are folded into a single In within an Or
+    - NotSpecification is pushed down using De Morgan's laws
+
+    Conjunctions that can never be satisfied (like `x > 5 && x < 3`) are reduced
+    to the smallest conflicting And and are dropped from enclosing Or collections.
+    Only built-in specification types are rewritten, so the result can be handled
+    by every contrib builder that handles the original.
+    """
+
+    def __init__(self):
+        # Keyed by id, the values keep the specifications (and so their ids) alive
+        self.contradictions: Dict[int, Specification] = {}
+
+    def simplify(self, specification: Specification) -> Specification:
+        if type(specification) is NotSpecification:
+            return self._simplify_not(specification.specification)
+        elif type(specification) is AndSpecification:
+            return self._simplify_and(specification.specifications)
+        elif type(specification) is OrSpecification:
+            return self._simplify_or(specification.specifications)
+        return specification
+
+    def _contradiction(self, specifications: List[Specification]) -> Specification:
+        specification = AndSpecification(specifications)
+        self.contradictions[id(specification)] = specification
+        return specification
+
+    def _simplify_not(self, specification: Specification) -> Specification:
+        if type(specification) is NotSpecification:
+            return self.simplify(specification.specification)
+        elif type(specification) is AndSpecification:
+            return self._simplify_or(
+                [NotSpecification(s) for s in specification.specifications]
+            )
+        elif type(specification) is OrSpecification:
+            return self._simplify_and(
+                [NotSpecification(s) for s in specification.specifications]
+            )
+        elif type(specification) is EqualsSpecification:
+            return NotEqualsSpecification(
+                specification.field, specification.value, specification.pre_processor
+            )
+        elif type(specification) is NotEqualsSpecification:
+            return EqualsSpecification(
+                specification.field, specification.value, specification.pre_processor
+            )
+        return NotSpecification(self.simplify(specification))
+
+    def _flatten(self, specifications: List[Specification], collection: type):
+        for spec in specifications:
+            spec = self.simplify(spec)
+            if type(spec) is collection and id(spec) not in self.contradictions:
+                yield from spec.specifications
+            else:
+                yield spec
+
+    def _simplify_and(self, specifications: List[Specification]) -> Specification:
+        children = []
+        for spec in self._flatten(specifications, AndSpecification):
+            if id(spec) in self.contradictions:
+                return spec
+            if not isinstance(spec, EmptySpecification):
+                children.append(spec)
+        children = _dedupe(children)
+
+        fields: Dict[str, List[Specification]] = {}
+        for spec in children:
+            if _is_mergeable(spec):
+                fields.setdefault(spec.field, []).append(spec)
+        result = []
+        for spec in children:
+            group = fields.get(spec.field) if _is_mergeable(spec) else None
+            if group is None or len(group) == 1:
+                result.append(spec)
+            elif spec is group[0]:
+                try:
+                    merged = self._merge_ranges(group)
+                except TypeError:  # values that can't be compared
+                    merged = group
+                if id(merged) in self.contradictions:
+                    return merged
+                result.extend(merged)
+        return self._collection(AndSpecification, result)
+
+    def _merge_ranges(self, specifications: List[Specification]):
+        if not all(
+            _orderable(s.value)
+            for s in specifications
+            if not isinstance(s, InSpecification)
+        ):
+            return specifications
+        equals = [s for s in specifications if isinstance(s, EqualsSpecification)]
+        ins = [s for s in specifications if isinstance(s, InSpecification)]
+        lower = upper = None
+        for spec in specifications:
+            if isinstance(spec, _LOWER_BOUNDS) and (
+                lower is None
+                or spec.value > lower.value
+                or (spec.value == lower.value and type(spec) is _LOWER_BOUNDS[0])
+            ):
+                lower = spec
+            elif isinstance(spec, _UPPER_BOUNDS) and (
+                upper is None
+                or spec.value < upper.value
+                or (spec.value == upper.value and type(spec) is _UPPER_BOUNDS[0])
+            ):
+                upper = spec
+        bounds = [b for b in (lower, upper) if b is not None]
+        if lower is not None and upper is not None:
+            if lower.value > upper.value or (
+                lower.value == upper.value
+                and (type(lower) is _LOWER_BOUNDS[0] or type(upper) is _UPPER_BOUNDS[0])
+            ):
+                return self._contradiction([lower, upper])
+            if (
+                lower.value == upper.value
+                and not equals
+                and not ins
+                and isinstance(lower.value, (int, float, Decimal))
+            ):
+                equals = [EqualsSpecification(lower.field, lower.value)]
+        if equals:
+            equal = equals[0]
+            for spec in [*equals[1:], *ins, *bounds]:
+                if not _satisfies(spec, equal.value):
+                    return self._contradiction([equal, spec])
+            return [equal]
+        if ins:
+            values = [
+                v
+                for v in ins[0].value
+                if all(_satisfies(s, v) for s in ins[1:] + bounds)
+            ]
+            if not values:
+                return self._contradiction([*ins, *bounds])
+            return [InSpecification(ins[0].field, values)]
+        return bounds
+
+    def _simplify_or(self, specifications: List[Specification]) -> Specification:
+        children = []
+        for spec in self._flatten(specifications, OrSpecification):
+            if isinstance(spec, EmptySpecification):
+                return spec
+            children.append(spec)
+        children = _dedupe(children)
+        if possible := [s for s in children if id(s) not in self.contradictions]:
+            children = possible
+        elif children:
+            return children[0]
+
+        foldable = (EqualsSpecification, InSpecification)
+        fields: Dict[str, List[Specification]] = {}
+        for spec in children:
+            if _is_mergeable(spec, foldable):
+                fields.setdefault(spec.field, []).append(spec)
+        result = []
+        for spec in children:
+            group = fields.get(spec.field) if _is_mergeable(spec, foldable) else None
+            if group is None or len(group) == 1:
+                result.append(spec)
+            elif spec is group[0]:
+                result.append(InSpecification(spec.field, self._fold_values(group)))
+        return self._collection(OrSpecification, result)
+
+    @staticmethod
+    def _fold_values(specifications: List[Specification]) -> List[Any]:
+        values: List[Any] = []
+        seen: Set[Hashable] = set()
+        for spec in specifications:
+            for value in (
+                spec.value if isinstance(spec, InSpecification) else [spec.value]
+            ):
+                try:
+                    key = _value_key(value)
+                except TypeError:
+                    values.append(value)
+                    continue
+                if key not in seen:
+                    seen.add(key)
+                    values.append(value)
+        return values
+
+    @staticmethod
+    def _collection(collection: type, specifications: List[Specification]):
+        if len(specifications) == 1:
+            return specifications[0]
+        elif not specifications and collection is AndSpecification:
+            return EmptySpecification()
+        return collection(specifications)
+
+
+def simplify_specification(specification: Specification) -> Specification:
+    return SpecificationSimplifier().simplify(specification)
@@ -1,35 +1,57 @@
 from __future__ import annotations
 
-import json
 from abc import ABC, abstractmethod
-from functools import lru_cache
-from typing import Any, Collection, Iterator, Optional, Type, TypeVar
-
-
-@lru_cache
-def all_specifications():
-    def get_subclasses(spec):
-        for sub in spec.__subclasses__():
-            yield sub
-            for subsub in get_subclasses(sub):
-                yield subsub
-
-    from fractal_specifications.generic import collections, operators
-
-    return {
-        **{spec.name(): spec for spec in get_subclasses(Specification)},
-        **{
-            "==": operators.EqualsSpecification,
-            "!=": operators.NotEqualsSpecification,
-            "<": operators.LessThanSpecification,
-            "<=": operators.LessThanEqualSpecification,
-            ">": operators.GreaterThanSpecification,
-            ">=": operators.GreaterThanEqualSpecification,
-            "!": operators.NotSpecification,
-            "&": collections.AndSpecification,
-            "|": collections.OrSpecification,
-        },
-    }
+from functools import lru_cache, wraps
+from itertools import islice
+from operator import truth
+from types import MappingProxyType
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from fractal_specifications.generic.cache import BoundedCache
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fractal_specifications.generic.accessors import Accessor
+    from fractal_specifications.generic.interning import SpecificationInterner
+    from fractal_specifications.generic.templates import SpecificationTemplate
+
+
+# Specification classes by name and shorthand (like `==`), added as they're defined;
+# a class replaces the one that was defined before it with the same name
+_registry: Dict[str, Type[Specification]] = {}
+
+
+def _specification(name: str) -> Optional[Type[Specification]]:
+    if (cls := _registry.get(name)) is None:
+        # The built-in specifications are registered when they're imported
+        from fractal_specifications.generic import collections, operators  # noqa: F401
+
+        cls = _registry.get(name)
+    return cls
+
+
+def all_specifications() -> Mapping[str, Type[Specification]]:
+    """All specification classes by name and shorthand."""
+    from fractal_specifications.generic import collections, operators  # noqa: F401
+
+    return MappingProxyType(_registry)
 
 
 def _parse_specification_item(
@@ -38,9 +60,9 @@ def _parse_specification_item(
     parts = field_op.split("__")
     field = lookup_separator.join(parts[:-1])
     op = parts[-1]
-    if spec := all_specifications().get(op, None):
+    if spec := _specification(op):
         return spec(field, value)
-    return all_specifications()["=="](lookup_separator.join(parts), value)
+    return _specification("==")(lookup_separator.join(parts), value)
 
 
 def parse_specification(lookup_separator: str, **kwargs) -> Iterator[Specification]:
@@ -49,10 +71,200 @@ def parse_specification(lookup_separator: str, **kwargs) -> Iterator[Specificati
             yield spec
 
 
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    names: List[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__") and name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+def _attributes(obj: Any) -> Iterator[Tuple[str, Any]]:
+    """Instance attributes of `obj`, both from `__slots__` and `__dict__`."""
+    for name in _slot_names(type(obj)):
+        value = getattr(obj, name, _MISSING)
+        if value is not _MISSING:
+            yield name, value
+    yield from getattr(obj, "__dict__", {}).items()
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-compatible encoding of `value` that keeps types apart and is ordered."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, list):
+        return [_canonical(v) for v in value]
+    elif isinstance(value, tuple):
+        return {"tuple": [_canonical(v) for v in value]}
+    elif isinstance(value, (set, frozenset)):
+        return {"set": sorted(_dumps_canonical(v) for v in value)}
+    elif isinstance(value, dict):
+        return {
+            "dict": sorted(
+                [_dumps_canonical(k), _canonical(v)] for k, v in value.items()
+            )
+        }
+    cls = type(value)
+    return {"type": f"{cls.__module__}.{cls.__qualname__}", "repr": repr(value)}
+
+
+def _dumps_canonical(value: Any) -> str:
+    import json
+
+    return json.dumps(_canonical(value), separators=(",", ":"), sort_keys=True)
+
+
+# Instances (by id) of which a custom `__init__` is running, see `_Immutable`
+_constructing: Set[int] = set()
+
+
+def _constructor(init: Callable) -> Callable:
+    @wraps(init)
+    def __init__(self, *args, **kwargs):
+        key = id(self)
+        if key in _constructing:  # e.g., super().__init__()
+            return init(self, *args, **kwargs)
+        _constructing.add(key)
+        try:
+            init(self, *args, **kwargs)
+        finally:
+            _constructing.discard(key)
+
+    __init__._constructor = True  # type: ignore[attr-defined]
+    return __init__
+
+
+def _custom(cls: type) -> bool:
+    return not cls.__module__.startswith(__package__)
+
+
+def _new(cls, *args, **kwargs):
+    # The `__init__` of a class is final by now, also if a decorator like
+    # `@dataclass` added it after the class was created, so wrap it (and those of
+    # its custom bases) to freeze instances once it has returned
+    if "_sealed" not in cls.__dict__:
+        for base in cls.__mro__:
+            init = base.__dict__.get("__init__")
+            if (
+                init is not None
+                and issubclass(base, _Immutable)
+                and _custom(base)
+                and not hasattr(init, "_constructor")
+            ):
+                base.__init__ = _constructor(init)
+        cls._sealed = True
+    return object.__new__(cls)
+
+
+class _Immutable:
+    """
+    Mixin for specification nodes that are immutable after construction.
+
+    The attributes that define the structure of a node can't be changed, which makes
+    it safe to share nodes (e.g., from the DSL cache or an interner) and to cache
+    their hash, DSL rendering and predicate. The built-in nodes assign them in
+    `__init__` through `object.__setattr__`, the `__init__` of custom subclasses
+    (also one generated by `@dataclass`) can simply assign them. Subclasses
+    implement `_structural_hash`.
+    """
+
+    __slots__ = ("_hash", "_dsl", "_predicate")
+
+    # The attributes that can't be changed, the slots of the classes in this package
+    _frozen: FrozenSet[str] = frozenset(__slots__)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._frozen = frozenset().union(
+            *(vars(c).get("__slots__", ()) for c in cls.__mro__ if not _custom(c))
+        )
+        # Only custom subclasses are frozen once their `__init__` has returned (the
+        # nodes in this package don't need it)
+        if _custom(cls) and "__new__" not in cls.__dict__:
+            cls.__new__ = staticmethod(_new)  # type: ignore[assignment]
+
+    def __setattr__(self, name: str, value: Any):
+        if name in self._frozen and id(self) not in _constructing:
+            raise AttributeError(
+                f"{type(self).__name__} is immutable, cannot set '{name}'"
+            )
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str):
+        if name in self._frozen and id(self) not in _constructing:
+            raise AttributeError(
+                f"{type(self).__name__} is immutable, cannot delete '{name}'"
+            )
+        object.__delattr__(self, name)
+
+    def _structural_hash(self) -> int:
+        raise NotImplementedError
+
+    def _cached_hash(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            value = self._structural_hash()
+            object.__setattr__(self, "_hash", value)
+            return value
+
+    def _hash_differs(self, other: Any) -> bool:
+        # Only compares hashes that have been computed already
+        ours = getattr(self, "_hash", None)
+        return ours is not None and ours != getattr(other, "_hash", ours)
+
+    def __getstate__(self):
+        # The hash of str values differs per process, so don't pickle it (nor the DSL
+        # and the compiled predicate, which can't be pickled)
+        slots = {}
+        for name in _slot_names(type(self)):
+            value = getattr(self, name, _MISSING)
+            if name not in ("_hash", "_dsl", "_predicate") and value is not _MISSING:
+                slots[name] = value
+        return getattr(self, "__dict__", None), slots
+
+    def __setstate__(self, state):
+        dict_, slots = state
+        if dict_:
+            self.__dict__.update(dict_)
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
+
+
 SpecificationSubType = TypeVar("SpecificationSubType", bound="Specification")
+T = TypeVar("T")
 
 
 class Specification(ABC):
+    __slots__ = ()
+
+    # When set, specifications created by load_dsl, from_dict and parse are interned
+    interner: Optional[SpecificationInterner] = None
+    # Specifications parsed by load_dsl, by DSL string; set to None to disable caching
+    dsl_cache: Optional[BoundedCache[Union[Specification, SpecificationTemplate]]] = (
+        BoundedCache(maxsize=128)
+    )
+    # Parses DSL strings for load_dsl; None uses the built-in parser (see `dsl`)
+    dsl_parser: Optional[
+        Callable[[str], Union[Specification, SpecificationTemplate]]
+    ] = None
+
+    def __init_subclass__(cls, shorthand: Optional[str] = None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        name = cls.name()
+        # Subclasses that inherit the name of a registered class don't replace it
+        registered = _registry.get(name)
+        if registered is None or "name" in vars(cls) or not issubclass(cls, registered):
+            _registry[name] = cls
+        if shorthand is not None:
+            _registry[shorthand] = cls
+
     @abstractmethod
     def is_satisfied_by(self, obj: Any) -> bool:
         raise NotImplementedError
@@ -75,6 +287,73 @@ class Specification(ABC):
             return specification.Or(self)
         return OrSpecification([self, specification])
 
+    def compile(
+        self, accessor: Optional[Accessor] = None, ordering: Optional[str] = None
+    ) -> Callable[[Any], bool]:
+        """
+        Return a single predicate function equivalent to `is_satisfied_by`.
+
+        `ordering` can be "cost" or "adaptive" to reorder the children of And/Or,
+        see `SpecificationCompiler`.
+        """
+        from fractal_specifications.generic.compiler import compile_specification
+
+        return compile_specification(self, accessor, ordering)
+
+    def simplify(self) -> Specification:
+        from fractal_specifications.generic.simplifier import simplify_specification
+
+        return simplify_specification(self)
+
+    def _compiled(
+        self, accessor: Optional[Accessor], ordering: Optional[str]
+    ) -> Callable[[Any], bool]:
+        # Compiling takes tens of microseconds, so the predicate for the defaults is
+        # cached on immutable nodes (repeated queries on small collections)
+        if accessor is not None or ordering is not None:
+            return self.compile(accessor, ordering)
+        try:
+            return self._predicate  # type: ignore[attr-defined]
+        except AttributeError:
+            predicate = self.compile()
+            if isinstance(self, _Immutable):
+                object.__setattr__(self, "_predicate", predicate)
+            return predicate
+
+    def filter(
+        self,
+        iterable: Iterable[T],
+        accessor: Optional[Accessor] = None,
+        ordering: Optional[str] = None,
+    ) -> Iterator[T]:
+        return filter(self._compiled(accessor, ordering), iterable)
+
+    def count(
+        self,
+        iterable: Iterable[Any],
+        accessor: Optional[Accessor] = None,
+        ordering: Optional[str] = None,
+    ) -> int:
+        return sum(map(truth, map(self._compiled(accessor, ordering), iterable)))
+
+    def exists(
+        self,
+        iterable: Iterable[Any],
+        accessor: Optional[Accessor] = None,
+        ordering: Optional[str] = None,
+    ) -> bool:
+        predicate = self._compiled(accessor, ordering)
+        return next(filter(predicate, iterable), _MISSING) is not _MISSING
+
+    def first(
+        self,
+        iterable: Iterable[T],
+        n: int = 1,
+        accessor: Optional[Accessor] = None,
+        ordering: Optional[str] = None,
+    ) -> List[T]:
+        return list(islice(filter(self._compiled(accessor, ordering), iterable), n))
+
     def __and__(self, other):
         return self.And(other)
 
@@ -93,15 +372,21 @@ class Specification(ABC):
 
         return NotSpecification(specification)
 
+    @staticmethod
+    def _interned(specification: Specification) -> Specification:
+        if (interner := Specification.interner) is not None:
+            return interner.intern(specification)
+        return specification
+
     @staticmethod
     def parse(_lookup_separator=".", **kwargs):
         specs = list(parse_specification(lookup_separator=_lookup_separator, **kwargs))
         if len(specs) > 1:
             from fractal_specifications.generic.collections import AndSpecification
 
-            return AndSpecification(specs)
+            return Specification._interned(AndSpecification(specs))
         elif len(specs) == 1:
-            return specs[0]
+            return Specification._interned(specs[0])
         return None
 
     def to_dict(self):
@@ -111,85 +396,103 @@ class Specification(ABC):
             },
             **{
                 key: value
-                for key, value in self.__dict__.items()
-                if not callable(value)
+                for key, value in _attributes(self)
+                if not callable(value) and not key.startswith("_")
             },
         }
 
     @classmethod
     def from_dict(cls, d: dict):
-        name = d.pop("op")
-        return all_specifications()[name]._from_dict(d)
+        from fractal_specifications.generic import codec
+
+        return codec.decode(d)
 
     @classmethod
     def _from_dict(cls: Type[SpecificationSubType], d: dict):
         return cls(**d)
 
     def dumps(self) -> str:
-        return json.dumps(self.to_dict())
+        import json
+
+        from fractal_specifications.generic import codec
+
+        return json.dumps(codec.encode(self), default=codec.default)
+
+    def fingerprint(self) -> str:
+        """
+        Digest of the structure of this specification, e.g., to use as cache key.
+
+        Unlike `hash()` it is stable across processes (it isn't salted by
+        `PYTHONHASHSEED`). Values of different types, like `1` and `1.0`, result in
+        different fingerprints. Pre-processors are not taken into account.
+        """
+        import hashlib
+
+        return hashlib.blake2b(
+            _dumps_canonical(self.to_dict()).encode(), digest_size=16
+        ).hexdigest()
+
+    @staticmethod
+    def loads(s: Union[str, bytes]) -> Specification:
+        from fractal_specifications.generic import codec
+
+        return codec.loads(s)
+
+    @staticmethod
+    def load(source: Union[bytes, str, IO]) -> Specification:
+        """
+        Load JSON from a file(-like) object or bytes, reading and parsing it in chunks,
+        see `streaming`.
+        """
+        from fractal_specifications.generic import streaming
+
+        return streaming.load(source)
+
+    def dump_bytes(self) -> bytes:
+        """Compact binary encoding of this specification, see `binary`."""
+        from fractal_specifications.generic import binary
+
+        return binary.dump_bytes(self)
 
     @staticmethod
-    def loads(s: str) -> Specification:
-        return Specification.from_dict(json.loads(s))
+    def load_bytes(data: Union[bytes, bytearray, memoryview]) -> Specification:
+        from fractal_specifications.generic import binary
+
+        return binary.load_bytes(data)
 
     @classmethod
     def name(cls) -> str:
         return cls.__name__[:-13].lower()  # -Specification
 
     def dump_dsl(self) -> Optional[str]:
-        from fractal_specifications.generic import collections, operators
-
-        if isinstance(self, operators.NotSpecification):
-            child = self.specification.dump_dsl()
-            return f"!({child})"
-        elif isinstance(self, operators.FieldValueSpecification):
-            lhs = self.field
-            operator = {
-                operators.EqualsSpecification.__name__: "==",
-                operators.NotEqualsSpecification.__name__: "!=",
-                operators.GreaterThanSpecification.__name__: ">",
-                operators.GreaterThanEqualSpecification.__name__: ">=",
-                operators.LessThanSpecification.__name__: "<",
-                operators.LessThanEqualSpecification.__name__: "<=",
-                operators.InSpecification.__name__: "in",
-                operators.ContainsSpecification.__name__: "contains",
-                operators.IsNoneSpecification.__name__: "is None",
-                operators.RegexStringMatchSpecification.__name__: "matches",
-            }[self.__class__.__name__]
-            if isinstance(self, operators.IsNoneSpecification):
-                return f"{lhs} {operator}"
-            rhs = f'"{self.value}"' if type(self.value) is str else repr(self.value)
-            return f"{lhs} {operator} {rhs}"
-        elif isinstance(
-            self, (collections.AndSpecification, collections.OrSpecification)
-        ):
-            op = {
-                collections.AndSpecification: " && ",
-                collections.OrSpecification: " || ",
-            }[type(self)]
-            child_strings = [
-                val for child in self.specifications if (val := child.dump_dsl())
-            ]
-            if child_strings:
-                return f"({op.join(child_strings)})"
-        elif isinstance(self, EmptySpecification):
-            return "#"
-        raise ValueError(f"Unsupported specification type: {type(self)}")
+        try:
+            return self._dsl  # type: ignore[attr-defined]
+        except AttributeError:
+            from fractal_specifications.generic import dsl
 
-    @staticmethod
-    @lru_cache
-    def load_dsl(dsl_string) -> Specification:
-        from lark import Lark
+            return dsl.dump_dsl(self)
 
-        from fractal_specifications.generic.dsl_parser import DSLTransformer, grammar
-
-        dsl_parser = Lark(grammar, start="start", parser="lalr")
-        transformer = DSLTransformer()
-        tree = dsl_parser.parse(dsl_string)
-        return transformer.transform(tree)
+    @staticmethod
+    def load_dsl(dsl_string) -> Union[Specification, SpecificationTemplate]:
+        """
+        Parse a DSL string. Strings with placeholders for values, like
+        `user_id == :user_id` or `created > $1`, result in a `SpecificationTemplate`.
+        """
+        from fractal_specifications.generic import dsl
+
+        parse_dsl = Specification.dsl_parser or dsl.parse_dsl
+        if (cache := Specification.dsl_cache) is not None:
+            specification = cache.get_or_create(
+                dsl_string, lambda: parse_dsl(dsl_string)
+            )
+        else:
+            specification = parse_dsl(dsl_string)
+        return Specification._interned(specification)
 
 
 class EmptySpecification(Specification):
+    __slots__ = ()
+
     def is_satisfied_by(self, obj: Any) -> bool:
         return True
 
@@ -0,0 +1,229 @@
+"""
+Loading specifications from JSON in a file (or bytes) without reading it all first,
+see `Specification.load`.
+
+The JSON is read in chunks. Objects and arrays are parsed without recursion, and the
+values of `in` specifications are parsed batch by batch (a chunk at a time, by `json`)
+and hashed for `InSpecification` while they're read. Decoding the parsed dicts is
+left to `codec`.
+"""
+
+import codecs
+import io
+import json
+import re
+from typing import IO, Any, Dict, List, Optional, Set, Union
+
+from fractal_specifications.generic import codec
+from fractal_specifications.generic.operators import _Values
+from fractal_specifications.generic.specification import Specification
+
+_WS = re.compile(r"[ \t\n\r]*")
+# A complete string, number or constant (matches a prefix of a longer number too)
+_SCALAR = re.compile(r'"(?:[^"\\]|\\.)*"|[-+.\w]+')
+# Strings, numbers and constants followed by a comma
+_SCALARS = re.compile(r'(?:[ \t\n\r]*(?:"(?:[^"\\]|\\.)*"|[-+.\w]+)[ \t\n\r]*,)+')
+# The longest prefix of a constant or number that could still be cut off
+_MAX_CUT_OFF = 16
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    __slots__ = ("read", "decode", "chunk_size", "buf", "pos", "offset", "eof")
+
+    def __init__(self, source: Union[bytes, str, IO], chunk_size: int):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        elif isinstance(source, str):
+            source = io.StringIO(source)
+        self.read = source.read
+        self.decode = codecs.getincrementaldecoder("utf-8")().decode
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.offset = 0  # of the buffer in the whole JSON
+        self.eof = False
+
+    def fill(self, size: int = 0) -> bool:
+        """Read (at least `size`) more characters, False at the end of the input."""
+        if self.eof:
+            return False
+        chunk = self.read(max(size, self.chunk_size))
+        text = self.decode(chunk, not chunk) if isinstance(chunk, bytes) else chunk
+        self.eof = not chunk
+        self.offset += self.pos
+        self.buf = self.buf[self.pos :] + text
+        self.pos = 0
+        return True
+
+    def error(self, expected: str):
+        found = repr(self.buf[self.pos]) if self.pos < len(self.buf) else "end of input"
+        raise ValueError(
+            f"Invalid JSON, expected {expected} at position {self.offset + self.pos}, "
+            f"found {found}"
+        )
+
+    def peek(self) -> str:
+        """The next character that isn't whitespace, or "" at the end of the input."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, expected: str):
+        if self.peek() != expected:
+            self.error(repr(expected))
+        self.pos += 1
+
+    def scalar(self) -> Any:
+        while True:
+            if not self.peek():
+                self.error("a value")
+            match = _SCALAR.match(self.buf, self.pos)
+            if match and (match.end() < len(self.buf) or self.eof):
+                try:
+                    value, end = _decoder.raw_decode(self.buf, self.pos)
+                except ValueError:
+                    end = -1
+                if end != match.end():
+                    self.error("a value")
+                self.pos = end
+                return value
+            # Read more if the value may have been cut off at the end of the buffer
+            remaining = len(self.buf) - self.pos
+            if not (match or self.buf[self.pos] == '"' or remaining < _MAX_CUT_OFF):
+                self.error("a value")
+            if not self.fill(remaining):
+                self.error("a value")
+
+    def key(self) -> str:
+        if self.peek() != '"':
+            self.error("a key")
+        key = self.scalar()
+        self.expect(":")
+        return key
+
+    def batch(self) -> Optional[List[Any]]:
+        """
+        The values up to the next comma or the end of the array, if they're all
+        strings, numbers or constants.
+        """
+        buf, pos = self.buf, self.pos
+        end = buf.find("]", pos)
+        cut = end if end != -1 else buf.rfind(",", pos)
+        if cut <= pos:
+            return None
+        if all(buf.find(c, pos, cut) == -1 for c in '"[{'):
+            pass  # Only numbers and constants
+        elif match := _SCALARS.match(buf, pos):
+            cut = match.end() - 1
+        else:
+            return None
+        try:
+            batch = json.loads(f"[{buf[pos:cut]}]")
+        except ValueError:
+            self.error("values")
+        self.pos = cut
+        return batch
+
+    def values(self) -> _Values:
+        """
+        The values of an `in` specification (the array is opened already), with
+        the set that `InSpecification` looks them up in.
+        """
+        values: List[Any] = []
+        hashed: Set[Any] = set()
+        unhashable: List[Any] = []
+        if self.peek() == "]":
+            self.pos += 1
+            return _Values(values, hashed, unhashable)
+        while True:
+            if batch := self.batch():
+                values += batch
+                hashed.update(batch)
+            else:
+                values.append(value := self.value())
+                if type(value) in (list, dict):
+                    unhashable.append(value)
+                else:
+                    hashed.add(value)
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return _Values(values, hashed, unhashable)
+            elif separator != ",":
+                self.pos -= 1
+                self.error("',' or ']'")
+
+    def value(self) -> Any:
+        # Open dicts and lists, with the key of the next value of each dict
+        stack: List[Any] = []
+        keys: List[Optional[str]] = []
+        while True:
+            c = self.peek()
+            if c == "{":
+                self.pos += 1
+                if self.peek() != "}":
+                    stack.append({})
+                    keys.append(self.key())
+                    continue
+                self.pos += 1
+                value: Any = {}
+            elif c == "[":
+                self.pos += 1
+                parent = stack[-1] if stack else None
+                if (
+                    type(parent) is dict
+                    and keys[-1] == "value"
+                    and parent.get("op") == "in"
+                ):
+                    value = self.values()
+                elif self.peek() != "]":
+                    stack.append([])
+                    keys.append(None)
+                    continue
+                else:
+                    self.pos += 1
+                    value = []
+            else:
+                value = self.scalar()
+
+            # Add the value to its container, and close the containers that end
+            while stack:
+                container = stack[-1]
+                if type(container) is dict:
+                    container[keys[-1]] = value
+                    end = "}"
+                else:
+                    container.append(value)
+                    end = "]"
+                separator = self.peek()
+                if separator == ",":
+                    self.pos += 1
+                    if end == "}":
+                        keys[-1] = self.key()
+                    break
+                elif separator != end:
+                    self.error(f"',' or '{end}'")
+                self.pos += 1
+                value = stack.pop()
+                keys.pop()
+            else:
+                return value
+
+
+def load(source: Union[bytes, str, IO], chunk_size: int = 1 << 16) -> Specification:
+    """
+    The specification in JSON `source`: bytes, a string or a file(-like) object
+    opened in binary (UTF-8) or text mode.
+    """
+    reader = _Reader(source, chunk_size)
+    d: Dict[str, Any] = reader.value()
+    if reader.peek() != "":
+        reader.error("end of input")
+    if type(d) is not dict:
+        raise ValueError("Invalid specification, expected a JSON object")
+    return codec.decode(d)
@@ -0,0 +1,209 @@
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar, Union
+
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.operators import (
+    FieldValueSpecification,
+    InSpecification,
+    NotSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import Specification
+
+T = TypeVar("T")
+
+Binder = Callable[[Dict[Union[int, str], Any]], Any]
+
+
+class Placeholder:
+    """
+    A value to be bound later: `:name` (bound by keyword) or `$1` (bound by position).
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Union[int, str]):
+        self.key = key
+
+    def __eq__(self, other):
+        return type(other) is Placeholder and self.key == other.key
+
+    def __hash__(self):
+        return hash((Placeholder, self.key))
+
+    def __repr__(self):
+        return f"${self.key}" if type(self.key) is int else f":{self.key}"
+
+
+def _value_binder(value: Any, placeholders: List[Placeholder]) -> Optional[Binder]:
+    if type(value) is Placeholder:
+        placeholders.append(value)
+        key = value.key
+        return lambda values: values[key]
+    elif type(value) is list and any(type(v) is Placeholder for v in value):
+        placeholders.extend(v for v in value if type(v) is Placeholder)
+        return lambda values: [
+            values[v.key] if type(v) is Placeholder else v for v in value
+        ]
+    return None
+
+
+def _binder(
+    specification: Specification, placeholders: List[Placeholder]
+) -> Optional[Binder]:
+    """
+    A function that builds `specification` with the placeholders replaced by the
+    values they're bound to, or None if it has no placeholders. Subtrees without
+    placeholders are shared by all bound specifications.
+    """
+    if type(specification) in (AndSpecification, OrSpecification):
+        collection = type(specification)
+        binders = [_binder(s, placeholders) for s in specification.specifications]
+        if not any(binders):
+            return None
+        parts = list(zip(binders, specification.specifications, strict=True))
+        return lambda values: collection(
+            [s if bind is None else bind(values) for bind, s in parts]
+        )
+    elif type(specification) is NotSpecification:
+        if (bind := _binder(specification.specification, placeholders)) is None:
+            return None
+        return lambda values: NotSpecification(bind(values))
+    elif isinstance(specification, FieldValueSpecification):
+        if (bind := _value_binder(specification.value, placeholders)) is None:
+            return None
+        cls, field = type(specification), specification.field
+        if cls is InSpecification:
+            return lambda values: InSpecification(field, bind(values))
+        pre_processor = specification.pre_processor
+        if cls is RegexStringMatchSpecification:
+            flags = specification.flags
+            return lambda values: RegexStringMatchSpecification(
+                field, bind(values), pre_processor, flags=flags
+            )
+        return lambda values: cls(field, bind(values), pre_processor)
+    return None
+
+
+class SpecificationTemplate:
+    """
+    A specification with placeholders for (some of) its values, like the one
+    returned by `Specification.load_dsl("user_id == :user_id && created > $1")`.
+
+    Binding values builds a specification without parsing again; only the parts of
+    the tree with placeholders are rebuilt.
+
+    ```
+    template.bind(1700000000, user_id=123)
+    ```
+    """
+
+    __slots__ = ("specification", "placeholders", "_keys", "_bind")
+
+    def __init__(self, specification: Specification):
+        placeholders: List[Placeholder] = []
+        self.specification = specification
+        self._bind = _binder(specification, placeholders)
+        self.placeholders = tuple(dict.fromkeys(placeholders))
+        self._keys = {placeholder.key for placeholder in self.placeholders}
+
+    def _values(
+        self, args: tuple, kwargs: Dict[str, Any]
+    ) -> Dict[Union[int, str], Any]:
+        """The bound values by placeholder key (positions count from 1)."""
+        values: Dict[Union[int, str], Any] = dict(enumerate(args, 1))
+        values.update(kwargs)
+        if values.keys() != self._keys:
+            missing = [repr(p) for p in self.placeholders if p.key not in values]
+            unexpected = [
+                repr(Placeholder(key)) for key in values if key not in self._keys
+            ]
+            raise TypeError(
+                f"Can't bind {self}, missing: {', '.join(missing) or '-'}, "
+                f"unexpected: {', '.join(unexpected) or '-'}"
+            )
+        return values
+
+    def bind(self, /, *args: Any, **kwargs: Any) -> Specification:
+        values = self._values(args, kwargs)
+        return self.specification if self._bind is None else self._bind(values)
+
+    def prepare(self, build: Callable[[Specification], T]) -> "PreparedQuery[T]":
+        """
+        Build a query for this template once, e.g., with
+        `PostgresSpecificationBuilder.build`, to fill in the bound values later.
+        """
+        return PreparedQuery(self, build)
+
+    def dump_dsl(self) -> Optional[str]:
+        return self.specification.dump_dsl()
+
+    def __eq__(self, other):
+        return (
+            type(other) is SpecificationTemplate
+            and self.specification == other.specification
+        )
+
+    def __hash__(self):
+        return hash((SpecificationTemplate, self.specification))
+
+    def __str__(self):
+        return f"{self.__class__.__name__}({self.specification})"
+
+
+def _substitute(query: Any, values: Dict[Union[int, str], Any]) -> Any:
+    if type(query) is Placeholder:
+        return values[query.key]
+    elif type(query) is list:
+        return [_substitute(item, values) for item in query]
+    elif type(query) is tuple:
+        return tuple([_substitute(item, values) for item in query])
+    elif type(query) is dict:
+        return {key: _substitute(item, values) for key, item in query.items()}
+    return query
+
+
+class PreparedQuery(Generic[T]):
+    """
+    The query built by a (contrib) builder for a template, with the placeholders
+    still in it, like `("user_id = %s", [:user_id])` for PostgreSQL.
+
+    Binding values copies the query with the values filled in, so the query (e.g.,
+    the SQL) is generated only once. Builders that don't pass values through as they
+    are (like `contains`, which wraps its value in a pattern) can't be prepared; for
+    those `reusable` is False and every bind builds the query from scratch.
+    """
+
+    __slots__ = ("template", "build", "query", "reusable")
+
+    def __init__(self, template: SpecificationTemplate, build: Callable[..., T]):
+        self.template = template
+        self.build = build
+        self.query: Optional[T] = None
+        try:
+            self.reusable = self._reusable()
+        except Exception:
+            self.reusable = False
+
+    def _reusable(self) -> bool:
+        self.query = self.build(self.template.specification)
+        if self.template._bind is None:
+            return True
+        # Placeholders can be left out of the query (formatted into a pattern), even
+        # if the same placeholder is passed through for another predicate, so check
+        # that unique values end up exactly where the placeholders are
+        values = {key: object() for key in self.template._keys}
+        query = self.build(self.template._bind(values))
+        return query == _substitute(self.query, values)
+
+    def bind(self, /, *args: Any, **kwargs: Any) -> T:
+        if self.reusable:
+            return _substitute(self.query, self.template._values(args, kwargs))
+        return self.build(self.template.bind(*args, **kwargs))
+
+
+def templated(
+    specification: Specification,
+) -> Union[Specification, SpecificationTemplate]:
+    """`specification` as template if it has placeholders, otherwise as it is."""
+    template = SpecificationTemplate(specification)
+    return template if template.placeholders else specification
@@ -79,6 +79,23 @@ def test_build_regex_string_match_specification(regex_string_match_specification
     )
 
 
+def test_build_regex_string_match_specification_ignore_case():
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    spec = RegexStringMatchSpecification("id", "abc", flags="i")
+    assert DjangoOrmSpecificationBuilder.build(spec) == Q(id__iregex="abc")
+
+
+@pytest.mark.parametrize("flags", ["m", "s", "x", "a", "is"])
+def test_build_regex_string_match_specification_unsupported_flags(flags):
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    with pytest.raises(SpecificationNotMappedToDjangoOrm):
+        DjangoOrmSpecificationBuilder.build(
+            RegexStringMatchSpecification("id", "abc", flags=flags)
+        )
+
+
 def test_build_is_none_specification(is_none_specification):
     assert DjangoOrmSpecificationBuilder.build(is_none_specification) == Q(
         field__isnull=True
@@ -207,6 +207,20 @@ def test_all_records_integration(users_table):
     assert len(results) == 6
 
 
+@pytest.mark.parametrize("pattern, flags", [("^ALI", "i"), ("^a.*m$", "ms")])
+def test_regex_flags_integration(db_connection, pattern, flags):
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    values = ["Alice", "alice\nsmith", "al\nm", "Bob"]
+    db_connection.execute("CREATE TABLE names (name VARCHAR)")
+    db_connection.executemany("INSERT INTO names VALUES (?)", [[v] for v in values])
+    spec = RegexStringMatchSpecification("name", pattern, flags=flags)
+    results = execute_query(db_connection, spec, table="names")
+
+    expected = [v for v in values if spec.pattern.match(v)]
+    assert sorted(name for (name,) in results) == sorted(expected)
+
+
 def test_decimal_comparison_integration(users_table):
     spec = GreaterThanEqualSpecification("salary", 75000)
     results = execute_query(users_table, spec)
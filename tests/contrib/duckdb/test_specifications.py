@@ -81,6 +81,26 @@ def test_build_regex_string_match_specification(regex_string_match_specification
     assert params == ["abc"]
 
 
+def test_build_regex_string_match_specification_flags():
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    spec = RegexStringMatchSpecification("id", "abc", flags="ims")
+    assert DuckDBSpecificationBuilder.build(spec) == (
+        "regexp_matches(id, ?)",
+        ["(?ims)abc"],
+    )
+
+
+@pytest.mark.parametrize("flags", ["a", "x", "ix"])
+def test_build_regex_string_match_specification_unsupported_flags(flags):
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    with pytest.raises(SpecificationNotMappedToDuckDB):
+        DuckDBSpecificationBuilder.build(
+            RegexStringMatchSpecification("id", "abc", flags=flags)
+        )
+
+
 def test_build_is_none_specification(is_none_specification):
     sql, params = DuckDBSpecificationBuilder.build(is_none_specification)
     assert sql == "field IS NULL"
@@ -93,6 +93,19 @@ def test_build_regex_string_match_specification(regex_string_match_specification
     }
 
 
+def test_build_regex_string_match_specification_flags():
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    spec = RegexStringMatchSpecification("id", "abc", flags="mi")
+    assert MongoSpecificationBuilder.build(spec) == {
+        "id": {"$regex": "abc", "$options": "im"}
+    }
+
+    spec = RegexStringMatchSpecification("id", "abc", flags="ai")
+    with pytest.raises(SpecificationNotMappedToMongo):
+        MongoSpecificationBuilder.build(spec)
+
+
 def test_build_is_none_specification(is_none_specification):
     assert MongoSpecificationBuilder.build(is_none_specification) == {
         "field": {"$eq": None}
@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+from typing import Any, Collection
+
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+
+from fractal_specifications.contrib.numpy.specifications import (
+    NumpySpecificationBuilder,
+    SpecificationNotMappedToNumpy,
+)
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.operators import (
+    ContainsSpecification,
+    EqualsSpecification,
+    InSpecification,
+    NotSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+columns = {
+    "id": np.array([1, 2, 3, 4]),
+    "name": np.array(["test", "a test", "", "other"]),
+    "field": np.array([1, "test", None, 2.5], dtype=object),
+    "price": np.array([0.5, 1.0, 1.5, np.nan]),
+}
+
+
+def rowwise(specification):
+    rows = [
+        SimpleNamespace(**dict(zip(columns, values, strict=True)))
+        for values in zip(*columns.values(), strict=True)
+    ]
+    return np.array([specification.is_satisfied_by(row) for row in rows])
+
+
+def test_build_none():
+    assert NumpySpecificationBuilder.build(None) is None
+
+
+def test_build_empty_specification(empty_specification):
+    assert NumpySpecificationBuilder.build(empty_specification) is None
+
+
+def test_build_equals_specification(equals_specification):
+    f = NumpySpecificationBuilder.build(equals_specification)
+    assert {k: v.tolist() for k, v in f(columns).items()} == {
+        "id": [1],
+        "name": ["test"],
+        "field": [1],
+        "price": [0.5],
+    }
+
+
+def test_build_mask_equals_specification(equals_specification):
+    mask = NumpySpecificationBuilder.build(equals_specification, return_mask=True)
+    assert mask(columns).tolist() == [True, False, False, False]
+
+
+@pytest.mark.parametrize(
+    "specification",
+    [
+        "id == 1",
+        "id != 1",
+        "id < 3",
+        "id <= 3",
+        "id > 3",
+        "id >= 3",
+        "price < 1.5",
+        "price >= 1",
+        "id in [1, 3, 5]",
+        "name in ['test', 'other']",
+        "field in [1, 'test']",
+        "field in []",
+        "field == 'test'",
+        "field is None",
+        "id is None",
+        "name contains 'test'",
+        "name contains ''",
+        "name matches '^(a|o)'",
+        "name matches 'TEST'/i",
+        "!(id == 1)",
+        "id == 1 && name == 'test'",
+        "id == 1 || name == 'other'",
+        "(id > 1 && !(field is None)) || name contains 'oth'",
+    ],
+)
+def test_build_matches_rowwise(specification):
+    specification = Specification.load_dsl(specification)
+    mask = NumpySpecificationBuilder.build(specification, return_mask=True)
+    assert mask(columns).tolist() == rowwise(specification).tolist()
+
+
+@pytest.mark.parametrize(
+    "specification",
+    [
+        ContainsSpecification("field", "test"),
+        InSpecification("name", ["test", 1]),
+        EqualsSpecification("name", "TEST", pre_processor=str.upper),
+        RegexStringMatchSpecification("name", "A", pre_processor=str.upper),
+        NotSpecification(AndSpecification([])),
+        OrSpecification([]),
+        AndSpecification([EmptySpecification(), EqualsSpecification("id", 2)]),
+    ],
+)
+def test_build_other_specifications_match_rowwise(specification):
+    columns_ = {**columns, "field": np.array(["test", "a test", None, "x"])}
+    mask = NumpySpecificationBuilder.build(specification, return_mask=True)
+    expected = [
+        specification.is_satisfied_by(SimpleNamespace(**row))
+        for row in (
+            {name: values[i] for name, values in columns_.items()} for i in range(4)
+        )
+    ]
+    assert mask(columns_).tolist() == expected
+
+
+def test_build_empty_columns():
+    mask = NumpySpecificationBuilder.build(AndSpecification([]), return_mask=True)
+    assert mask({}).tolist() == []
+
+
+def test_build_comparison_type_error():
+    mask = NumpySpecificationBuilder.build(
+        Specification.load_dsl("id < 'a'"), return_mask=True
+    )
+    with pytest.raises(TypeError):
+        mask(columns)
+
+
+def test_build_dict_specification(dict_specification):
+    with pytest.raises(SpecificationNotMappedToNumpy):
+        NumpySpecificationBuilder.build(dict_specification)
+
+
+def test_specification_not_mapped():
+    class ErrorSpecification(Specification):
+        def is_satisfied_by(self, obj: Any) -> bool:
+            return False
+
+        def to_collection(self) -> Collection:
+            return []
+
+        def __str__(self):
+            return self.__class__.__name__
+
+    with pytest.raises(SpecificationNotMappedToNumpy):
+        NumpySpecificationBuilder.build(ErrorSpecification())
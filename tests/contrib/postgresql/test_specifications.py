@@ -81,6 +81,32 @@ def test_build_regex_string_match_specification(regex_string_match_specification
     assert params == ["abc"]
 
 
+@pytest.mark.parametrize(
+    "flags, pattern",
+    [
+        ("i", "abc"),
+        ("s", "(?s)abc"),
+        ("m", "(?n)abc"),
+        ("ms", "(?w)abc"),
+        ("ix", "(?x)abc"),
+    ],
+)
+def test_build_regex_string_match_specification_flags(flags, pattern):
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    spec = RegexStringMatchSpecification("id", "abc", flags=flags)
+    assert PostgresSpecificationBuilder.build(spec) == ("id ~* %s", [pattern])
+
+
+def test_build_regex_string_match_specification_unsupported_flags():
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    with pytest.raises(SpecificationNotMappedToPostgres):
+        PostgresSpecificationBuilder.build(
+            RegexStringMatchSpecification("id", "abc", flags="a")
+        )
+
+
 def test_build_is_none_specification(is_none_specification):
     sql, params = PostgresSpecificationBuilder.build(is_none_specification)
     assert sql == "field IS NULL"
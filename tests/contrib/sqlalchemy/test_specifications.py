@@ -102,6 +102,17 @@ def test_build_regex_string_match_specification(regex_string_match_specification
     )
 
 
+def test_build_regex_string_match_specification_flags():
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    spec = RegexStringMatchSpecification("id", "abc", flags="i")
+    assert SqlAlchemyOrmSpecificationBuilder.build(spec) == ("id", "regex", "abc")
+    with pytest.raises(SpecificationNotMappedToSqlAlchemyOrm):
+        SqlAlchemyOrmSpecificationBuilder.build(
+            RegexStringMatchSpecification("id", "abc", flags="im")
+        )
+
+
 def test_build_is_none_specification(is_none_specification):
     assert SqlAlchemyOrmSpecificationBuilder.build(is_none_specification) == (
         "field",
@@ -0,0 +1,100 @@
+import random
+from enum import IntEnum
+from typing import Callable, Tuple
+
+from fractal_specifications.generic import operators
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.operators import NotSpecification
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+
+class Level(IntEnum):
+    HIGH = 3
+
+
+# Values that are hard to serialize
+VALUES = [
+    0,
+    -7,
+    10**20,
+    1.5,
+    -0.0,
+    1e-05,
+    1e16,
+    True,
+    False,
+    None,
+    Level.HIGH,
+    "",
+    "plain",
+    'it"s',
+    "it's",
+    "back\\",
+    'escaped \\"quote\\"',
+    "multi\nline",
+]
+
+
+def random_specification(
+    rng: random.Random,
+    leaf: Callable[[random.Random], Specification],
+    max_depth: int = 3,
+    sizes: Tuple[int, int] = (1, 5),
+    depth: int = 0,
+) -> Specification:
+    """
+    A random tree of And/Or/Not of at most `max_depth` levels, with leaves from
+    `leaf(rng)` and `rng.randrange(*sizes)` children per collection.
+    """
+    if depth >= max_depth or rng.random() < 0.5:
+        return leaf(rng)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return NotSpecification(
+            random_specification(rng, leaf, max_depth, sizes, depth + 1)
+        )
+    collection = AndSpecification if kind == 1 else OrSpecification
+    return collection(
+        [
+            random_specification(rng, leaf, max_depth, sizes, depth + 1)
+            for _ in range(rng.randrange(*sizes))
+        ]
+    )
+
+
+def random_leaf(rng: random.Random) -> Specification:
+    kind = rng.randrange(5)
+    field = rng.choice(["id", "obj.name", "in", "a__b"])
+    if kind == 0:
+        cls = rng.choice(
+            [
+                operators.EqualsSpecification,
+                operators.NotEqualsSpecification,
+                operators.LessThanSpecification,
+                operators.LessThanEqualSpecification,
+                operators.GreaterThanSpecification,
+                operators.GreaterThanEqualSpecification,
+                operators.ContainsSpecification,
+            ]
+        )
+        return cls(field, rng.choice(VALUES))
+    elif kind == 1:
+        return operators.InSpecification(field, rng.sample(VALUES, rng.randrange(4)))
+    elif kind == 2:
+        return operators.RegexStringMatchSpecification(
+            field, rng.choice(["^jo", 'it"s', "a.*"]), flags=rng.choice(["", "i", "ms"])
+        )
+    elif kind == 3:
+        return operators.IsNoneSpecification(field)
+    return EmptySpecification()
+
+
+def random_serializable_specification(rng: random.Random) -> Specification:
+    """
+    A random specification with `random_leaf` leaves that survives a round trip
+    through the DSL (collections have at least two children).
+    """
+    return random_specification(rng, random_leaf, max_depth=4, sizes=(2, 4))
@@ -0,0 +1,78 @@
+from collections import namedtuple
+from dataclasses import make_dataclass
+from types import SimpleNamespace
+
+import pytest
+
+from fractal_specifications.generic.accessors import (
+    AttributeAccessor,
+    IndexAccessor,
+    ItemAccessor,
+    MixedAccessor,
+)
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    GreaterThanSpecification,
+)
+from fractal_specifications.generic.specification import Specification
+
+
+def test_attribute_accessor():
+    DC1 = make_dataclass("DC1", [("id", int)])
+    DC2 = make_dataclass("DC2", [("obj", DC1)])
+    assert AttributeAccessor().getter("id")(DC1(id=1)) == 1
+    assert AttributeAccessor().getter("obj.id")(DC2(DC1(id=2))) == 2
+    assert AttributeAccessor().getter("obj__id")(DC2(DC1(id=3))) == 3
+
+
+def test_attribute_accessor_dotted_attribute():
+    obj = SimpleNamespace()
+    setattr(obj, "a.b", SimpleNamespace(c=1))
+    assert AttributeAccessor().getter("a.b__c")(obj) == 1
+
+
+def test_item_accessor():
+    assert ItemAccessor().getter("id")({"id": 1}) == 1
+    assert ItemAccessor().getter("a.b")({"a": {"b": 2}}) == 2
+    assert ItemAccessor().getter("a.b.c")({"a": {"b": {"c": 3}}}) == 3
+    with pytest.raises(KeyError):
+        ItemAccessor().getter("id")({})
+
+
+def test_index_accessor():
+    assert IndexAccessor().getter("1")((10, 20)) == 20
+    assert IndexAccessor(["id", "name"]).getter("name")((1, "a")) == "a"
+    assert IndexAccessor(["id", "tags"]).getter("tags.-1")((1, ["a", "b"])) == "b"
+    with pytest.raises(KeyError):
+        IndexAccessor(["id"]).getter("name")
+
+
+def test_mixed_accessor():
+    DC = make_dataclass("DC", [("payload", dict)])
+    Row = namedtuple("Row", ["id", "tags"])
+    getter = MixedAccessor().getter("payload.items.0.id")
+    assert getter(DC(payload={"items": [{"id": 1}]})) == 1
+    assert getter({"payload": {"items": [Row(id=2, tags=[])]}}) == 2
+    assert MixedAccessor().getter("tags.0")(Row(id=1, tags=["a"])) == "a"
+    with pytest.raises(KeyError):
+        getter(DC(payload={}))
+
+
+def test_compile_with_accessor():
+    spec = Specification.load_dsl("user.age >= 18 && country == 'NL'")
+    rows = [
+        {"user": {"age": 17}, "country": "NL"},
+        {"user": {"age": 18}, "country": "NL"},
+        {"user": {"age": 30}, "country": "BE"},
+    ]
+    assert [r["user"]["age"] for r in spec.filter(rows, ItemAccessor())] == [18]
+    assert spec.count(rows, MixedAccessor()) == 1
+    assert spec.exists(rows, accessor=ItemAccessor())
+    assert spec.first(rows, accessor=ItemAccessor()) == [rows[1]]
+    assert spec.compile(ItemAccessor())(rows[1])
+
+
+def test_compile_with_index_accessor():
+    rows = [(1, "a"), (2, "b"), (3, "c")]
+    spec = GreaterThanSpecification("id", 1) & EqualsSpecification("name", "c")
+    assert list(spec.filter(rows, IndexAccessor(["id", "name"]))) == [(3, "c")]
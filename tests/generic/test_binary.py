@@ -0,0 +1,150 @@
+import random
+from enum import IntEnum
+from typing import Any, Collection
+
+import pytest
+
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    InSpecification,
+    NotSpecification,
+)
+from fractal_specifications.generic.specification import Specification
+from tests.fixtures.generators import random_serializable_specification
+
+
+def test_round_trip(complex_specification):
+    rng = random.Random(42)
+    for specification in [complex_specification] + [
+        random_serializable_specification(rng) for _ in range(1_000)
+    ]:
+        assert Specification.load_bytes(specification.dump_bytes()) == specification
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        0,
+        -1,
+        2**100,
+        -(2**100),
+        -0.0,
+        "",
+        "\U0001f600 \ud800",
+        [],
+        [1, -2, 2**70],
+        [1.5, -2.0],
+        ["a", "b"],
+        [1, "a", None, True, 1.5, [2]],
+        (1, "a"),
+        frozenset({1, "a"}),
+        {"a": [1, {"b": None}], "c": (False,)},
+    ],
+)
+def test_round_trip_values(value):
+    specification = EqualsSpecification("id", value)
+    loaded = Specification.load_bytes(specification.dump_bytes())
+    assert loaded == specification
+    assert type(loaded.value) is type(value)
+
+
+def test_round_trip_subclass_values():
+    class Level(IntEnum):
+        HIGH = 3
+
+    class Name(str):
+        pass
+
+    class Price(float):
+        pass
+
+    specification = InSpecification("id", [Level.HIGH, True, Name("x"), Price(1.5)])
+    loaded = Specification.load_bytes(specification.dump_bytes())
+    assert loaded.value == [3, True, "x", 1.5]
+    assert list(map(type, loaded.value)) == [int, bool, str, float]
+
+
+def test_round_trip_deep_and_empty():
+    specification = EqualsSpecification("id", 1)
+    for _ in range(10_000):
+        specification = NotSpecification(specification)
+    specification = Specification.load_bytes(specification.dump_bytes())
+    for _ in range(10_000):
+        specification = specification.specification
+    assert specification == EqualsSpecification("id", 1)
+
+    specification = OrSpecification([AndSpecification([]), OrSpecification([])])
+    assert Specification.load_bytes(specification.dump_bytes()) == specification
+
+
+def test_round_trip_custom_specification():
+    class SeniorSpecification(Specification):
+        def __init__(self, age: int = 18):
+            self.age = age
+
+        def __eq__(self, other):
+            return type(other) is SeniorSpecification and self.age == other.age
+
+        def is_satisfied_by(self, obj: Any) -> bool:
+            return obj.age >= self.age
+
+        def to_collection(self) -> Collection:
+            return []
+
+    specification = AndSpecification(
+        [SeniorSpecification(21), EqualsSpecification("a", 1)]
+    )
+    assert Specification.load_bytes(specification.dump_bytes()) == specification
+
+
+def test_compact():
+    specification = InSpecification("user_id", list(range(10**9, 10**9 + 100_000)))
+    data = specification.dump_bytes()
+    assert len(data) < len(specification.dumps()) / 2
+    assert Specification.load_bytes(bytearray(data)) == specification
+    assert Specification.load_bytes(memoryview(data)) == specification
+
+    specification = AndSpecification(
+        [EqualsSpecification("tenant.id", i) for i in range(1_000)]
+    )
+    data = specification.dump_bytes()
+    assert data.count(b"tenant.id") == 1
+    assert len(data) < len(specification.dumps()) / 10
+
+
+@pytest.mark.parametrize(
+    "specification",
+    [
+        EqualsSpecification("id", object()),
+        EqualsSpecification(1, 1),
+    ],
+)
+def test_dump_bytes_unsupported(specification):
+    with pytest.raises(ValueError, match="can't be written as bytes"):
+        specification.dump_bytes()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"FS\x02\x00\x00",
+        b"FS\x01",
+        b"FS\x01\x01\x05ab",
+        b"FS\x01\x00\x01\x00",
+        b"FS\x01\x00\x63",
+        b"FS\x01\x01\x01\xff\x01\x00\x05\x01",
+        b"FS\x01\x00\x0c\x02\x00",
+        b"FS\x01\x01\x01a\x01\x00\x0a\xff\xff\xff\x7f",
+        b"FS\x01\x01\x01a\x01\x00\x63",
+        b"FS\x01\x00\x00\x00",
+        b"FS\x01\x01\x01a\x08\x00\x09\x05b\x01",
+        b"FS\x01\x01\x01a\x08\x00\x09\x01x\x01",
+        b"FS\x01\x01\x01a\x08\x00\x0b\x02b\x02\x02\x03abc",
+        b"FS\x01\x01\x01a\x08\x00\x0b\x02b\xff\x04\x03abc",
+    ],
+)
+def test_load_bytes_invalid(data):
+    with pytest.raises(ValueError):
+        Specification.load_bytes(data)
@@ -0,0 +1,46 @@
+from fractal_specifications.generic.cache import BoundedCache, CacheInfo
+
+
+def test_bounded_cache():
+    cache = BoundedCache(maxsize=2)
+    assert cache.get_or_create("a", lambda: 1) == 1
+    assert cache.get_or_create("a", lambda: 2) == 1
+    assert cache.get_or_create("b", lambda: 2) == 2
+    assert cache.get_or_create("c", lambda: 3) == 3
+    assert "a" not in cache
+    assert "b" in cache
+    assert len(cache) == 2
+    assert cache.info() == CacheInfo(
+        hits=1, misses=3, evictions=1, maxsize=2, currsize=2
+    )
+
+
+def test_bounded_cache_lru_order():
+    cache = BoundedCache(maxsize=2)
+    cache.get_or_create("a", lambda: 1)
+    cache.get_or_create("b", lambda: 2)
+    cache.get_or_create("a", lambda: 1)
+    cache.get_or_create("c", lambda: 3)
+    assert "a" in cache
+    assert "b" not in cache
+
+
+def test_bounded_cache_resize():
+    cache = BoundedCache(maxsize=None)
+    for i in range(10):
+        cache.get_or_create(i, lambda i=i: i)
+    assert cache.maxsize is None
+    assert len(cache) == 10
+    cache.maxsize = 3
+    assert cache.maxsize == 3
+    assert list(range(7, 10)) == [i for i in range(10) if i in cache]
+    assert cache.info().evictions == 7
+
+
+def test_bounded_cache_clear():
+    cache = BoundedCache()
+    cache.get_or_create("a", lambda: 1)
+    cache.clear()
+    assert cache.info() == CacheInfo(
+        hits=0, misses=0, evictions=0, maxsize=128, currsize=0
+    )
@@ -0,0 +1,121 @@
+import copy
+import json
+import random
+from typing import Any, Collection
+
+import pytest
+
+from fractal_specifications.generic import codec
+from fractal_specifications.generic.collections import AndSpecification
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    NotSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+from tests.fixtures.generators import random_serializable_specification
+
+
+def test_encode_like_to_dict(complex_specification):
+    rng = random.Random(42)
+    for specification in [complex_specification] + [
+        random_serializable_specification(rng) for _ in range(1_000)
+    ]:
+        d = specification.to_dict()
+        assert codec.encode(specification) == d
+        assert json.dumps(codec.encode(specification)) == json.dumps(d)
+        assert codec.decode(d) == specification
+        assert codec.loads(codec.dumps(specification)) == specification
+
+
+def test_decode_does_not_change_input(complex_specification):
+    d = complex_specification.to_dict()
+    expected = copy.deepcopy(d)
+    assert codec.decode(d) == complex_specification
+    assert Specification.from_dict(d) == complex_specification
+    assert d == expected
+
+
+def test_decode_shorthand_ops():
+    assert codec.decode(
+        {"op": "&", "specs": [{"op": "==", "field": "id", "value": 1}]}
+    ) == AndSpecification([EqualsSpecification("id", 1)])
+
+
+def test_decode_other_keys():
+    assert codec.decode(
+        {"op": "matches", "field": "name", "value": "^jo", "flags": "i"}
+    ) == RegexStringMatchSpecification("name", "^jo", flags="i")
+    assert codec.decode(
+        {"op": "isnone", "field": "name", "value": 1}
+    ) == IsNoneSpecification("name")
+    with pytest.raises(TypeError):
+        codec.decode({"op": "eq", "field": "id", "value": 1, "other": 2})
+    with pytest.raises(TypeError):
+        codec.decode({"op": "matches", "field": "id", "value": "x", "other": 2})
+    with pytest.raises(TypeError):
+        codec.decode({"op": "empty", "other": 2})
+    with pytest.raises(KeyError):
+        codec.decode({"op": "unknown"})
+
+
+def test_custom_specifications():
+    class AdultSpecification(Specification):
+        def __init__(self, age: int = 18):
+            self.age = age
+
+        def __eq__(self, other):
+            return type(other) is AdultSpecification and self.age == other.age
+
+        def is_satisfied_by(self, obj: Any) -> bool:
+            return obj.age >= self.age
+
+        def to_collection(self) -> Collection:
+            return []
+
+    class TagsSpecification(InSpecification):
+        pass
+
+    class DeletedSpecification(IsNoneSpecification):
+        pass
+
+    class NeitherSpecification(NotSpecification):
+        pass
+
+    class AllSpecification(AndSpecification):
+        pass
+
+    specification = AllSpecification(
+        [
+            AdultSpecification(21),
+            TagsSpecification("tags", ["a"]),
+            NeitherSpecification(DeletedSpecification("deleted")),
+            EmptySpecification(),
+        ]
+    )
+    d = codec.encode(specification)
+    assert d == specification.to_dict()
+    assert d["specs"][0] == {"op": "adult", "age": 21}
+    assert codec.decode(d) == specification
+    assert Specification.loads(specification.dumps()) == specification
+
+
+def test_dumps_and_loads_without_orjson(monkeypatch, complex_specification):
+    monkeypatch.setattr(codec, "orjson", None)
+    s = codec.dumps(complex_specification)
+    assert s == json.dumps(complex_specification.to_dict(), separators=(",", ":"))
+    assert codec.loads(s) == complex_specification
+
+
+def test_dumps_and_loads_outside_orjson_range():
+    pytest.importorskip("orjson")
+    specification = EqualsSpecification("id", 2**70)
+    assert codec.loads(codec.dumps(specification)) == specification
+    assert codec.loads('{"op": "eq", "field": "id", "value": 1e400}') == (
+        EqualsSpecification("id", float("inf"))
+    )
@@ -1,5 +1,7 @@
 from dataclasses import make_dataclass
 
+import pytest
+
 from fractal_specifications.generic.collections import AndSpecification, OrSpecification
 from fractal_specifications.generic.operators import EqualsSpecification
 
@@ -114,3 +116,39 @@ def test_or_specification_or_or():
     )
     DC = make_dataclass("DC", [("id", int), ("name", str)])
     assert spec.is_satisfied_by(DC(id=2, name="a"))
+
+
+def test_collection_of():
+    specs = [EqualsSpecification("id", i) for i in range(5)]
+    assert AndSpecification.of(specs) == AndSpecification(specs)
+    assert OrSpecification.of(iter(specs)) == OrSpecification(specs)
+    assert AndSpecification.of(
+        [specs[0], AndSpecification(specs[1:3]), OrSpecification(specs[3:])]
+    ) == AndSpecification(specs[:3] + [OrSpecification(specs[3:])])
+    assert AndSpecification.of([]) == AndSpecification([])
+
+
+def test_collection_builder():
+    specs = [EqualsSpecification("id", i) for i in range(5)]
+    builder = AndSpecification.builder(specs[:1])
+    builder &= specs[1]
+    builder.add(AndSpecification(specs[2:4])).extend(specs[4:])
+    assert len(builder) == 5
+    spec = builder.build()
+    assert spec == AndSpecification(specs)
+    builder &= specs[0]
+    assert len(spec.specifications) == 5
+
+    builder = OrSpecification.builder()
+    builder |= specs[0]
+    builder |= OrSpecification(specs[1:])
+    assert builder.build() == OrSpecification(specs)
+
+
+def test_collection_builder_wrong_operator():
+    builder = AndSpecification.builder()
+    with pytest.raises(TypeError):
+        builder |= EqualsSpecification("id", 1)
+    builder = OrSpecification.builder()
+    with pytest.raises(TypeError):
+        builder &= EqualsSpecification("id", 1)
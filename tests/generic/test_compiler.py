@@ -0,0 +1,220 @@
+from dataclasses import make_dataclass
+from typing import Any, Collection
+
+import pytest
+
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.operators import (
+    ContainsSpecification,
+    EqualsSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    NotSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+DC = make_dataclass(
+    "DC",
+    [("id", Any), ("price", Any), ("name", Any), ("field", Any)],
+)
+
+
+def objects():
+    return [
+        DC(id=1, price=25, name="a", field="xyz"),
+        DC(id=1.5, price=30, name=None, field="abc"),
+        DC(id=False, price=20, name="b", field=""),
+        DC(id=True, price=25, name="c", field=["b"]),
+        DC(id=None, price=10, name="d", field=None),
+    ]
+
+
+def test_compile_complex_specification(complex_specification):
+    predicate = complex_specification.compile()
+    objs = objects()
+    objs[3].field = "y"
+    for obj in objs:
+        try:
+            expected = complex_specification.is_satisfied_by(obj)
+        except TypeError:
+            with pytest.raises(TypeError):
+                predicate(obj)
+        else:
+            assert predicate(obj) == expected
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        EqualsSpecification("id", 1),
+        GreaterThanSpecification("price", 20) & EqualsSpecification("name", "a"),
+        GreaterThanSpecification("price", 20) | IsNoneSpecification("name"),
+        NotSpecification(InSpecification("price", [10, 20])),
+        ContainsSpecification("field", "b"),
+        EmptySpecification(),
+        AndSpecification([]),
+        OrSpecification([]),
+        AndSpecification([EmptySpecification(), OrSpecification([])]),
+    ],
+)
+def test_compile_equivalence(spec):
+    predicate = spec.compile()
+    for obj in objects():
+        assert predicate(obj) == spec.is_satisfied_by(obj)
+
+
+def test_compile_nested_fields():
+    Inner = make_dataclass("Inner", [("id", int)])
+    Outer = make_dataclass("Outer", [("obj", Inner)])
+    assert EqualsSpecification("obj.id", 1).compile()(Outer(Inner(1)))
+    assert EqualsSpecification("obj__id", 1).compile()(Outer(Inner(1)))
+    assert not EqualsSpecification("obj.id", 2).compile()(Outer(Inner(1)))
+
+
+def test_compile_pre_processor():
+    spec = EqualsSpecification("name", "abc", lambda i: i.lower())
+    Name = make_dataclass("Name", [("name", str)])
+    assert spec.compile()(Name("ABC"))
+
+
+def test_compile_regex():
+    spec = RegexStringMatchSpecification("name", "^f.*l$")
+    Name = make_dataclass("Name", [("name", str)])
+    predicate = spec.compile()
+    assert predicate(Name("fractal"))
+    assert not predicate(Name("fractals"))
+
+
+def test_compile_custom_specification():
+    class OddSpecification(Specification):
+        def is_satisfied_by(self, obj: Any) -> bool:
+            return obj.price % 2 == 1
+
+        def to_collection(self) -> Collection:
+            return []
+
+    spec = OddSpecification() & EqualsSpecification("name", "a")
+    predicate = spec.compile()
+    for obj in objects():
+        assert predicate(obj) == spec.is_satisfied_by(obj)
+
+
+def test_compile_deep_specification():
+    spec = EqualsSpecification("id", 1)
+    for _ in range(150):
+        spec = NotSpecification(NotSpecification(spec))
+    predicate = spec.compile()
+    assert predicate(objects()[0])
+    assert not predicate(objects()[1])
+
+
+class CountingSpecification(Specification):
+    def __init__(self, predicate):
+        self.predicate = predicate
+        self.calls = 0
+
+    def is_satisfied_by(self, obj: Any) -> bool:
+        self.calls += 1
+        return self.predicate(obj)
+
+    def to_collection(self) -> Collection:
+        return []
+
+
+@pytest.mark.parametrize("ordering", ["cost", "adaptive"])
+def test_compile_ordering_equivalence(complex_specification, ordering):
+    predicate = complex_specification.compile(ordering=ordering)
+    objs = objects()
+    objs[3].field = "y"
+    for _ in range(40):
+        for obj in objs:
+            try:
+                expected = complex_specification.is_satisfied_by(obj)
+            except TypeError:
+                continue
+            assert predicate(obj) == expected
+
+
+def test_compile_cost_ordering():
+    expensive = CountingSpecification(lambda obj: True)
+    spec = (
+        expensive
+        & RegexStringMatchSpecification("name", "^a")
+        & EqualsSpecification("id", 1)
+    )
+    predicate = spec.compile(ordering="cost")
+    objs = [obj for obj in objects() if obj.name is not None]
+    assert [predicate(obj) for obj in objs] == [
+        spec.is_satisfied_by(obj) for obj in objs
+    ]
+    assert expensive.calls == 1 + 4  # once by the compiled predicate
+
+
+def test_compile_cost_estimates():
+    from fractal_specifications.generic.compiler import SpecificationCompiler
+
+    compiler = SpecificationCompiler()
+    eq = EqualsSpecification("id", 1)
+    regex = RegexStringMatchSpecification("a.b", "x", lambda i: i)
+    assert compiler.cost(eq) < compiler.cost(regex)
+    assert compiler.cost(InSpecification("id", [1, 2])) < compiler.cost(
+        InSpecification("id", list(range(8)))
+    )
+    assert compiler.cost(NotSpecification(eq)) == compiler.cost(eq)
+    assert compiler.cost(eq & regex) == compiler.cost(eq) + compiler.cost(regex)
+    assert compiler.pass_rate(NotSpecification(eq)) == pytest.approx(0.9)
+    assert compiler.pass_rate(eq & eq) == pytest.approx(0.01)
+    assert compiler.pass_rate(eq | eq) == pytest.approx(0.19)
+    assert compiler._order([EmptySpecification(), eq], "and") == [
+        eq,
+        EmptySpecification(),
+    ]
+
+
+def test_compile_adaptive_ordering():
+    rarely = CountingSpecification(lambda obj: obj.id < 2)
+    mostly = CountingSpecification(lambda obj: obj.id > 0)
+    predicate = (mostly & rarely).compile(ordering="adaptive")
+    Id = make_dataclass("Id", [("id", int)])
+    rows = [Id(i % 100) for i in range(10000)]
+    assert sum(map(predicate, rows)) == 100
+    assert predicate.order[0] is predicate.predicates[1]
+    assert mostly.calls < 2000
+
+    rarely.calls = mostly.calls = 0
+    predicate = (rarely | mostly).compile(ordering="adaptive")
+    assert sum(map(predicate, rows)) == 10000
+    assert predicate.order[0] is predicate.predicates[1]
+    assert rarely.calls < 2000
+
+
+def test_compile_adaptive_sample_ignores_errors():
+    Name = make_dataclass("Name", [("name", Any)])
+    spec = NotSpecification(
+        IsNoneSpecification("name")
+    ) & RegexStringMatchSpecification("name", "a")
+    predicate = spec.compile(ordering="adaptive")
+    rows = [Name(None), Name("a"), Name("b")] * 100
+    assert [predicate(row) for row in rows] == [
+        spec.is_satisfied_by(row) for row in rows
+    ]
+
+
+def test_compile_unknown_ordering():
+    with pytest.raises(ValueError):
+        EqualsSpecification("id", 1).compile(ordering="random")
+
+
+def test_filter_ordering():
+    spec = GreaterThanSpecification("price", 20) & EqualsSpecification("name", "a")
+    assert spec.count(objects(), ordering="adaptive") == 1
+    assert spec.first(objects(), ordering="cost") == objects()[:1]
+    assert list(spec.filter(objects(), ordering="cost")) == objects()[:1]
+    assert spec.exists(objects(), ordering="cost")
+    spec = EqualsSpecification("id", 7) | EqualsSpecification("price", 7)
+    assert spec.count(objects(), ordering="adaptive") == 0
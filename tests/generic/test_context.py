@@ -0,0 +1,135 @@
+from typing import Any, Collection
+
+import pytest
+
+from fractal_specifications.generic import context
+from fractal_specifications.generic.context import current_values, evaluation_context
+from fractal_specifications.generic.operators import EqualsSpecification
+from fractal_specifications.generic.specification import Specification
+
+
+class Person:
+    def __init__(self, age, child=None):
+        self._age = age
+        self.child = child
+        self.lookups = 0
+
+    @property
+    def age(self):
+        self.lookups += 1
+        if self._age is ValueError:
+            raise ValueError
+        return self._age
+
+
+AGE = "age == None || (age >= 18 && age < 65)"
+
+
+def test_evaluation_context():
+    obj = object()
+    assert current_values(obj) is None
+    with evaluation_context(obj):
+        values = current_values(obj)
+        assert values == {}
+        with evaluation_context(obj):
+            assert current_values(obj) is values
+        with evaluation_context(1):
+            assert current_values(obj) is None
+        assert current_values(obj) is values
+    assert current_values(obj) is None
+
+
+def test_evaluation_context_custom_specification():
+    person = Person(30)
+    with evaluation_context(person):
+        assert Specification.load_dsl("age > 18").is_satisfied_by(person)
+        assert Specification.load_dsl("age < 65").is_satisfied_by(person)
+        assert current_values(person) == {"age": 30}
+        other = Person(40)
+        assert Specification.load_dsl("age > 18").is_satisfied_by(other)
+        assert current_values(other) is None
+    assert person.lookups == 1
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_field_resolved_once(compiled):
+    spec = Specification.load_dsl(AGE)
+    predicate = spec.compile() if compiled else spec.is_satisfied_by
+    person = Person(70)
+    assert not predicate(person)
+    assert person.lookups == 1
+    assert not predicate(person)
+    assert person.lookups == 2  # not memoized across calls
+    person = Person(None)
+    assert predicate(person)
+    assert person.lookups == 1
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_field_errors_not_memoized(compiled):
+    spec = Specification.load_dsl("age == 1 || (age == 2 && age == 3)")
+    predicate = spec.compile() if compiled else spec.is_satisfied_by
+    person = Person(ValueError)
+    with pytest.raises(ValueError):
+        predicate(person)
+    assert person.lookups == 1
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_field_memoization_short_circuit(compiled):
+    spec = Specification.load_dsl("id == 1 || (age > 1 && age < 3)")
+    predicate = spec.compile() if compiled else spec.is_satisfied_by
+    person = Person(ValueError)
+    person.id = 1
+    assert predicate(person)
+    assert person.lookups == 0
+
+
+def test_context_per_object():
+    class ChildSpecification(Specification):
+        def __init__(self, specification):
+            self.specification = specification
+
+        def is_satisfied_by(self, obj: Any) -> bool:
+            return self.specification.is_satisfied_by(obj.child)
+
+        def to_collection(self) -> Collection:
+            return []
+
+    spec = ChildSpecification(Specification.load_dsl(AGE)) & EqualsSpecification(
+        "age", 30
+    )
+    person = Person(30, child=Person(40))
+    assert spec.is_satisfied_by(person)
+    assert person.lookups == 1
+    assert person.child.lookups == 1
+
+
+@pytest.mark.parametrize(
+    "dsl, shared",
+    [
+        ("age > 1 && id == 1", False),
+        ("age > 1 || (id == 1 && name == 'x')", False),
+        ("age > 1 && (id == 1 || age < 3)", True),
+        ("age > 1 && !(age > 3)", True),
+    ],
+)
+def test_context_only_for_shared_fields(dsl, shared):
+    values = []
+
+    class SpyingSpecification(Specification):
+        def is_satisfied_by(self, obj: Any) -> bool:
+            values.append(current_values(obj))
+            return True
+
+        def to_collection(self) -> Collection:
+            return []
+
+    spec = Specification.load_dsl(dsl) & SpyingSpecification()
+    person = Person(2)
+    person.id = 1
+    person.name = "x"
+    spec.is_satisfied_by(person)
+    assert spec._shares_fields() is shared
+    assert (values[0] is not None) is shared
+    assert not context._active
@@ -0,0 +1,281 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.dsl import DSLSyntaxError, dump_dsl, parse_dsl
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+from tests.fixtures.generators import random_serializable_specification
+
+VALID = [
+    "#",
+    "(#)",
+    "a == 1 && (#)",
+    "a==1",
+    "a\t==\x0c1",
+    "a\n==\n1",
+    "a . b == 1",
+    "a.b.c_1 == 1",
+    "_ == 1",
+    "in == 1",
+    "is == 1",
+    "True == 1",
+    "None == 1",
+    "a.in == 1",
+    "a != 1",
+    "a < 1",
+    "a <= 1",
+    "a > 1",
+    "a>=1",
+    "a == +1",
+    "a == -0",
+    "a == 01",
+    "a == -.5",
+    "a == 1.",
+    "a == 1e5",
+    "a == 1E-5",
+    "a == 1.e3",
+    "a == +.5e-3",
+    "a == 99999999999999999999999",
+    "a == True",
+    "a == False",
+    "a == None",
+    "a == True&&b == False",
+    "a == ''",
+    'a == ""',
+    "a == 'x'",
+    'a == "x\ny"',
+    r'a == "a\"b"',
+    r'a == "a\\"',
+    r'a == "a\"',
+    r'a == "\\\""',
+    "a in []",
+    "a in [1,]",
+    "a in[1, 'x', True, None, 1.5]",
+    "a is None",
+    "a is  None",
+    "a isNone",
+    "a contains None",
+    "a contains 'x'",
+    "a matches 'x'",
+    "a matches'x'/i",
+    "a matches 'x' / ms",
+    "!(a == 1)",
+    "! (a==1)",
+    "!(!(a==1))",
+    "!(a == 1 || b == 2 && !(c == 3 && d == 4 || e == 5))",
+    "((a == 1))",
+    "a == 1 &&b == 2",
+    "a == 1 && b == 2 && c == 3",
+    "a == 1 || b == 2 && c == 3 || d == 4",
+    "(a == 1) && (b == 2 || c == 3)",
+    "(a == 1 && b == 2) && c == 3",
+    "a == :x",
+    "a == :x && b != :x || c > $2",
+    "a in [$1, :b, 2]",
+    "a contains $1",
+    "a matches :pattern/i",
+]
+
+INVALID = [
+    "",
+    "   ",
+    "##",
+    "# #",
+    "a == 1 #",
+    "a == 1)",
+    "(a == 1",
+    "a == 1 &&",
+    "&& a == 1",
+    "a == 1 | b == 2",
+    "!a == 1",
+    "é == 1",
+    "1a == 1",
+    "a b == 1",
+    "a === 1",
+    "a < = 1",
+    "a ! = 1",
+    "a\v== 1",
+    "a == Truex",
+    "a == 1e",
+    "a == 1_000",
+    "a == 'it''s'",
+    'a == "x',
+    'a == "a" "b"',
+    "a in 1",
+    "a in [,]",
+    "a in [1 2]",
+    "a index [1]",
+    "a is Nonex",
+    "a is null",
+    "a containsx 'y'",
+    "a contains [1]",
+    "a matches 1",
+    "a matches 'x' /",
+    "a matches 'x'/ib",
+    "a == 'x'/i",
+    "Nonematches 'x'",
+    "a == :",
+    "a == : x",
+    "a == $",
+    "a == $0",
+    "a in :ids",
+    ":x == 1",
+]
+
+
+@pytest.mark.parametrize("dsl", VALID)
+def test_parse_dsl_like_lark(dsl):
+    lark_parser = pytest.importorskip("fractal_specifications.generic.dsl_parser")
+
+    specification = parse_dsl(dsl)
+    expected = lark_parser.parse_dsl(dsl)
+    assert specification == expected
+    assert str(specification) == str(expected)
+    assert type(getattr(specification, "value", None)) is type(
+        getattr(expected, "value", None)
+    )
+
+
+@pytest.mark.parametrize("dsl", INVALID)
+def test_parse_dsl_errors_like_lark(dsl):
+    lark = pytest.importorskip("lark")
+    from fractal_specifications.generic.dsl_parser import parse_dsl as lark_parse_dsl
+
+    with pytest.raises(DSLSyntaxError):
+        parse_dsl(dsl)
+    with pytest.raises(lark.exceptions.UnexpectedInput):
+        lark_parse_dsl(dsl)
+
+
+def test_parse_dsl():
+    assert parse_dsl("a == 1 || b == 2 && c is None") == AndSpecification(
+        [
+            OrSpecification([EqualsSpecification("a", 1), EqualsSpecification("b", 2)]),
+            IsNoneSpecification("c"),
+        ]
+    )
+    assert parse_dsl("in in ['x', 1.5,]") == InSpecification("in", ["x", 1.5])
+
+
+def test_parse_huge_dsl():
+    specification = parse_dsl(" && ".join(f"id != {i}" for i in range(10_000)))
+    assert len(specification.specifications) == 10_000
+    specification = parse_dsl(f"id in [{', '.join(map(str, range(100_000)))},]")
+    assert specification.value == list(range(100_000))
+
+    specification = parse_dsl("!(" * 10_000 + "(id == 1)" + ")" * 10_000)
+    for _ in range(10_000):
+        specification = specification.specification
+    assert specification == EqualsSpecification("id", 1)
+
+
+def test_dsl_syntax_error():
+    with pytest.raises(DSLSyntaxError) as e:
+        parse_dsl("a == 1 &&\n  b = 2")
+    assert (e.value.pos, e.value.line, e.value.column) == (14, 2, 5)
+    assert str(e.value) == "Expected an operator at line 2, column 5, found '='"
+    assert isinstance(e.value, ValueError)
+
+    with pytest.raises(DSLSyntaxError, match="found end of input"):
+        parse_dsl("a ==")
+
+
+def test_dsl_parser_is_selectable():
+    calls = []
+
+    def dsl_parser(dsl_string):
+        calls.append(dsl_string)
+        return parse_dsl(dsl_string)
+
+    cache = Specification.dsl_cache
+    try:
+        Specification.dsl_cache = None
+        Specification.dsl_parser = dsl_parser
+        assert Specification.load_dsl("a == 1") == EqualsSpecification("a", 1)
+        assert calls == ["a == 1"]
+    finally:
+        Specification.dsl_parser = None
+        Specification.dsl_cache = cache
+
+
+def test_dump_dsl_round_trip():
+    import random
+
+    rng = random.Random(42)
+    for _ in range(1_000):
+        specification = random_serializable_specification(rng)
+        assert parse_dsl(dump_dsl(specification)) == specification
+    assert dump_dsl(EqualsSpecification("id", 'it"s')) == "id == 'it\"s'"
+    assert dump_dsl(InSpecification("id", ("a", 1.5))) == 'id in ["a", 1.5]'
+
+
+@pytest.mark.parametrize(
+    "specification",
+    [
+        EqualsSpecification("id", 'it\'s "quoted"'),
+        EqualsSpecification("id", float("inf")),
+        EqualsSpecification("id", float("nan")),
+        EqualsSpecification("first-name", "John"),
+        InSpecification("id", "abc"),
+        RegexStringMatchSpecification("id", 1),
+        AndSpecification([]),
+    ],
+)
+def test_dump_dsl_unsupported(specification):
+    with pytest.raises(ValueError, match="can't be written in the DSL"):
+        specification.dump_dsl()
+
+
+def test_dump_dsl_values_without_syntax():
+    # Written by their repr, like before strings and numbers got their own rules
+    assert dump_dsl(EqualsSpecification("day", date(2024, 1, 2))) == (
+        "day == datetime.date(2024, 1, 2)"
+    )
+    assert dump_dsl(GreaterThanSpecification("price", Decimal("1.50"))) == (
+        "price > Decimal('1.50')"
+    )
+    uuid = UUID("12345678-1234-5678-1234-567812345678")
+    assert dump_dsl(InSpecification("id", [uuid, "a"])) == (
+        "id in [UUID('12345678-1234-5678-1234-567812345678'), \"a\"]"
+    )
+    assert dump_dsl(EqualsSpecification("id", [1, "a"])) == "id == [1, 'a']"
+
+
+def test_dump_dsl_deep_and_cached():
+    dsl = "!(" * 10_000 + "id == 1" + ")" * 10_000
+    specification = parse_dsl(dsl)
+    assert specification.dump_dsl() == dsl
+    assert specification.dump_dsl() is specification.dump_dsl()
+    assert AndSpecification([specification, EmptySpecification()]).dump_dsl() == (
+        f"({dsl} && #)"
+    )
+
+
+def test_dump_dsl_custom_specification():
+    from typing import Any, Collection
+
+    class Adult(Specification):
+        def is_satisfied_by(self, obj: Any) -> bool:
+            return obj.age >= 18
+
+        def to_collection(self) -> Collection:
+            return []
+
+        def dump_dsl(self):
+            return "age >= 18"
+
+    specification = AndSpecification([Adult(), IsNoneSpecification("deleted")])
+    assert dump_dsl(specification) == "(age >= 18 && deleted is None)"
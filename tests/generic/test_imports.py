@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[2]
+
+LOAD_DSL = (
+    "from fractal_specifications.generic.specification import Specification; "
+    "Specification.load_dsl(\"status == 'active' && id in [1, 2]\")"
+)
+
+
+def loaded_modules(code: str) -> set:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; exec(sys.argv[1]); print(*sys.modules)",
+            code,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "code, not_loaded",
+    [
+        (
+            "import fractal_specifications.generic.specification",
+            {
+                "json",
+                "hashlib",
+                "lark",
+                "fractal_specifications.generic.collections",
+                "fractal_specifications.generic.operators",
+                "fractal_specifications.generic.dsl",
+            },
+        ),
+        (LOAD_DSL, {"lark", "json", "hashlib"}),
+        ("import fractal_specifications.contrib.pandas.specifications", {"pandas"}),
+        ("import fractal_specifications.contrib.django.specifications", {"django"}),
+        ("import fractal_specifications.contrib.numpy.specifications", {"numpy"}),
+    ],
+)
+def test_lazy_imports(code, not_loaded):
+    assert not loaded_modules(code) & not_loaded
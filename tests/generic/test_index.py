@@ -0,0 +1,161 @@
+import random
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from fractal_specifications.generic.accessors import ItemAccessor
+from fractal_specifications.generic.collections import AndSpecification
+from fractal_specifications.generic.index import SpecificationIndex
+from fractal_specifications.generic.operators import (
+    ContainsSpecification,
+    EqualsSpecification,
+    GreaterThanEqualSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    LessThanEqualSpecification,
+    LessThanSpecification,
+    NotEqualsSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+from tests.fixtures.generators import random_specification
+
+
+@dataclass
+class Entity:
+    id: int
+    a: Any
+    b: Any
+    c: int
+    d: int
+
+
+def random_entity(rng, id):
+    return Entity(
+        id=id,
+        a=rng.randrange(10),
+        b=rng.choice(["x", "y", "z", None, ["x"]]),
+        c=rng.choice([rng.randrange(10), rng.random() * 10]),
+        d=rng.randrange(10),
+    )
+
+
+def random_entity_leaf(rng):
+    kind = rng.randrange(3)
+    if kind == 0:
+        cls = rng.choice(
+            [
+                EqualsSpecification,
+                NotEqualsSpecification,
+                LessThanSpecification,
+                LessThanEqualSpecification,
+                GreaterThanSpecification,
+                GreaterThanEqualSpecification,
+            ]
+        )
+        return cls(rng.choice("acd"), rng.randrange(-1, 11))
+    elif kind == 1:
+        field = rng.choice("ab")
+        if field == "b":
+            return rng.choice(
+                [
+                    EqualsSpecification("b", rng.choice(["x", "y", ["x"]])),
+                    NotEqualsSpecification("b", "x"),
+                    InSpecification("b", ["x", "z"]),
+                    IsNoneSpecification("b"),
+                    ContainsSpecification("b", "x"),
+                ]
+            )
+        return InSpecification(field, rng.sample(range(12), rng.randrange(4)))
+    return rng.choice(
+        [
+            EmptySpecification(),
+            EqualsSpecification("a", 1, pre_processor=lambda v: v + 1),
+        ]
+    )
+
+
+def test_index_matches_filter():
+    rng = random.Random(42)
+    entities = [random_entity(rng, i) for i in range(200)]
+    index = SpecificationIndex(
+        entities, hash_fields=["a", "b"], sorted_fields=["a", "c"], key="id"
+    )
+    for i in range(300):
+        if i % 3 == 0:
+            entity = rng.choice(entities)
+            entity.a, entity.c = rng.randrange(10), rng.randrange(10)
+            index.update(entity)
+            new = random_entity(rng, len(entities) + i)
+            index.insert(new)
+            entities.append(new)
+            index.delete(entities.pop(rng.randrange(len(entities))))
+        specification = random_specification(rng, random_entity_leaf, sizes=(0, 4))
+        expected = list(specification.filter(entities))
+        assert index.filter(specification) == expected
+        assert index.count(specification) == len(expected)
+    assert len(index) == len(entities)
+    assert list(index) == entities
+
+
+def test_index_lookups():
+    entities = [Entity(i, i % 10, str(i % 3), i, i) for i in range(1000)]
+    index = SpecificationIndex(entities, hash_fields=["a"], sorted_fields=["c"])
+    checked = []
+
+    def residual(value):
+        checked.append(value)
+        return value
+
+    specification = Specification.load_dsl("a == 3 && c < 100 && d == 13")
+    specification = AndSpecification(
+        [*specification.specifications[:2], EqualsSpecification("d", 13, residual)]
+    )
+    assert index.filter(specification) == [entities[13]]
+    assert sorted(checked) == [3, 13, 23, 33, 43, 53, 63, 73, 83, 93]
+
+
+def test_index_none_and_unindexed_values():
+    entities = [
+        Entity(1, None, ["x"], 1, 1),
+        Entity(2, 2, "y", "3", 1),
+        Entity(3, 3, {"x"}, 5, 1),
+    ]
+    index = SpecificationIndex(entities, hash_fields=["b"], sorted_fields=["a", "c"])
+    assert index.filter(Specification.load_dsl("a < 3")) == [entities[1]]
+    assert index.filter(Specification.load_dsl("a is None")) == [entities[0]]
+    assert index.filter(EqualsSpecification("b", ["x"])) == [entities[0]]
+    assert index.filter(Specification.load_dsl("b != 'y'")) == [
+        entities[0],
+        entities[2],
+    ]
+    assert index.filter(Specification.load_dsl("c == '3'")) == [entities[1]]
+    with pytest.raises(TypeError):
+        index.filter(Specification.load_dsl("c < 3"))
+    index.delete(entities[0])
+    index.delete(entities[1])
+    assert index.filter(Specification.load_dsl("a < 4")) == [entities[2]]
+    assert index.filter(InSpecification("b", [["x"]])) == []
+    index.insert(entity := Entity(4, None, "z", 2, 1))
+    assert index.filter(Specification.load_dsl("a is None")) == [entity]
+
+
+def test_index_items_with_key():
+    rows = [{"id": i, "tenant": {"id": i % 2}} for i in range(4)]
+    index = SpecificationIndex(
+        rows, hash_fields=["tenant.id"], key="id", accessor=ItemAccessor()
+    )
+    specification = EqualsSpecification("tenant.id", 1)
+    assert index.filter(specification) == [rows[1], rows[3]]
+
+    index.update({"id": 1, "tenant": {"id": 0}})
+    assert index.filter(specification) == [rows[3]]
+    assert {"id": 1} in index
+    with pytest.raises(ValueError, match="already in the index"):
+        index.insert({"id": 1, "tenant": {"id": 1}})
+    with pytest.raises(KeyError):
+        index.delete({"id": 5})
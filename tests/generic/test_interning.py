@@ -0,0 +1,102 @@
+from typing import Any, Collection
+
+import pytest
+
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.interning import SpecificationInterner
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    InSpecification,
+    NotSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+
+
+@pytest.fixture
+def interner():
+    interner = SpecificationInterner()
+    Specification.interner = interner
+    yield interner
+    Specification.interner = None
+
+
+def test_intern_shares_subtrees():
+    interner = SpecificationInterner()
+    a = interner.intern(
+        Specification.load_dsl("status == 'active' && tenant_id == 1 && !(x in [1])")
+    )
+    b = interner.intern(
+        Specification.load_dsl("status == 'active' && tenant_id == 2 && !(x in [1])")
+    )
+    assert a.specifications[0] is b.specifications[0]
+    assert a.specifications[1] is not b.specifications[1]
+    assert a.specifications[2] is b.specifications[2]
+    assert interner.intern(Specification.load_dsl(a.dump_dsl())) is a
+    assert interner.intern(a) is a
+    assert len(interner) == 7
+
+
+def test_intern_rebuilds_parents():
+    interner = SpecificationInterner()
+    eq = interner.intern(EqualsSpecification("id", 1))
+    spec = AndSpecification(
+        [EqualsSpecification("id", 1), NotSpecification(EqualsSpecification("id", 1))]
+    )
+    interned = interner.intern(spec)
+    assert interned == spec
+    assert interned is not spec
+    assert interned.specifications[0] is eq
+    assert interned.specifications[1].specification is eq
+    assert spec.specifications[0] is not eq
+    assert interner.intern(NotSpecification(eq)) is interned.specifications[1]
+
+
+def test_intern_keeps_values_apart():
+    interner = SpecificationInterner()
+    specs = [
+        EqualsSpecification("id", 1),
+        EqualsSpecification("id", 1.0),
+        EqualsSpecification("id", True),
+        EqualsSpecification("id", 1, lambda i: i),
+        RegexStringMatchSpecification("name", "a"),
+        RegexStringMatchSpecification("name", "a", flags="i"),
+        AndSpecification([EqualsSpecification("id", 1)]),
+        OrSpecification([EqualsSpecification("id", 1)]),
+    ]
+    assert len({id(interner.intern(s)) for s in specs}) == len(specs)
+    assert interner.intern(EmptySpecification()) is interner.intern(
+        EmptySpecification()
+    )
+
+
+def test_intern_skips_unhashable_and_custom():
+    class CustomSpecification(Specification):
+        def is_satisfied_by(self, obj: Any) -> bool:
+            return True
+
+        def to_collection(self) -> Collection:
+            return []
+
+    interner = SpecificationInterner()
+    unhashable = EqualsSpecification("id", {"a": 1})
+    custom = CustomSpecification()
+    assert interner.intern(unhashable) is unhashable
+    assert interner.intern(custom) is custom
+    spec = interner.intern(AndSpecification([custom, InSpecification("id", [1])]))
+    assert spec.specifications[0] is custom
+    assert len(interner) == 2
+    interner.clear()
+    assert len(interner) == 0
+
+
+def test_interner_load_dsl_from_dict_parse(interner):
+    spec = Specification.load_dsl("id == 1 && name == 'a'")
+    assert Specification.from_dict(spec.to_dict()) is spec
+    assert Specification.loads(spec.dumps()) is spec
+    assert Specification.parse(id=1, name="a") is spec
+    assert Specification.parse(id=1) is spec.specifications[0]
+    assert Specification.load_dsl("id == 1") is spec.specifications[0]
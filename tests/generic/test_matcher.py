@@ -0,0 +1,250 @@
+import math
+import random
+from dataclasses import dataclass
+from datetime import date
+
+import pytest
+
+from fractal_specifications.generic.accessors import ItemAccessor
+from fractal_specifications.generic.matcher import SpecificationMatcher
+from fractal_specifications.generic.operators import (
+    ContainsSpecification,
+    EqualsSpecification,
+    GreaterThanEqualSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    LessThanEqualSpecification,
+    LessThanSpecification,
+    NotEqualsSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+from tests.fixtures.generators import random_specification
+
+
+@dataclass
+class Event:
+    a: int
+    b: str
+    c: float
+    d: str
+
+
+def random_event(rng):
+    return Event(
+        a=rng.randrange(10),
+        b=rng.choice(["x", "y", "z"]),
+        c=rng.choice([rng.randrange(10), rng.random() * 10]),
+        d=rng.choice(["apple", "banana", "cherry", "date"]),
+    )
+
+
+def random_event_leaf(rng):
+    kind = rng.randrange(3)
+    if kind == 0:
+        cls = rng.choice(
+            [
+                EqualsSpecification,
+                LessThanSpecification,
+                LessThanEqualSpecification,
+                GreaterThanSpecification,
+                GreaterThanEqualSpecification,
+            ]
+        )
+        field = rng.choice("acd")
+        if field == "d":
+            return cls("d", rng.choice(["apple", "b", "banana", "coconut", "z"]))
+        return cls(field, rng.choice([rng.randrange(-1, 11), rng.random() * 10]))
+    elif kind == 1:
+        return rng.choice(
+            [
+                InSpecification("a", rng.sample(range(12), rng.randrange(4))),
+                InSpecification("b", ["x", "z"]),
+                IsNoneSpecification("b"),
+                NotEqualsSpecification("b", "x"),
+                ContainsSpecification("d", "an"),
+                EqualsSpecification("a", 1, pre_processor=lambda v: v + 1),
+            ]
+        )
+    return EmptySpecification()
+
+
+def random_event_specification(rng):
+    return random_specification(rng, random_event_leaf, sizes=(0, 4))
+
+
+class SmallMatcher(SpecificationMatcher):
+    max_conjunctions = 4
+
+
+@pytest.mark.parametrize("matcher_class", [SpecificationMatcher, SmallMatcher])
+def test_match(matcher_class):
+    rng = random.Random(42)
+    specifications = {i: random_event_specification(rng) for i in range(500)}
+    matcher = matcher_class(specifications)
+    for i in range(0, 500, 5):
+        matcher.remove(i)
+        del specifications[i]
+    for i in range(500, 600):
+        specifications[i] = random_event_specification(rng)
+        matcher.add(i, specifications[i])
+    assert len(matcher) == len(specifications)
+
+    for _ in range(200):
+        event = random_event(rng)
+        expected = {
+            key
+            for key, specification in specifications.items()
+            if specification.is_satisfied_by(event)
+        }
+        assert matcher.match(event) == expected
+
+
+def test_match_ranges():
+    rng = random.Random(42)
+    specifications = {}
+    for i in range(1000):
+        a, b = sorted(rng.randrange(100) for _ in range(2))
+        specifications[i] = rng.choice(
+            [
+                GreaterThanSpecification("a", a) & LessThanSpecification("a", b),
+                GreaterThanEqualSpecification("a", a)
+                & LessThanEqualSpecification("a", b)
+                & LessThanSpecification("a", b + 1),
+                GreaterThanSpecification("a", a),
+                LessThanEqualSpecification("a", b),
+                GreaterThanSpecification("a", b) & LessThanSpecification("a", a),
+            ]
+        )
+    matcher = SpecificationMatcher(specifications)
+    for value in [-1, 0, 0.5, *range(1, 100), 99.5, 100]:
+        event = Event(value, "x", 0, "")
+        expected = {
+            key
+            for key, specification in specifications.items()
+            if specification.is_satisfied_by(event)
+        }
+        assert matcher.match(event) == expected
+
+
+def test_match_counts_relevant_predicates():
+    checked = []
+
+    def residual(value):
+        checked.append(value)
+        return value
+
+    matcher = SpecificationMatcher(
+        {
+            i: Specification.load_dsl(f"a == {i} && c > 5")
+            & EqualsSpecification("b", "x", residual)
+            for i in range(1000)
+        }
+    )
+    assert matcher.match(Event(42, "x", 6, "")) == {42}
+    assert checked == ["x"]
+    assert matcher.match(Event(42, "x", 5, "")) == set()
+    assert checked == ["x"]
+
+
+def test_match_incomparable_and_missing_values():
+    matcher = SpecificationMatcher(
+        {
+            "number": Specification.load_dsl("a > 1"),
+            "string": Specification.load_dsl("a > 'b'"),
+            "date": GreaterThanSpecification("a", date(2024, 1, 1)),
+            "none": Specification.load_dsl("a is None"),
+            "nested": Specification.load_dsl("user.age >= 18"),
+        },
+        accessor=ItemAccessor(),
+    )
+    assert matcher.match({"a": 2}) == {"number"}
+    assert matcher.match({"a": "c"}) == {"string"}
+    assert matcher.match({"a": date(2024, 2, 1)}) == {"date"}
+    assert matcher.match({"a": None}) == {"none"}
+    assert matcher.match({"a": [1]}) == set()
+    assert matcher.match({"user": {"age": 18}}) == {"nested"}
+    assert matcher.match({}) == set()
+
+    matcher = SpecificationMatcher(
+        {"both": Specification.load_dsl("b == 'x' && a > 1 && a <= 3")},
+        accessor=ItemAccessor(),
+    )
+    assert matcher.match({"b": "x", "a": 2}) == {"both"}
+    assert matcher.match({"b": "x", "a": 1}) == set()
+    assert matcher.match({"b": "x", "a": 4}) == set()
+    assert matcher.match({"b": "x", "a": "c"}) == set()
+    assert matcher.match({"b": "x"}) == set()
+
+
+def test_match_unindexed_values():
+    matcher = SpecificationMatcher(
+        {
+            "list": EqualsSpecification("a", [1]),
+            "str": LessThanSpecification("a", "2", pre_processor=str),
+        }
+    )
+    assert matcher.match(Event([1], "x", 0, "")) == {"list"}
+    assert matcher.match(Event(-1, "x", 0, "")) == {"str"}
+
+    # Checked like is_satisfied_by does
+    matcher = SpecificationMatcher({"nan": GreaterThanSpecification("a", math.nan)})
+    assert matcher.match(Event(1, "x", 0, "")) == set()
+    assert matcher.match(Event(None, "x", 0, "")) == set()
+
+
+def test_match_failing_residual_predicates():
+    matcher = SpecificationMatcher(
+        {
+            "contains": Specification.load_dsl("b == 'x' && d contains 'an'"),
+            "not": Specification.load_dsl("b == 'x' && !(c > 5)"),
+            "nested": Specification.load_dsl("b == 'x' && user.age != 18"),
+            "plain": Specification.load_dsl("b == 'x'"),
+        },
+        accessor=ItemAccessor(),
+    )
+    assert matcher.match({"b": "x", "c": 1, "d": "banana", "user": {"age": 1}}) == {
+        "contains",
+        "not",
+        "nested",
+        "plain",
+    }
+    assert matcher.match({"b": "x", "c": None, "d": None, "user": {}}) == {"plain"}
+    assert matcher.match({"b": "x", "c": "6", "d": 1}) == {"plain"}
+    assert matcher.match({"b": "x"}) == {"plain"}
+
+
+def test_add_too_many_conjunctions():
+    matcher = SmallMatcher()
+    specification = Specification.load_dsl(
+        "b == 'y' || ((a == 1 || a == 2 || a == 3) && (c == 1 || c == 2))"
+    )
+    matcher.add(1, specification)
+    assert matcher.match(Event(2, "x", 2, "")) == {1}
+    assert matcher.match(Event(2, "x", 3, "")) == set()
+
+    matcher.add(2, specification & EqualsSpecification("d", "z"))
+    matcher.add(
+        3,
+        Specification.load_dsl(
+            "a in [5, 6] || " + " || ".join(f"a == {i}" for i in range(5))
+        ),
+    )
+    assert matcher.match(Event(2, "x", 2, "z")) == {1, 2, 3}
+    assert matcher.match(Event(6, "x", 3, "z")) == {3}
+
+
+def test_add_and_remove():
+    matcher = SpecificationMatcher()
+    matcher.add("adults", Specification.load_dsl("age >= 18"))
+    assert "adults" in matcher
+    with pytest.raises(ValueError, match="already added"):
+        matcher.add("adults", Specification.load_dsl("age >= 21"))
+    matcher.remove("adults")
+    assert "adults" not in matcher
+    assert matcher.match(Event(1, "x", 0, "")) == set()
+    with pytest.raises(KeyError):
+        matcher.remove("adults")
@@ -1,6 +1,10 @@
+import re
 from dataclasses import make_dataclass
 from typing import List
 
+import pytest
+
+from fractal_specifications.generic.cache import BoundedCache, CacheInfo
 from fractal_specifications.generic.operators import (
     ContainsSpecification,
     EqualsSpecification,
@@ -50,6 +54,52 @@ def test_in_specification():
     assert spec.is_satisfied_by(DC(id=1))
 
 
+def test_in_specification_large():
+    spec = InSpecification("id", list(range(50_000)))
+    DC = make_dataclass("DC", [("id", int)])
+    assert spec.is_satisfied_by(DC(id=49_999))
+    assert not spec.is_satisfied_by(DC(id=50_000))
+    assert spec.compile()(DC(id=49_999))
+
+
+def test_in_specification_unhashable_values():
+    spec = InSpecification("id", [1, [2], {"a": 3}, *range(10, 20)])
+    DC = make_dataclass("DC", [("id", object)])
+    for value, expected in [(1, True), ([2], True), ({"a": 3}, True), (2, False)]:
+        assert spec.is_satisfied_by(DC(id=value)) is expected
+        assert spec.compile()(DC(id=value)) is expected
+
+
+def test_in_specification_unhashable_object_value():
+    spec = InSpecification("id", list(range(20)))
+    DC = make_dataclass("DC", [("id", object)])
+    assert not spec.is_satisfied_by(DC(id=[1]))
+    assert InSpecification("id", [[1], *range(20)]).is_satisfied_by(DC(id=[1]))
+
+
+def test_in_specification_string_value():
+    spec = InSpecification("id", "abc")
+    DC = make_dataclass("DC", [("id", str)])
+    assert spec.is_satisfied_by(DC(id="ab"))
+
+
+def test_in_specification_keeps_values():
+    spec = InSpecification("id", [3, 1, 2, 1])
+    assert spec.value == [3, 1, 2, 1]
+    assert spec.to_dict() == {"op": "in", "field": "id", "value": [3, 1, 2, 1]}
+    assert spec.dump_dsl() == "id in [3, 1, 2, 1]"
+
+
+def test_in_specification_copies_values():
+    DC = make_dataclass("DC", [("id", int)])
+    for values in [[1, 2], list(range(20)), {1, 2}, set(range(20))]:
+        spec = InSpecification("id", values)
+        values.clear()
+        assert 1 in spec.value
+        assert spec.is_satisfied_by(DC(id=1))
+        assert spec.compile()(DC(id=1))
+
+
 def test_equals_specification():
     spec = EqualsSpecification("id", 1)
     DC = make_dataclass("DC", [("id", int)])
@@ -131,6 +181,53 @@ def test_regex_string_match_specification():
     assert spec.is_satisfied_by(DC(name="fractal"))
 
 
+def test_regex_string_match_specification_compiles_once():
+    spec = RegexStringMatchSpecification("name", "^f.*l$")
+    DC = make_dataclass("DC", [("name", str)])
+    assert spec.is_satisfied_by(DC(name="fractal"))
+    pattern = spec.pattern
+    assert not spec.is_satisfied_by(DC(name="fractals"))
+    assert spec.pattern is pattern
+
+
+def test_regex_string_match_specification_flags():
+    spec = RegexStringMatchSpecification("name", "^F.*L$", flags="i")
+    DC = make_dataclass("DC", [("name", str)])
+    assert spec.is_satisfied_by(DC(name="fractal"))
+    assert spec.compile()(DC(name="fractal"))
+    assert spec.flags == "i"
+    assert RegexStringMatchSpecification("name", "a", flags=re.I | re.M).flags == "im"
+    assert spec != RegexStringMatchSpecification("name", "^F.*L$")
+    assert hash(spec) != hash(RegexStringMatchSpecification("name", "^F.*L$"))
+    assert RegexStringMatchSpecification("name", "a", flags=re.I | re.U).flags == "i"
+    with pytest.raises(ValueError):
+        RegexStringMatchSpecification("name", "a", flags="q")
+    with pytest.raises(ValueError):
+        RegexStringMatchSpecification("name", "a", flags=re.I | re.L)
+    with pytest.raises(ValueError):
+        RegexStringMatchSpecification("name", "a", flags=1 << 20)
+
+
+def test_regex_string_match_specification_invalid_pattern_is_lazy():
+    spec = RegexStringMatchSpecification("name", "(unclosed")
+    with pytest.raises(re.error):
+        spec.is_satisfied_by(make_dataclass("DC", [("name", str)])(name="a"))
+
+
+def test_regex_string_match_specification_pattern_cache():
+    cache = BoundedCache(maxsize=2)
+    RegexStringMatchSpecification.pattern_cache = cache
+    try:
+        specs = [RegexStringMatchSpecification("name", p) for p in "abac"]
+        assert [s.pattern.pattern for s in specs] == ["a", "b", "a", "c"]
+        assert specs[0].pattern is specs[2].pattern
+        assert cache.info() == CacheInfo(
+            hits=1, misses=3, evictions=1, maxsize=2, currsize=2
+        )
+    finally:
+        RegexStringMatchSpecification.pattern_cache = None
+
+
 def test_is_none_specification():
     spec = IsNoneSpecification("name")
     DC = make_dataclass("DC", [("name", str)])
@@ -143,6 +143,8 @@ def test_random_dsl_strings():
         'field matches "\\"',
         'field matches "\\"',
         "field matches '\\'",
+        "field matches 'a.*'/i",
+        "field matches 'a.*' / ms && id == 1",
         r"field matches '\..*'",
         (
             r"((id == 1 && price > 25 && price >= 25 && price < 25 && "
@@ -176,3 +178,117 @@ def test_random_dsl_strings():
     ]:
         spec = Specification.load_dsl(s)
         assert spec == Specification.load_dsl(spec.dump_dsl())
+
+
+def test_regex_flags_serialization():
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    spec = RegexStringMatchSpecification("name", "^jo", flags="i")
+    assert spec.to_dict() == {
+        "op": "matches",
+        "field": "name",
+        "value": "^jo",
+        "flags": "i",
+    }
+    assert Specification.loads(spec.dumps()) == spec
+    assert spec.dump_dsl() == 'name matches "^jo"/i'
+    assert Specification.load_dsl('name matches "^jo"/i') == spec
+
+
+def test_nodes_are_slotted(complex_specification):
+    from fractal_specifications.generic.operators import FieldValueSpecification
+
+    def nodes(spec):
+        yield spec
+        for child in getattr(
+            spec, "specifications", [getattr(spec, "specification", None)]
+        ):
+            if child is not None:
+                yield from nodes(child)
+
+    for node in nodes(complex_specification):
+        assert not hasattr(node, "__dict__"), type(node)
+    assert not hasattr(Specification.load_dsl("#"), "__dict__")
+    assert not hasattr(Specification.load_dsl("a matches 'b'"), "__dict__")
+    assert FieldValueSpecification.__slots__ == ("field", "value", "pre_processor")
+
+
+def test_to_dict_subclass_attributes():
+    from fractal_specifications.generic.operators import FieldValueSpecification
+
+    class RangeSpecification(FieldValueSpecification):
+        __slots__ = "upper"
+
+    class BetweenSpecification(RangeSpecification):
+        def __init__(self, field, value, upper, inclusive=True):
+            super().__init__(field, value)
+            self.upper = upper
+            self.inclusive = inclusive
+            self._private = 1
+
+    spec = BetweenSpecification("price", 1, 5)
+    assert spec.to_dict() == {
+        "op": "between",
+        "field": "price",
+        "value": 1,
+        "upper": 5,
+        "inclusive": True,
+    }
+
+
+def test_pickle_and_copy(complex_specification):
+    import copy
+    import pickle
+
+    from fractal_specifications.generic.operators import RegexStringMatchSpecification
+
+    regex = RegexStringMatchSpecification("name", "^jo", flags="i")
+    assert regex.pattern
+    for spec in (complex_specification, regex):
+        hash(spec)
+        spec.dump_dsl()
+        spec.count([])
+        assert not hasattr(pickle.loads(pickle.dumps(spec)), "_hash")
+        assert not hasattr(pickle.loads(pickle.dumps(spec)), "_dsl")
+        assert not hasattr(pickle.loads(pickle.dumps(spec)), "_predicate")
+        assert pickle.loads(pickle.dumps(spec)) == spec
+        assert copy.deepcopy(spec) == spec
+        assert copy.copy(spec) == spec
+
+
+def test_dsl_parser_is_built_once():
+    from concurrent.futures import ThreadPoolExecutor
+
+    dsl_parser = pytest.importorskip("fractal_specifications.generic.dsl_parser")
+
+    dsl_parser._parser = None
+    with ThreadPoolExecutor(8) as executor:
+        parsers = set(executor.map(lambda _: id(dsl_parser.get_parser()), range(32)))
+    assert parsers == {id(dsl_parser.get_parser())}
+
+
+def test_dsl_cache():
+    from fractal_specifications.generic.cache import BoundedCache
+    from fractal_specifications.generic.dsl import DSLSyntaxError
+
+    cache = Specification.dsl_cache
+    try:
+        Specification.dsl_cache = BoundedCache(maxsize=2)
+        spec = Specification.load_dsl("id == 1")
+        assert Specification.load_dsl("id == 1") is spec
+        Specification.load_dsl("id == 2")
+        Specification.load_dsl("id == 3")
+        info = Specification.dsl_cache.info()
+        assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 3, 1, 2)
+        assert Specification.load_dsl("id == 1") is not spec
+        with pytest.raises(DSLSyntaxError):
+            Specification.load_dsl("id ==")
+        assert "id ==" not in Specification.dsl_cache
+
+        Specification.dsl_cache = None
+        assert Specification.load_dsl("id == 1") == spec
+        assert Specification.load_dsl("id == 1") is not Specification.load_dsl(
+            "id == 1"
+        )
+    finally:
+        Specification.dsl_cache = cache
@@ -0,0 +1,151 @@
+import random
+from dataclasses import make_dataclass
+
+import pytest
+
+from fractal_specifications.contrib.mongo.specifications import (
+    MongoSpecificationBuilder,
+)
+from fractal_specifications.contrib.postgresql.specifications import (
+    PostgresSpecificationBuilder,
+)
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    GreaterThanEqualSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    LessThanEqualSpecification,
+    LessThanSpecification,
+    NotEqualsSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+from tests.fixtures.generators import random_specification
+
+
+@pytest.mark.parametrize(
+    "dsl, expected",
+    [
+        ("((a == 1 && b == 2) && c == 3)", "(a == 1 && b == 2 && c == 3)"),
+        ("(a == 1 || (b == 2 || c == 3))", "(a == 1 || b == 2 || c == 3)"),
+        ("a == 1 && a == 1 && b == 2", "(a == 1 && b == 2)"),
+        ("# && a == 1 && #", "a == 1"),
+        ("# && #", "#"),
+        ("a == 1 || #", "#"),
+        ("x > 3 && x > 5", "x > 5"),
+        ("x > 5 && x >= 5", "x > 5"),
+        ("x < 3 && x <= 3 && x < 8", "x < 3"),
+        ("x >= 3 && x < 8 && x > 1 && x <= 9", "(x >= 3 && x < 8)"),
+        ("x >= 3 && x <= 3", "x == 3"),
+        ("x == 2 && x > 1 && x < 8", "x == 2"),
+        ("x in [1, 2, 3, 4] && x > 2 && x in [3, 4, 5]", "x in [3, 4]"),
+        ("x > 5 && x < 3", "(x > 5 && x < 3)"),
+        ("x > 3 && x <= 3", "(x > 3 && x <= 3)"),
+        ("x == 1 && x == 2", "(x == 1 && x == 2)"),
+        ("x == 2 && y == 1 && x > 3", "(x == 2 && x > 3)"),
+        ("x in [1, 2] && x in [3]", "(x in [1, 2] && x in [3])"),
+        ("(x > 5 && x < 3) || y == 1", "y == 1"),
+        ("(x > 5 && x < 3) || (x == 1 && x == 2)", "(x > 5 && x < 3)"),
+        ("x == 1 || x == 2 || y == 3 || x in [2, 4]", "(x in [1, 2, 4] || y == 3)"),
+        ("x == 1 || y == 2", "(x == 1 || y == 2)"),
+        ("!(a == 1)", "a != 1"),
+        ("!(a != 1)", "a == 1"),
+        ("!(!(a == 1 && b < 2))", "(a == 1 && b < 2)"),
+        ("!(a == 1 && (b != 2 || c < 3))", "(a != 1 || (b == 2 && !(c < 3)))"),
+        ("!(a == 1 || b == 2)", "(a != 1 && b != 2)"),
+        ("!(a is None)", "!(a is None)"),
+        ("x > 1 && x > 'a'", '(x > 1 && x > "a")'),
+        ("x == None && x > 1", "(x == None && x > 1)"),
+    ],
+)
+def test_simplify(dsl, expected):
+    assert Specification.load_dsl(dsl).simplify() == Specification.load_dsl(expected)
+
+
+def test_simplify_keeps_pre_processors_apart():
+    lower = EqualsSpecification("name", "a", lambda i: i.lower())
+    spec = AndSpecification([EqualsSpecification("name", "a"), lower])
+    assert spec.simplify().specifications[1] is lower
+    spec = OrSpecification([EqualsSpecification("name", "a"), lower])
+    assert isinstance(spec.simplify(), OrSpecification)
+
+
+def test_simplify_unhashable_values():
+    spec = AndSpecification(
+        [EqualsSpecification("x", [1]), EqualsSpecification("x", [1])]
+    )
+    assert spec.simplify() == EqualsSpecification("x", [1])
+    spec = OrSpecification(
+        [EqualsSpecification("x", {"a": 1}), InSpecification("x", [{"a": 1}])]
+    )
+    assert spec.simplify() == InSpecification("x", [{"a": 1}, {"a": 1}])
+
+
+def test_simplify_does_not_mutate():
+    spec = Specification.load_dsl("(a == 1 && (b == 2 && b == 2)) || a == 3")
+    copy = Specification.load_dsl(spec.dump_dsl())
+    spec.simplify()
+    assert spec == copy
+    assert spec.dump_dsl() == copy.dump_dsl()
+
+
+def test_simplify_leaves_and_empty_collections():
+    assert EmptySpecification().simplify() == EmptySpecification()
+    assert IsNoneSpecification("x").simplify() == IsNoneSpecification("x")
+    assert AndSpecification([]).simplify() == EmptySpecification()
+    assert OrSpecification([]).simplify() == OrSpecification([])
+
+
+def _random_leaf(rng: random.Random) -> Specification:
+    if rng.random() < 0.1:
+        return EmptySpecification()
+    field = rng.choice(["x", "y"])
+    leaf = rng.choice(
+        [
+            EqualsSpecification,
+            NotEqualsSpecification,
+            LessThanSpecification,
+            LessThanEqualSpecification,
+            GreaterThanSpecification,
+            GreaterThanEqualSpecification,
+            InSpecification,
+        ]
+    )
+    if leaf is InSpecification:
+        return InSpecification(field, rng.sample(range(6), rng.randint(0, 3)))
+    return leaf(field, rng.randint(0, 5))
+
+
+def test_simplify_equivalence():
+    rng = random.Random(42)
+    DC = make_dataclass("DC", [("x", int), ("y", int)])
+    objects = [DC(x, y) for x in range(-1, 7) for y in range(-1, 7)]
+    for _ in range(500):
+        spec = random_specification(rng, _random_leaf)
+        simplified = spec.simplify()
+        for obj in objects:
+            assert simplified.is_satisfied_by(obj) == spec.is_satisfied_by(obj), (
+                spec,
+                simplified,
+                obj,
+            )
+
+
+def test_simplify_builders():
+    spec = Specification.load_dsl(
+        "(id == 1 && price > 25 && price >= 30) || (id != 1 && !(id == 2)) || id == 7"
+    ).simplify()
+    assert PostgresSpecificationBuilder.build(spec) == (
+        "((id = %s) AND (price >= %s)) OR ((id != %s) AND (id != %s)) OR (id = %s)",
+        [1, 30, 1, 2, 7],
+    )
+    assert MongoSpecificationBuilder.build(spec)
+    spec = Specification.load_dsl("!(a == 1 || b == 2) && (x > 5 && x < 3 || y == 1)")
+    assert PostgresSpecificationBuilder.build(spec.simplify()) == (
+        "(a != %s) AND (b != %s) AND (y = %s)",
+        [1, 2, 1],
+    )
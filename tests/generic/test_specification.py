@@ -1,19 +1,26 @@
-from dataclasses import make_dataclass
+import copy
+from dataclasses import dataclass, make_dataclass
+from typing import Tuple
+
+import pytest
 
 from fractal_specifications.generic.collections import AndSpecification, OrSpecification
 from fractal_specifications.generic.operators import (
     ContainsSpecification,
     EqualsSpecification,
+    FieldValueSpecification,
     GreaterThanEqualSpecification,
     GreaterThanSpecification,
     InSpecification,
     LessThanEqualSpecification,
     LessThanSpecification,
+    NotSpecification,
     RegexStringMatchSpecification,
 )
 from fractal_specifications.generic.specification import (
     EmptySpecification,
     Specification,
+    all_specifications,
 )
 
 
@@ -116,3 +123,288 @@ def test_hash(equals_specification, complex_specification):
     assert test_dict[complex_specification]
     assert test_dict[equals_specification & complex_specification]
     assert test_dict[equals_specification | complex_specification]
+
+
+def test_filter():
+    DC = make_dataclass("DC", [("id", int)])
+    objs = [DC(id=i) for i in range(10)]
+    spec = GreaterThanSpecification("id", 6)
+    result = spec.filter(objs)
+    assert not isinstance(result, list)
+    assert list(result) == [DC(id=7), DC(id=8), DC(id=9)]
+
+
+def test_count():
+    DC = make_dataclass("DC", [("id", int)])
+    objs = [DC(id=i) for i in range(10)]
+    assert GreaterThanSpecification("id", 6).count(objs) == 3
+    assert GreaterThanSpecification("id", 9).count(objs) == 0
+
+
+def test_exists():
+    DC = make_dataclass("DC", [("id", int)])
+    objs = (DC(id=i) for i in range(10))
+    assert EqualsSpecification("id", 2).exists(objs)
+    assert next(objs) == DC(id=3)
+    assert not EqualsSpecification("id", 2).exists([DC(id=1)])
+
+
+def test_first():
+    DC = make_dataclass("DC", [("id", int)])
+    objs = (DC(id=i) for i in range(10))
+    assert GreaterThanSpecification("id", 2).first(objs) == [DC(id=3)]
+    assert GreaterThanSpecification("id", 2).first(objs, 2) == [DC(id=4), DC(id=5)]
+    assert GreaterThanSpecification("id", 20).first(objs, 2) == []
+
+
+def test_compiled_predicate_is_cached():
+    from fractal_specifications.generic.accessors import ItemAccessor
+
+    DC = make_dataclass("DC", [("id", int)])
+    spec = GreaterThanSpecification("id", 6) & EqualsSpecification("id", 8)
+    assert spec.count([DC(id=i) for i in range(10)]) == 1
+    predicate = spec._predicate
+    assert spec.exists([DC(id=8)])
+    assert spec.first([DC(id=8)]) == [DC(id=8)]
+    assert spec._predicate is predicate
+    assert spec.count([{"id": 8}], ItemAccessor()) == 1
+    assert spec._predicate is predicate
+
+
+def test_specifications_are_immutable(complex_specification):
+    import copy
+
+    import pytest
+
+    spec = EqualsSpecification("id", 1)
+    with pytest.raises(AttributeError):
+        spec.value = 2
+    with pytest.raises(AttributeError):
+        del spec.field
+    with pytest.raises(AttributeError):
+        complex_specification.specifications = []
+    with pytest.raises(AttributeError):
+        Specification.Not(spec).specification = spec
+    assert spec.value == 1
+    assert isinstance(complex_specification.specifications, tuple)
+
+    class TaggedSpecification(EqualsSpecification):
+        pass
+
+    spec = TaggedSpecification("id", 1)
+    spec.tag = "a"
+    assert copy.copy(spec).tag == "a"
+    del spec.tag
+    with pytest.raises(AttributeError):
+        spec.value = 2
+    assert isinstance(complex_specification.to_collection(), list)
+
+
+def test_custom_specifications_assign_in_init():
+    class BetweenSpecification(FieldValueSpecification):
+        def __init__(self, field, lower, upper):
+            self.field = field
+            self.value = (lower, upper)
+            self.pre_processor = abs
+
+        def is_satisfied_by(self, obj) -> bool:
+            lower, upper = self.value
+            return lower <= self.pre_processor(getattr(obj, self.field)) <= upper
+
+    class OpenBetweenSpecification(BetweenSpecification):
+        def __init__(self, field, lower, upper):
+            super().__init__(field, lower, upper)
+            self.value = (lower + 1, upper - 1)
+
+    class NotZeroSpecification(NotSpecification):
+        def __init__(self, field):
+            self.specification = EqualsSpecification(field, 0)
+
+    class AllSpecification(AndSpecification):
+        def __init__(self, *specifications):
+            self.specifications = tuple(specifications)
+
+    DC = make_dataclass("DC", [("id", int)])
+    assert BetweenSpecification("id", 1, 5).is_satisfied_by(DC(id=-5))
+    assert not OpenBetweenSpecification("id", 1, 5).is_satisfied_by(DC(id=5))
+    assert NotZeroSpecification("id").is_satisfied_by(DC(id=1))
+    assert AllSpecification(NotZeroSpecification("id")).is_satisfied_by(DC(id=1))
+    for spec in (
+        BetweenSpecification("id", 1, 5),
+        OpenBetweenSpecification("id", 1, 5),
+    ):
+        with pytest.raises(AttributeError):
+            spec.field = "other"
+        with pytest.raises(AttributeError):
+            del spec.value
+    with pytest.raises(AttributeError):
+        NotZeroSpecification("id").specification = None
+    with pytest.raises(AttributeError):
+        AllSpecification().specifications = ()
+
+
+def test_dataclass_specifications():
+    @dataclass(eq=False)
+    class BetweenSpecification(FieldValueSpecification):
+        field: str
+        value: Tuple[int, int]
+        label: str = ""
+
+        def is_satisfied_by(self, obj) -> bool:
+            lower, upper = self.value
+            return lower <= getattr(obj, self.field) <= upper
+
+    @dataclass(eq=False)
+    class LabeledBetweenSpecification(BetweenSpecification):
+        def __post_init__(self):
+            self.label = self.label or self.field
+
+    DC = make_dataclass("DC", [("id", int)])
+    spec = BetweenSpecification("id", (1, 5))
+    assert spec.is_satisfied_by(DC(id=3))
+    assert spec == BetweenSpecification("id", (1, 5))
+    assert hash(spec) == hash(BetweenSpecification("id", (1, 5)))
+    with pytest.raises(AttributeError):
+        spec.field = "other"
+    with pytest.raises(AttributeError):
+        spec.value = (1, 2)
+    spec.label = "between"  # Not part of the package's structure
+    assert copy.copy(spec).label == "between"
+
+    spec = LabeledBetweenSpecification("id", (1, 5))
+    assert spec.label == "id"
+    with pytest.raises(AttributeError):
+        spec.value = (1, 2)
+
+
+def test_frozen_attributes_per_class():
+    assert {"field", "value", "pre_processor"} <= FieldValueSpecification._frozen
+    assert {"flags", "_pattern"} <= RegexStringMatchSpecification._frozen
+    assert "specification" not in FieldValueSpecification._frozen
+    assert "field" not in NotSpecification._frozen
+
+    class ScopedSpecification(EqualsSpecification):
+        def __init__(self, field, value, specification):
+            super().__init__(field, value)
+            self.specification = specification
+
+    spec = ScopedSpecification("id", 1, None)
+    spec.specification = EqualsSpecification("id", 2)
+    with pytest.raises(AttributeError):
+        spec.field = "other"
+
+
+def test_hash_is_cached():
+    spec = AndSpecification(
+        [EqualsSpecification("id", 1), InSpecification("id", {"a", "b"})]
+    )
+    assert hash(spec) == hash(spec)
+    assert spec._hash == hash(spec)
+    assert hash(InSpecification("id", {"a", "b"})) == hash(
+        InSpecification("id", {"b", "a"})
+    )
+    assert hash(Specification.Not(spec)) != hash(spec)
+
+
+def test_equality_short_circuits():
+    class Value:
+        compared = 0
+
+        def __eq__(self, other):
+            Value.compared += 1
+            return True
+
+        def __hash__(self):
+            return 0
+
+    a = AndSpecification([EqualsSpecification("id", Value())])
+    b = AndSpecification([EqualsSpecification("id", Value())])
+    assert a == a
+    assert Value.compared == 0
+    assert a == b
+    assert Value.compared == 1
+    c = AndSpecification([EqualsSpecification("other", Value())])
+    assert a != c
+    assert Value.compared == 1
+    assert EqualsSpecification("id", [1]) == EqualsSpecification("id", [1])
+    assert AndSpecification([EqualsSpecification("id", [1])]) == AndSpecification(
+        [EqualsSpecification("id", [1])]
+    )
+    assert AndSpecification([]) != OrSpecification([])
+
+
+def test_fingerprint():
+    import os
+    import subprocess
+    import sys
+
+    dsl = "(id == 1 && name in ['a', 'b']) || !(price >= 2.5) || tags contains 'x'"
+    spec = Specification.load_dsl(dsl)
+    assert spec.fingerprint() == Specification.load_dsl(dsl).fingerprint()
+    assert len(spec.fingerprint()) == 32
+    script = (
+        "from fractal_specifications.generic.specification import Specification;"
+        f"print(Specification.load_dsl({dsl!r}).fingerprint())"
+    )
+    for seed in ("1", "2"):
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            check=True,
+        ).stdout.strip()
+        assert output == spec.fingerprint()
+
+
+def test_fingerprint_keeps_types_apart():
+    from datetime import date
+    from decimal import Decimal
+
+    values = [
+        1,
+        1.0,
+        True,
+        "1",
+        [1],
+        (1,),
+        {1},
+        {"1": 1},
+        {1: 1},
+        Decimal("1"),
+        date(2000, 1, 1),
+    ]
+    fingerprints = {EqualsSpecification("id", v).fingerprint() for v in values}
+    assert len(fingerprints) == len(values)
+    assert (
+        EqualsSpecification("id", {"b", "a"}).fingerprint()
+        == EqualsSpecification("id", {"a", "b"}).fingerprint()
+    )
+
+
+def test_registry():
+    registry = all_specifications()
+    assert registry["eq"] is registry["=="] is EqualsSpecification
+    assert registry["|"] is OrSpecification
+    with pytest.raises(TypeError):
+        registry["eq"] = ContainsSpecification
+
+    class DivisibleSpecification(FieldValueSpecification):
+        def is_satisfied_by(self, obj):
+            return getattr(obj, self.field) % self.value == 0
+
+    class StrictEqualsSpecification(EqualsSpecification):
+        @classmethod
+        def name(cls):
+            return "stricteq"
+
+    class TaggedEqualsSpecification(EqualsSpecification):
+        pass
+
+    assert registry["divisible"] is DivisibleSpecification
+    assert registry["stricteq"] is StrictEqualsSpecification
+    assert registry["eq"] is registry["=="] is EqualsSpecification
+    assert Specification.from_dict(
+        {"op": "divisible", "field": "n", "value": 3}
+    ) == DivisibleSpecification("n", 3)
+    assert Specification.parse(n__divisible=3) == DivisibleSpecification("n", 3)
@@ -0,0 +1,120 @@
+import io
+import json
+import random
+
+import pytest
+
+from fractal_specifications.generic import codec
+from fractal_specifications.generic.collections import AndSpecification
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    InSpecification,
+)
+from fractal_specifications.generic.specification import Specification
+from fractal_specifications.generic.streaming import load
+from tests.fixtures.generators import random_serializable_specification
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_load(chunk_size, complex_specification):
+    rng = random.Random(42)
+    for specification in [
+        complex_specification,
+        EqualsSpecification("id", {"a": [], "b": {}, "c": [{"d": None}, []]}),
+    ] + [random_serializable_specification(rng) for _ in range(200)]:
+        s = specification.dumps()
+        expected = Specification.loads(s)
+        assert load(s, chunk_size) == expected
+        assert load(s.encode(), chunk_size) == expected
+        assert load(io.StringIO(s), chunk_size) == expected
+        assert load(io.BytesIO(s.encode()), chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_load_in_values(chunk_size):
+    values = [
+        *range(-1000, 1000),
+        *(i / 7 for i in range(1000)),
+        *(f'val, [{i}] "é\U0001f600\\' for i in range(1000)),
+        True,
+        None,
+        1e400,
+        2**100,
+    ]
+    specification = InSpecification("id", values)
+    loaded = load(specification.dumps().encode(), chunk_size)
+    assert type(loaded.value) is list
+    assert loaded.value == values
+    assert loaded.is_satisfied_by(type("Obj", (), {"id": 'val, [3] "é\U0001f600\\'}))
+    assert not loaded.is_satisfied_by(type("Obj", (), {"id": "val"}))
+
+    specification = InSpecification("id", [1, [2, {"a": 3}], 4, [5]])
+    loaded = load(specification.dumps(), chunk_size)
+    assert loaded.value == [1, [2, {"a": 3}], 4, [5]]
+    assert loaded.is_satisfied_by(type("Obj", (), {"id": [5]}))
+    assert not loaded.is_satisfied_by(type("Obj", (), {"id": 2}))
+
+    assert load('{"op": "in", "field": "id", "value": [ ]}').value == []
+    assert load('{"value": [1, 1], "field": "id", "op": "in"}').value == [1, 1]
+
+
+def test_load_relates_to_loads():
+    s = '{"op": "in", "field": "id", "value": [3, 1, "a", 1]}'
+    loaded, expected = load(s), Specification.loads(s)
+    assert loaded == expected
+    assert loaded.to_dict() == expected.to_dict()
+    assert loaded.dumps() == expected.dumps()
+    assert loaded.dump_dsl() == expected.dump_dsl()
+
+
+def test_load_large():
+    specification = AndSpecification(
+        [
+            EqualsSpecification("tenant_id", 1),
+            InSpecification("user_id", list(range(1_000_000))),
+        ]
+    )
+    loaded = Specification.load(io.BytesIO(specification.dumps().encode()))
+    assert loaded.specifications[1].value == list(range(1_000_000))
+    assert loaded == specification
+
+
+def test_dumps_value_sets():
+    specification = InSpecification("id", frozenset({1, 2}))
+    assert sorted(json.loads(specification.dumps())["value"]) == [1, 2]
+    assert sorted(load(codec.dumps(specification)).value) == [1, 2]
+    with pytest.raises(TypeError):
+        EqualsSpecification("id", object()).dumps()
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "",
+        "{",
+        "[1]",
+        '{"op": "empty"} x',
+        '{"op": "empty",}',
+        '{"op" "empty"}',
+        '{"op": "eq", "field": "a", "value": 1',
+        '{"op": "eq", "field": "a", "value": 1.2.3}',
+        '{"op": "eq", "field": "a", "value": -}',
+        '{"op": "eq", "field": "a", "value": "x\x01"}',
+        '{"op": "eq", "field": "a", "value": "abc',
+        '{"op": "eq", "field": "a", "value": ?}',
+        '{"op": "eq", "field": "a", "value": ' + "x" * 100 + "}",
+        '{"op": "eq", "field": "a", "value": ' + "?" * 100 + "}",
+        '{"op": "eq", "field": "a", "value": [1 2]}',
+        '{"op": "in", "field": "a", "value": [1,]}',
+        '{"op": "in", "field": "a", "value": [1 2]}',
+        '{"op": "in", "field": "a", "value": [1, tru]}',
+        '{"op": "in", "field": "a", "value": ["a" "b", "c"]}',
+        '{"op": "in", "field": "a", "value": [[1] 2]}',
+        '{"op": "in", "field": "a", "value": [1}',
+    ],
+)
+def test_load_invalid(s):
+    with pytest.raises(ValueError):
+        load(s)
+    with pytest.raises(ValueError):
+        load(s, chunk_size=1)
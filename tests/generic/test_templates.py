@@ -0,0 +1,140 @@
+import pytest
+
+from fractal_specifications.contrib.mongo.specifications import (
+    MongoSpecificationBuilder,
+)
+from fractal_specifications.contrib.postgresql.specifications import (
+    PostgresSpecificationBuilder,
+)
+from fractal_specifications.generic.collections import AndSpecification, OrSpecification
+from fractal_specifications.generic.operators import (
+    EqualsSpecification,
+    GreaterThanSpecification,
+    InSpecification,
+    IsNoneSpecification,
+    NotSpecification,
+    RegexStringMatchSpecification,
+)
+from fractal_specifications.generic.specification import (
+    EmptySpecification,
+    Specification,
+)
+from fractal_specifications.generic.templates import (
+    Placeholder,
+    SpecificationTemplate,
+    templated,
+)
+
+DSL = (
+    "tenant_id == 1 && user_id == :user_id && created > $1 && "
+    "(status in ['new', :status] || !(name matches :name/i)) && "
+    "!(deleted is None) && (# || kind in ['a', 'b'])"
+)
+
+
+@pytest.fixture
+def template():
+    return Specification.load_dsl(DSL)
+
+
+def test_load_dsl_template(template):
+    assert type(template) is SpecificationTemplate
+    assert template.placeholders == (
+        Placeholder("user_id"),
+        Placeholder(1),
+        Placeholder("status"),
+        Placeholder("name"),
+    )
+    assert Specification.load_dsl(DSL) is template
+    assert Specification.load_dsl(template.dump_dsl()) == template
+    assert str(Placeholder(1)) == "$1"
+    assert str(template).startswith("SpecificationTemplate(AndSpecification(")
+    assert type(Specification.load_dsl("time == '12:00'")) is EqualsSpecification
+
+
+def test_bind(template):
+    specification = template.bind(1700000000, user_id=123, status="open", name="^jo")
+    assert specification == AndSpecification(
+        [
+            EqualsSpecification("tenant_id", 1),
+            EqualsSpecification("user_id", 123),
+            GreaterThanSpecification("created", 1700000000),
+            OrSpecification(
+                [
+                    InSpecification("status", ["new", "open"]),
+                    NotSpecification(
+                        RegexStringMatchSpecification("name", "^jo", flags="i")
+                    ),
+                ]
+            ),
+            NotSpecification(IsNoneSpecification("deleted")),
+            OrSpecification(
+                [EmptySpecification(), InSpecification("kind", ["a", "b"])]
+            ),
+        ]
+    )
+    other = template.bind(1, user_id=2, status="closed", name="x")
+    assert other.specifications[0] is specification.specifications[0]
+    assert other.specifications[4:] == specification.specifications[4:]
+
+
+def test_bind_missing_and_unexpected_values(template):
+    with pytest.raises(TypeError, match=r"missing: \$1, :status, unexpected: :user"):
+        template.bind(user_id=123, name="^jo", user=1)
+    with pytest.raises(TypeError, match=r"missing: -, unexpected: \$2"):
+        template.bind(1, 2, user_id=123, status="open", name="^jo")
+
+
+def test_templated():
+    specification = EqualsSpecification("id", 1)
+    assert templated(specification) is specification
+    template = templated(EqualsSpecification("id", Placeholder("id")))
+    assert template == SpecificationTemplate(
+        EqualsSpecification("id", Placeholder("id"))
+    )
+    assert hash(template) == hash(
+        SpecificationTemplate(EqualsSpecification("id", Placeholder("id")))
+    )
+    assert SpecificationTemplate(specification).bind() is specification
+
+
+def test_prepare():
+    template = Specification.load_dsl(
+        "tenant_id == 1 && (user_id == :user_id || id in [$1, 2])"
+    )
+    query = template.prepare(PostgresSpecificationBuilder.build)
+    assert query.reusable
+    sql, params = query.bind(1, user_id=123)
+    assert (sql, params) == PostgresSpecificationBuilder.build(
+        template.bind(1, user_id=123)
+    )
+    assert params == [1, 123, 1, 2]
+    assert sql is query.bind(3, user_id=4)[0]
+
+
+def test_prepare_not_reusable():
+    template = Specification.load_dsl("name contains :name")
+    query = template.prepare(MongoSpecificationBuilder.build)
+    assert not query.reusable
+    assert query.bind(name="jo") == {"name": {"$regex": ".*jo.*"}}
+
+    query = Specification.load_dsl("name == :name").prepare(
+        MongoSpecificationBuilder.build
+    )
+    assert query.reusable
+    assert query.bind(name="jo") == {"name": {"$eq": "jo"}}
+
+
+def test_prepare_not_reusable_with_passed_through_placeholder():
+    # `:q` is passed through as is for `==`, but formatted into a pattern for
+    # `contains`
+    template = Specification.load_dsl("name contains :q || code == :q")
+    query = template.prepare(PostgresSpecificationBuilder.build)
+    assert not query.reusable
+    assert query.bind(q="jo") == ("(name ILIKE %s) OR (code = %s)", ["%jo%", "jo"])
+
+    query = SpecificationTemplate(EqualsSpecification("code", "jo")).prepare(
+        PostgresSpecificationBuilder.build
+    )
+    assert query.reusable
+    assert query.bind() == ("code = %s", ["jo"])